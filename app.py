@@ -7,53 +7,159 @@ A Flask application that recommends Korean names for foreigners
 
 from __future__ import annotations
 
+import argparse
+import copy
+import glob
+import gzip
 import hashlib
+import heapq
 import json
 import logging
+import mimetypes
+import multiprocessing
+import operator
 import os
+import posixpath
 import random
 import re
 import secrets
+import signal
+import struct
+import sys
+import threading
+import time
 import unicodedata
-from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone, tzinfo
 from difflib import SequenceMatcher
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import (
+    Any, Callable, Dict, Generator, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple,
+)
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 from flask import (
     Flask,
     Response,
+    g,
+    has_request_context,
     jsonify,
     render_template,
     request,
+    send_from_directory,
     session,
 )
+from flask.sessions import SecureCookieSessionInterface
+
+import romanization
+import similarity
+from wsgi_compression import CompressionMiddleware
+from name_store import MappedStore, StoreError, pack_postings, pack_strings, write_store
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 ALLOWED_GENDERS = {"male", "female"}
+MAX_NAME_LENGTH = 100
+
+BATCH_MAX_ITEMS = int(os.environ.get("NAEILUM_BATCH_MAX_ITEMS", "500"))
+# Every server worker may start its own pool, so the default stays small
+BATCH_WORKERS = int(os.environ.get("NAEILUM_BATCH_WORKERS", str(min(2, os.cpu_count() or 1))))
+BATCH_PARALLEL_THRESHOLD = 32
+BATCH_CHUNK_SIZE = 16
+NDJSON_MIMETYPE = "application/x-ndjson"
 
 THEME_CHOICES = {"light", "dark", "system"}
 DEFAULT_THEME = "system"
 THEME_COOKIE_NAME = "theme"
 THEME_COOKIE_MAX_AGE = 365 * 24 * 60 * 60  # 1 year
 CSRF_HEADER_NAME = "X-CSRF-Token"
-
-HANGUL_BASE = 0xAC00
-HANGUL_LAST = 0xD7A3
-CHO_ROMA = [
-    "g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "",
-    "j", "jj", "ch", "k", "t", "p", "h",
-]
-JUNG_ROMA = [
-    "a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe",
-    "yo", "u", "wo", "we", "wi", "yu", "eu", "ui", "i",
-]
-JONG_ROMA = [
-    "", "k", "k", "ks", "n", "nj", "nh", "t", "l", "lk", "lm", "lp", "lt",
-    "lp", "lh", "m", "p", "ps", "t", "t", "ng", "t", "t", "k", "t", "p", "t", "h",
-]
+PUBLIC_MAX_AGE = int(os.environ.get("NAEILUM_PUBLIC_MAX_AGE", "300"))
+ETAG_DIGEST_SIZE = 16
+ASSET_DIR = os.environ.get(
+    "NAEILUM_ASSET_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "build", "static")
+)
+ASSET_MANIFEST_FILE = "manifest.json"
+ASSET_HASH_SIZE = 6  # bytes of BLAKE2b digest, 12 hex characters in file names
+ASSET_COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt", ".ttf", ".otf"}
+ASSET_GZIP_MIN_SAVING = 0.1  # keep a gzip variant only if it is at least this much smaller
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"  # fingerprinted names never change content
+COMPRESSION_ENABLED = os.environ.get("NAEILUM_COMPRESSION", "true").lower() in {"1", "true", "yes"}
+COMPRESSION_MIN_SIZE = int(os.environ.get("NAEILUM_COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.environ.get("NAEILUM_COMPRESSION_LEVEL", "6"))
+COMPRESSION_CACHE_BYTES = int(os.environ.get("NAEILUM_COMPRESSION_CACHE_BYTES", str(16 << 20)))
+CSS_URL_PATTERN = re.compile(r"""url\((['"]?)([^'")]+)\1\)""")
+
+SCORING_BACKENDS = {"difflib", "ngram", *similarity.METRICS}
+DEFAULT_SCORING_BACKEND = "difflib"
+NGRAM_SIZES = (2, 3)
+RECOMMENDATION_COUNT = 5
+SCORE_CUTOFF_RANK = RECOMMENDATION_COUNT
+# Scores are rounded to six places
+SCORE_ROUNDING = 1e-6
+DISTINCT_INITIAL_SLOTS = 3
+LEFTOVER_SAMPLE_ATTEMPTS = 8
+COLUMNAR_SELECT_MIN_CANDIDATES = 2048
+DETERMINISTIC_RECOMMENDATIONS = os.environ.get("NAEILUM_DETERMINISTIC", "false").lower() in {"1", "true", "yes"}
+RECOMMENDATION_CACHE_SIZE = int(os.environ.get("NAEILUM_RECOMMENDATION_CACHE_SIZE", "1024"))
+RECOMMENDATION_CACHE_TTL = float(os.environ.get("NAEILUM_RECOMMENDATION_CACHE_TTL", "3600"))
+DATA_DIR = os.environ.get("NAEILUM_DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+NAME_STORE_PATH = os.environ.get("NAEILUM_NAME_STORE", os.path.join(DATA_DIR, "names.store"))
+NAME_FILES = (("male", "names_male.json"), ("female", "names_female.json"))
+FORTUNES_FILE = "fortunes.json"
+LOAD_WORKERS = int(os.environ.get("NAEILUM_LOAD_WORKERS", str(os.cpu_count() or 1)))
+NAME_TEXT_FIELDS = ("hanja", "category", "meaning", "initial", "special_match")
+RELOAD_INTERVAL = float(os.environ.get("NAEILUM_RELOAD_INTERVAL", "0"))
+INCREMENTAL_RELOAD_MAX_FRACTION = float(os.environ.get("NAEILUM_INCREMENTAL_RELOAD_MAX_FRACTION", "0.1"))
+ADMIN_TOKEN = os.environ.get("NAEILUM_ADMIN_TOKEN", "")
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+DATASET_VERSION_HEADER = "X-Dataset-Version"
+RECORD_SEPARATOR = "\x1f"
+DATASET_VERSION_MODULUS = 1 << 64
+SHORTLIST_SIZE = int(os.environ.get("NAEILUM_SHORTLIST_SIZE", "200"))
+GENERATED_NAME_SLOTS = int(os.environ.get("NAEILUM_GENERATED_NAME_SLOTS", "2"))
+GENERATOR_BEAM_WIDTH = int(os.environ.get("NAEILUM_GENERATOR_BEAM_WIDTH", "8"))
+GENERATOR_INVENTORY_SIZE = 256
+GENERATOR_FIT_CACHE_SIZE = 1 << 18
+FORTUNE_CACHE_SIZE = int(os.environ.get("NAEILUM_FORTUNE_CACHE_SIZE", "4096"))
+FORTUNE_FALLBACK_TABLES = 64
+FORTUNE_ROLLOVER_LEAD = float(os.environ.get("NAEILUM_FORTUNE_ROLLOVER_LEAD", "300"))
+FORTUNE_ROLLOVER_CHECK_INTERVAL = 3600.0
+FORTUNE_DEFAULT_TIMEZONE = os.environ.get("NAEILUM_FORTUNE_TIMEZONE", "")
+TIMEZONE_HEADER_NAME = "X-Timezone"
+MAX_TIMEZONE_LENGTH = 64
+# Every IANA zone's offset lies within these, so together they bound the dates that are today somewhere
+EARLIEST_UTC_OFFSET = timedelta(hours=-12)
+LATEST_UTC_OFFSET = timedelta(hours=14)
+FORTUNE_KEY = os.environ.get("NAEILUM_FORTUNE_KEY", "naeilum-fortune").encode("utf-8")[:64]
+FORTUNE_RANGE_DEFAULT_DAYS = 7
+FORTUNE_RANGE_MAX_DAYS = 31
+FORTUNE_RANGE_MAX_NAMES = 20
+PAST_FORTUNE_CACHE_CONTROL = "public, max-age=31536000, immutable"  # past days never change
+FORTUNE_DIGEST_WORDS = struct.Struct("<16I")  # a 64-byte BLAKE2b digest as 32-bit words
+FORTUNE_LEGACY_SEEDING = os.environ.get("NAEILUM_FORTUNE_LEGACY_SEEDING", "false").lower() in {"1", "true", "yes"}
+DEFAULT_NAME_TOKEN_WEIGHTS = (1.0, 0.25, 0.5)  # first, each middle, last
+
+# Coarse English/Korean sound classes for phonetic bucketing
+PHONETIC_DIGRAPHS = (
+    ("ph", "p"), ("th", "t"), ("sh", "s"), ("ch", "j"), ("ck", "k"), ("gh", ""),
+    ("ng", "n"), ("x", "ks"), ("ce", "se"), ("ci", "si"), ("cy", "sy"),
+)
+PHONETIC_FOLDS = str.maketrans({
+    "f": "p", "v": "p", "b": "p", "d": "t", "g": "k", "c": "k", "q": "k", "z": "j", "r": "l",
+})
+PHONETIC_VOWELS = frozenset("aeiouwy")
+PHONETIC_MIN_NEAR_KEY = 2
+PHONETIC_EXACT_BONUS = 0.1
+PHONETIC_NEAR_BONUS = 0.05
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("NAEILUM_SECRET_KEY", secrets.token_hex(32))
@@ -63,7 +169,16 @@ app.config.update(
     SESSION_COOKIE_SECURE=os.environ.get("NAEILUM_SESSION_COOKIE_SECURE", "false").lower()
     in {"1", "true", "yes"},
     SESSION_COOKIE_HTTPONLY=True,
+    SEND_FILE_MAX_AGE_DEFAULT=PUBLIC_MAX_AGE,
+    USE_X_SENDFILE=os.environ.get("NAEILUM_X_SENDFILE", "false").lower() in {"1", "true", "yes"},
 )
+COMPRESSION: Optional[CompressionMiddleware] = None
+if COMPRESSION_ENABLED:
+    COMPRESSION = CompressionMiddleware(
+        app.wsgi_app, COMPRESSION_MIN_SIZE, COMPRESSION_LEVEL, COMPRESSION_CACHE_BYTES,
+        version=lambda: current_dataset().version,
+    )
+    app.wsgi_app = COMPRESSION
 
 
 def error_response(message: str, status: int = 400, code: Optional[str] = None) -> Tuple[Response, int]:
@@ -102,7 +217,7 @@ def generate_fallback_names() -> Dict[str, List[Dict[str, Any]]]:
 
 def _load_json_file(filename: str) -> Tuple[bool, List[Dict[str, Any]]]:
     """Attempt to load a JSON file and return success flag with data."""
-    json_path = os.path.join(os.path.dirname(__file__), filename)
+    json_path = os.path.join(DATA_DIR, filename)
     try:
         with open(json_path, "r", encoding="utf-8") as file:
             data = json.load(file)
@@ -118,21 +233,234 @@ def _load_json_file(filename: str) -> Tuple[bool, List[Dict[str, Any]]]:
     return False, []
 
 
+class NameEntry:
+    """An immutable, compact name record with an integer id within its pool.
+
+    Categories and initials are interned and romanizations kept as a tuple;
+    ``to_dict`` restores the JSON shape for responses and the session.
+    """
+
+    __slots__ = ("entry_id", "name", "hanja", "romanization", "category", "meaning", "initial", "special_match")
+    _content_fields = operator.attrgetter(*__slots__[1:])
+
+    def __init__(
+        self,
+        entry_id: int,
+        name: str,
+        hanja: str,
+        romanization: Tuple[str, ...],
+        category: str,
+        meaning: str,
+        initial: str,
+        special_match: Optional[str] = None,
+    ) -> None:
+        values = (entry_id, name, hanja, romanization, category, meaning, initial, special_match)
+        for slot, value in zip(self.__slots__, values):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, key: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        return type(self), tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"NameEntry({self.entry_id}, {self.name!r}, {self.category!r})"
+
+    @property
+    def identity(self) -> Tuple[str, str]:
+        """The ``(name, hanja)`` pair that identifies an entry within its pool."""
+        return self.name, self.hanja
+
+    def content(self) -> Tuple[Any, ...]:
+        """Return every field except the entry id."""
+        return self._content_fields(self)
+
+    def with_id(self, entry_id: int) -> "NameEntry":
+        """Return a copy of this entry at another position in its pool."""
+        return type(self)(entry_id, *self.content())
+
+    @classmethod
+    def from_dict(cls, entry_id: int, data: Dict[str, Any]) -> "NameEntry":
+        """Build an entry from its JSON object, tolerating missing fields."""
+        romanized = data.get("romanization")
+        if isinstance(romanized, str):
+            romanized = [romanized]
+        if not isinstance(romanized, Sequence):
+            romanized = []
+        special_match = data.get("special_match")
+        return cls(
+            entry_id,
+            str(data.get("name", "")),
+            str(data.get("hanja", "")),
+            tuple(value for value in romanized if isinstance(value, str) and value),
+            sys.intern(str(data.get("category", ""))),
+            str(data.get("meaning", "")),
+            sys.intern(str(data.get("initial", ""))),
+            str(special_match) if special_match else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the entry in its JSON shape."""
+        data: Dict[str, Any] = {
+            "name": self.name,
+            "hanja": self.hanja,
+            "romanization": list(self.romanization),
+            "category": self.category,
+            "meaning": self.meaning,
+            "initial": self.initial,
+        }
+        if self.special_match:
+            data["special_match"] = self.special_match
+        return data
+
+    @classmethod
+    def from_record(cls, entry_id: int, record: str) -> "NameEntry":
+        """Rebuild an entry from its ``to_record`` string."""
+        name, hanja, romanization, category, meaning, initial, special_match = record.split(RECORD_SEPARATOR)
+        return cls(
+            entry_id,
+            name,
+            hanja,
+            tuple(romanization.split("\t")) if romanization else (),
+            sys.intern(category),
+            meaning,
+            sys.intern(initial),
+            special_match or None,
+        )
+
+    def to_record(self) -> str:
+        """Return the entry as one separator-delimited string for the name store."""
+        fields = (self.name, self.hanja, "\t".join(self.romanization), self.category, self.meaning, self.initial)
+        return RECORD_SEPARATOR.join((*fields, self.special_match or ""))
+
+
+def validate_name_record(raw_entry: Any) -> Optional[str]:
+    """Return why a JSON name record is malformed, or None if it is valid."""
+    if not isinstance(raw_entry, dict):
+        return "not an object"
+    name = raw_entry.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return "missing name"
+    romanization = raw_entry.get("romanization", [])
+    if isinstance(romanization, str):
+        romanization = [romanization]
+    if not isinstance(romanization, list) or not all(isinstance(value, str) for value in romanization):
+        return "romanization must be a string or a list of strings"
+    for field in NAME_TEXT_FIELDS:
+        if raw_entry.get(field) is not None and not isinstance(raw_entry[field], str):
+            return f"{field} must be a string"
+    return None
+
+
+def build_name_entries(raw_names: Dict[str, List[Any]]) -> Dict[str, Tuple[NameEntry, ...]]:
+    """Convert loaded JSON name lists into compact entries.
+
+    Malformed records are skipped and repeated ``(name, hanja)`` pairs keep
+    their first occurrence, so every pool holds distinct names.
+    """
+    names_data: Dict[str, Tuple[NameEntry, ...]] = {}
+    for gender, raw_entries in raw_names.items():
+        entries: List[NameEntry] = []
+        seen: set[Tuple[str, str]] = set()
+        duplicates = 0
+        for raw_entry in raw_entries:
+            problem = validate_name_record(raw_entry)
+            if problem:
+                logger.warning("Skipping malformed %s name entry (%s): %r", gender, problem, raw_entry)
+                continue
+            entry = NameEntry.from_dict(len(entries), raw_entry)
+            key = entry.identity
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            entries.append(entry)
+        if duplicates:
+            logger.info("Dropped %d duplicate %s name entries", duplicates, gender)
+        names_data[gender] = tuple(entries)
+    return names_data
+
+
+class MappedNamePool(Sequence):
+    """A gender pool read from the memory-mapped name store, decoded per access."""
+
+    def __init__(self, records: Sequence[str]) -> None:
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, entry_id: int) -> NameEntry:
+        if entry_id < 0:
+            entry_id += len(self._records)
+        return NameEntry.from_record(entry_id, self._records[entry_id])
+
+
+def name_shard_files(filename: str) -> List[str]:
+    """Return a catalog file followed by its shards, e.g. ``names_male.001.json``."""
+    stem, extension = os.path.splitext(filename)
+    shards = sorted(os.path.basename(path) for path in glob.glob(os.path.join(DATA_DIR, f"{stem}.*{extension}")))
+    return [filename, *shards]
+
+
+def load_name_files(filenames: Sequence[str]) -> List[Tuple[bool, List[Dict[str, Any]]]]:
+    """Parse name files, in parallel processes when there are several shards."""
+    workers = min(LOAD_WORKERS, len(filenames))
+    # Forked workers inherit this half-imported module; spawned ones would re-import it
+    if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as executor:
+            return list(executor.map(_load_json_file, filenames))
+    return [_load_json_file(filename) for filename in filenames]
+
+
 def load_names() -> Dict[str, List[Dict[str, Any]]]:
-    """Load Korean names from JSON files, with fallback data."""
+    """Load Korean names from JSON files and their shards, with fallback data."""
     names_data = generate_fallback_names()
-    for gender, filename in (("male", "names_male.json"), ("female", "names_female.json")):
-        success, data = _load_json_file(filename)
-        if success:
-            names_data[gender] = data
+    shard_files = {gender: name_shard_files(filename) for gender, filename in NAME_FILES}
+    all_files = [filename for files in shard_files.values() for filename in files]
+    if len(all_files) > len(NAME_FILES):
+        logger.info("Loading %d name files", len(all_files))
+    results = dict(zip(all_files, load_name_files(all_files)))
+    for gender, files in shard_files.items():
+        loaded = [results[filename] for filename in files if results[filename][0]]
+        if loaded:
+            names_data[gender] = [record for _, records in loaded for record in records]
     return names_data
 
 
+def validate_fortunes(raw_fortunes: List[Any]) -> List[Dict[str, Any]]:
+    """Keep well-formed fortune categories and their string or en/ko messages."""
+    fortunes: List[Dict[str, Any]] = []
+    for category_data in raw_fortunes:
+        if not isinstance(category_data, dict) or not isinstance(category_data.get("category"), str):
+            logger.warning("Skipping malformed fortune category: %r", category_data)
+            continue
+        messages = category_data.get("messages")
+        if not isinstance(messages, list):
+            logger.warning("Skipping fortune category without messages: %s", category_data["category"])
+            continue
+        valid_messages = [
+            message for message in messages
+            if isinstance(message, str)
+            or (isinstance(message, dict) and all(isinstance(message.get(key, ""), str) for key in ("en", "ko")))
+        ]
+        if len(valid_messages) < len(messages):
+            skipped = len(messages) - len(valid_messages)
+            logger.warning("Skipping %d malformed %s fortunes", skipped, category_data["category"])
+        fortunes.append({**category_data, "messages": valid_messages})
+    return fortunes
+
+
 def load_fortunes() -> List[Dict[str, Any]]:
     """Load fortune messages from JSON file."""
-    success, data = _load_json_file("fortunes.json")
-    if success:
-        return data
+    success, data = _load_json_file(FORTUNES_FILE)
+    fortunes = validate_fortunes(data) if success else []
+    if fortunes:
+        return fortunes
 
     logger.info("Using fallback fortunes.")
     return [
@@ -144,9 +472,70 @@ def load_fortunes() -> List[Dict[str, Any]]:
     ]
 
 
-# Load data on startup
-NAMES_DATA = load_names()
-FORTUNES_DATA = load_fortunes()
+def entry_digest(gender: str, entry: NameEntry) -> int:
+    """Hash one entry's pool and fields, ignoring its id."""
+    payload = repr((gender, entry.content())).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "big")
+
+
+def fortunes_digest(fortunes: Sequence[Dict[str, Any]]) -> int:
+    """Hash the fortune categories and messages."""
+    payload = json.dumps(fortunes, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "big")
+
+
+def compute_dataset_version(names_data: Dict[str, Sequence[NameEntry]], fortunes: Sequence[Dict[str, Any]]) -> str:
+    """Return a short content hash identifying the loaded names and fortunes.
+
+    The hash is the sum of per-entry digests and a digest of the fortunes,
+    so it does not depend on pool order and an incremental update can
+    adjust it for just the changed entries and fortunes.
+    """
+    total = fortunes_digest(fortunes)
+    total += sum(entry_digest(gender, entry) for gender, entries in names_data.items() for entry in entries)
+    return format(total % DATASET_VERSION_MODULUS, "016x")
+
+
+def compute_source_hash() -> str:
+    """Hash the raw bytes of every file a build would read, and of the builder code.
+
+    Covering this module and the romanizer means a deploy that changes how
+    entries or indexes are derived marks older snapshots stale without a
+    format version bump.
+    """
+    digest = hashlib.sha256()
+    filenames = [os.path.join(DATA_DIR, name) for _, filename in NAME_FILES for name in name_shard_files(filename)]
+    code = [os.path.abspath(__file__), os.path.abspath(romanization.__file__)]
+    for path in [*filenames, os.path.join(DATA_DIR, FORTUNES_FILE), *code]:
+        digest.update(os.path.basename(path).encode("utf-8") + b"\x00")
+        try:
+            with open(path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+        except FileNotFoundError:
+            digest.update(b"\xff")
+    return digest.hexdigest()
+
+
+def open_name_store(path: str, source_hash: str) -> Optional[MappedStore]:
+    """Map the prebuilt snapshot read-only, or return None to fall back to JSON.
+
+    A snapshot whose recorded hash differs from ``source_hash`` is stale.
+    """
+    if not path or not os.path.exists(path):
+        logger.info("No name store at %s; loading JSON files", path)
+        return None
+    try:
+        store = MappedStore(path)
+    except StoreError as exc:
+        logger.warning("Name store unavailable, loading JSON instead: %s", exc)
+        return None
+    if store.metadata.get("source_hash") != source_hash:
+        logger.warning("Name store %s is stale; loading JSON instead. Rebuild it with 'python app.py build'", path)
+        return None
+    logger.info("Mapped name store %s (dataset %s)", path, store.dataset_version)
+    return store
+
 
 
 def normalize_name(name: str) -> str:
@@ -174,37 +563,16 @@ def generate_session_id() -> str:
     return hashlib.sha256(secrets.token_bytes(32)).hexdigest()[:16]
 
 
-@lru_cache(maxsize=4096)
-def romanize_syllable(char: str) -> str:
-    """Romanize a single Hangul syllable to Latin letters."""
-    code_point = ord(char)
-    if HANGUL_BASE <= code_point <= HANGUL_LAST:
-        index = code_point - HANGUL_BASE
-        cho = index // 588
-        jung = (index % 588) // 28
-        jong = index % 28
-        return (CHO_ROMA[cho] + JUNG_ROMA[jung] + JONG_ROMA[jong]).rstrip()
-    return char
-
-
-def romanize_korean_text(text: str) -> str:
-    """Romanize a full Hangul string."""
-    return "".join(romanize_syllable(ch) for ch in text)
-
-
-def get_candidate_romanization(name_entry: Dict[str, Any]) -> List[str]:
-    """Return all romanization candidates for a name entry."""
-    candidates: List[str] = []
-    romanized = name_entry.get("romanization")
-    if isinstance(romanized, str):
-        romanized = [romanized]
-    if isinstance(romanized, Sequence):
-        for value in romanized:
-            if isinstance(value, str) and value:
-                candidates.append(value)
-    hangul_name = name_entry.get("name", "")
+def get_candidate_romanization(name_entry: NameEntry, romanized: Optional[str] = None) -> List[str]:
+    """Return all romanization candidates for a name entry.
+
+    ``romanized`` is the Hangul name already romanized, as ``build_name_index``
+    does for a whole pool at once.
+    """
+    candidates: List[str] = list(name_entry.romanization)
+    hangul_name = name_entry.name
     if hangul_name:
-        candidates.append(romanize_korean_text(hangul_name))
+        candidates.append(romanized if romanized is not None else romanization.romanize(hangul_name))
     seen: set[str] = set()
     deduped: List[str] = []
     for candidate in candidates:
@@ -224,73 +592,1620 @@ def normalize_romanization(text: str) -> str:
     return normalized
 
 
-def compute_similarity_score(english_name: str, name_entry: Dict[str, Any]) -> float:
-    """Compute a phonetic similarity score between an English name and a Korean entry."""
-    english_norm = normalize_romanization(english_name)
-    if not english_norm:
-        return 0.0
+class CandidateFeatures(NamedTuple):
+    """Precomputed match features for one normalized romanization candidate."""
 
-    best_score = 0.0
-    for candidate in get_candidate_romanization(name_entry):
+    text: str
+    first: str
+    last: str
+    length: int
+
+
+class IndexedEntry(NamedTuple):
+    """A name entry paired with its precomputed match features."""
+
+    entry: NameEntry
+    candidates: Tuple[CandidateFeatures, ...]
+    initial: str
+    special: bool = False
+
+
+def build_entry_features(name_entry: NameEntry, romanized: Optional[str] = None) -> IndexedEntry:
+    """Derive the deduplicated, normalized candidate features for an entry."""
+    candidates: List[CandidateFeatures] = []
+    seen: set[str] = set()
+    for candidate in get_candidate_romanization(name_entry, romanized):
         candidate_norm = normalize_romanization(candidate)
-        if not candidate_norm:
+        if not candidate_norm or candidate_norm in seen:
             continue
-        ratio = SequenceMatcher(None, english_norm, candidate_norm).ratio()
-        if english_norm[:1] == candidate_norm[:1]:
+        seen.add(candidate_norm)
+        candidates.append(
+            CandidateFeatures(candidate_norm, candidate_norm[:1], candidate_norm[-1:], len(candidate_norm))
+        )
+    return IndexedEntry(name_entry, tuple(candidates), name_entry.initial.upper(), bool(name_entry.special_match))
+
+
+def build_name_index(names_data: Dict[str, Sequence[NameEntry]]) -> Dict[str, Tuple[IndexedEntry, ...]]:
+    """Build the immutable per-gender match index from loaded name data."""
+    return {
+        gender: tuple(
+            build_entry_features(entry, romanized)
+            for entry, romanized in zip(entries, romanization.romanize_many([entry.name for entry in entries]))
+        )
+        for gender, entries in names_data.items()
+    }
+
+
+class MappedIndexPool(Sequence):
+    """Match features of a mapped pool, rebuilt per access from packed candidate text."""
+
+    def __init__(self, entries: Sequence[NameEntry], candidates: Sequence[str]) -> None:
+        self._entries = entries
+        self._candidates = candidates
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, entry_id: int) -> IndexedEntry:
+        entry = self._entries[entry_id]
+        candidates, initial = self.features(entry.entry_id)
+        return IndexedEntry(entry, candidates, initial, bool(entry.special_match))
+
+    def features(self, entry_id: int) -> Tuple[Tuple[CandidateFeatures, ...], str]:
+        """Return an entry's candidate features and uppercase initial without decoding the entry."""
+        initial, *texts = self._candidates[entry_id].split("\t")
+        return tuple(CandidateFeatures(text, text[:1], text[-1:], len(text)) for text in texts if text), initial
+
+
+def score_indexed_entry(english_norm: str, matcher: SequenceMatcher, indexed: IndexedEntry) -> float:
+    """Score a normalized input against an entry's precomputed features.
+
+    The matcher must already hold ``english_norm`` as its first sequence; the
+    input stays on that side so ratios match a per-pair ``SequenceMatcher``.
+    """
+    return score_candidates(english_norm, matcher, indexed.candidates, indexed.initial)
+
+
+def score_candidates(
+    english_norm: str, matcher: SequenceMatcher, candidates: Sequence[CandidateFeatures], initial: str
+) -> float:
+    """Score a normalized input against candidate features and an uppercase initial."""
+    first = english_norm[:1]
+    last = english_norm[-1:]
+    length = len(english_norm)
+
+    best_score = 0.0
+    for candidate in candidates:
+        matcher.set_seq2(candidate.text)
+        ratio = matcher.ratio()
+        if first == candidate.first:
             ratio += 0.08
-        if english_norm[-1:] == candidate_norm[-1:]:
+        if last == candidate.last:
             ratio += 0.04
-        ratio -= min(0.15, abs(len(english_norm) - len(candidate_norm)) * 0.015)
+        ratio -= min(0.15, abs(length - candidate.length) * 0.015)
         best_score = max(best_score, ratio)
 
-    if name_entry.get("initial", "").upper() == english_norm[:1].upper():
+    if initial == first.upper():
         best_score += 0.03
 
     return round(best_score, 6)
 
 
-def select_korean_names(original_name: str, gender: str) -> List[Dict[str, Any]]:
-    """Select Korean names based on English input and similarity scoring."""
-    gender_names = NAMES_DATA.get(gender, [])
-    if not gender_names:
-        return []
+class EditDistanceScorer:
+    """Score entries with a bit-parallel metric from ``similarity``.
+
+    Candidate bitmasks are compiled once. While scoring a pool, a candidate
+    is abandoned as soon as it cannot beat the current
+    ``SCORE_CUTOFF_RANK``-th best score; abandoned entries keep whatever
+    lower score they reached, and ``score`` reports them with an upper bound
+    so callers never rank them on that score.
+    """
+
+    def __init__(self, indexed_entries: Sequence[IndexedEntry], metric: str) -> None:
+        self.metric = similarity.METRICS[metric]
+        self.indexed_entries = indexed_entries
+        self.patterns = tuple(self.compile_entry(indexed) for indexed in indexed_entries)
+
+    @staticmethod
+    def compile_entry(indexed: IndexedEntry) -> Tuple[similarity.BitPattern, ...]:
+        """Compile the bitmasks of an entry's candidates."""
+        return tuple(similarity.compile_pattern(candidate.text) for candidate in indexed.candidates)
+
+    def with_changes(
+        self, indexed_entries: Sequence[IndexedEntry], changes: Sequence[SlotChange]
+    ) -> "EditDistanceScorer":
+        """Return a scorer for an updated pool, compiling only the changed slots."""
+        patterns = list(self.patterns[:len(indexed_entries)])
+        patterns.extend([()] * (len(indexed_entries) - len(patterns)))
+        for change in changes:
+            if change.new is not None:
+                patterns[change.slot] = self.compile_entry(change.new)
+        scorer = copy.copy(self)
+        scorer.indexed_entries = indexed_entries
+        scorer.patterns = tuple(patterns)
+        return scorer
+
+    def score_entry(self, english_norm: str, entry_id: int, cutoff: float = 0.0) -> float:
+        """Score one entry, skipping candidates that cannot reach ``cutoff``."""
+        indexed = self.indexed_entries[entry_id]
+        first = english_norm[:1]
+        last = english_norm[-1:]
+        length = len(english_norm)
+        initial_bonus = 0.03 if indexed.initial == first.upper() else 0.0
+
+        best_score = 0.0
+        for candidate, pattern in zip(indexed.candidates, self.patterns[entry_id]):
+            adjustment = 0.0
+            if first == candidate.first:
+                adjustment += 0.08
+            if last == candidate.last:
+                adjustment += 0.04
+            adjustment -= min(0.15, abs(length - candidate.length) * 0.015)
+
+            needed = max(best_score, cutoff - initial_bonus) - adjustment
+            if needed <= 0:
+                best_score = max(best_score, self.metric(pattern, english_norm) + adjustment)
+                continue
+            ratio = self.metric(pattern, english_norm, needed)
+            if ratio:
+                best_score = max(best_score, ratio + adjustment)
+
+        return round(best_score + initial_bonus, 6)
+
+    def score(
+        self,
+        english_norm: str,
+        entry_ids: Sequence[int],
+        bonuses: Optional[Dict[int, float]] = None,
+        pruned: Optional[Dict[int, float]] = None,
+    ) -> List[float]:
+        """Score entries in order, raising the cutoff as better entries are found.
+
+        An entry scoring under its cutoff may have been abandoned early, so its
+        score is only a lower bound; ``pruned`` receives its id and the cutoff,
+        which bounds its exact score from above.
+        """
+        bonuses = bonuses or {}
+        top_scores: List[float] = []
+        scores: List[float] = []
+        for entry_id in entry_ids:
+            bonus = bonuses.get(entry_id, 0.0)
+            cutoff = top_scores[0] - bonus if len(top_scores) >= SCORE_CUTOFF_RANK else 0.0
+            score = self.score_entry(english_norm, entry_id, cutoff)
+            scores.append(score)
+            if score < cutoff and pruned is not None:
+                # Rounding the exact score may lift it to the cutoff itself
+                pruned[entry_id] = cutoff + SCORE_ROUNDING
+            if len(top_scores) < SCORE_CUTOFF_RANK:
+                heapq.heappush(top_scores, score + bonus)
+            elif score + bonus > top_scores[0]:
+                heapq.heapreplace(top_scores, score + bonus)
+        return scores
+
+
+def compute_similarity_score(
+    english_name: str, name_entry: NameEntry | Dict[str, Any], metric: str = "difflib"
+) -> float:
+    """Compute a phonetic similarity score between an English name and a Korean entry.
+
+    ``metric`` selects ``difflib`` (the reference) or a ``similarity.METRICS`` name.
+    """
+    english_norm = normalize_romanization(english_name)
+    if not english_norm:
+        return 0.0
+    if isinstance(name_entry, dict):
+        name_entry = NameEntry.from_dict(0, name_entry)
+    indexed = build_entry_features(name_entry)
+    if metric in similarity.METRICS:
+        return EditDistanceScorer((indexed,), metric).score_entry(english_norm, 0)
+    matcher = SequenceMatcher(None, english_norm, "")
+    return score_indexed_entry(english_norm, matcher, indexed)
+
+
+def extract_ngrams(text: str, sizes: Sequence[int] = NGRAM_SIZES) -> set[str]:
+    """Return the set of padded character n-grams of a normalized string."""
+    padded = f"^{text}$"
+    return {padded[i:i + size] for size in sizes for i in range(len(padded) - size + 1)}
+
+
+class SlotChange(NamedTuple):
+    """A pool slot's entry before and after an incremental update; None when empty."""
+
+    slot: int
+    old: Optional[IndexedEntry]
+    new: Optional[IndexedEntry]
+
+
+def edit_postings(
+    postings: Mapping[str, Sequence[int]],
+    removals: Sequence[Tuple[str, int]],
+    additions: Sequence[Tuple[str, int]],
+) -> Dict[str, Tuple[int, ...]]:
+    """Copy a postings map with ``(key, id)`` pairs removed, then inserted.
+
+    Only the touched postings are rebuilt; each stays sorted by id, as a
+    full build produces them.
+    """
+    edited: Dict[str, List[int]] = {}
+    for pairs, insert in ((removals, False), (additions, True)):
+        for key, entry_id in pairs:
+            ids = edited.get(key)
+            if ids is None:
+                ids = edited[key] = list(postings.get(key, ()))
+            position = bisect_left(ids, entry_id)
+            present = position < len(ids) and ids[position] == entry_id
+            if insert and not present:
+                ids.insert(position, entry_id)
+            elif not insert and present:
+                del ids[position]
+
+    result = dict(postings)
+    for key, ids in edited.items():
+        if ids:
+            result[key] = tuple(ids)
+        else:
+            result.pop(key, None)
+    return result
+
+
+class TrigramIndex:
+    """Inverted index from romanization trigrams to entry ids of one pool."""
+
+    def __init__(self, indexed_entries: Sequence[IndexedEntry]) -> None:
+        postings: Dict[str, List[int]] = {}
+        for entry_id, indexed in enumerate(indexed_entries):
+            for gram in self.entry_grams(indexed):
+                postings.setdefault(gram, []).append(entry_id)
+        self.postings: Mapping[str, Sequence[int]] = {gram: tuple(ids) for gram, ids in postings.items()}
+        self.entry_count = len(indexed_entries)
+
+    @classmethod
+    def from_postings(cls, postings: Mapping[str, Sequence[int]], entry_count: int) -> "TrigramIndex":
+        """Wrap prebuilt postings, such as those read from the name store."""
+        index = cls.__new__(cls)
+        index.postings = postings
+        index.entry_count = entry_count
+        return index
+
+    @staticmethod
+    def entry_grams(indexed: IndexedEntry) -> set[str]:
+        """Return the trigrams an entry is posted under."""
+        grams: set[str] = set()
+        for candidate in indexed.candidates:
+            grams |= extract_ngrams(candidate.text, (3,))
+        return grams
+
+    def with_changes(self, changes: Sequence[SlotChange], entry_count: int) -> "TrigramIndex":
+        """Return a copy with the changed slots reposted."""
+        removals = [(gram, change.slot) for change in changes if change.old for gram in self.entry_grams(change.old)]
+        additions = [(gram, change.slot) for change in changes if change.new for gram in self.entry_grams(change.new)]
+        return self.from_postings(edit_postings(self.postings, removals, additions), entry_count)
+
+    def shortlist(self, english_norm: str, limit: int) -> List[int]:
+        """Return up to ``limit`` entry ids sharing the most trigrams with the input."""
+        counts: Counter[int] = Counter()
+        # Sorted so tie order among equal counts does not depend on string hashing
+        for gram in sorted(extract_ngrams(english_norm, (3,))):
+            counts.update(self.postings.get(gram, ()))
+        return [entry_id for entry_id, _ in counts.most_common(limit)]
+
+
+class NgramScorer:
+    """Score an input against a whole pool with one sparse matrix-vector product.
+
+    Every candidate romanization is a binary row of character bigrams and
+    trigrams; the Dice overlap with the input stands in for the
+    ``SequenceMatcher`` ratio, and the letter, length and initial bonuses are
+    applied as array operations.
+    """
+
+    def __init__(self, indexed_entries: Sequence[IndexedEntry]) -> None:
+        vocabulary: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        owners: List[int] = []
+        sizes: List[int] = []
+        firsts: List[int] = []
+        lasts: List[int] = []
+        lengths: List[int] = []
+
+        for entry_id, indexed in enumerate(indexed_entries):
+            for candidate in indexed.candidates:
+                row = len(owners)
+                grams = extract_ngrams(candidate.text)
+                for gram in grams:
+                    rows.append(row)
+                    cols.append(vocabulary.setdefault(gram, len(vocabulary)))
+                owners.append(entry_id)
+                sizes.append(len(grams))
+                firsts.append(ord(candidate.first))
+                lasts.append(ord(candidate.last))
+                lengths.append(candidate.length)
+
+        self.vocabulary = vocabulary
+        self.entry_count = len(indexed_entries)
+        self._rows = np.asarray(rows, dtype=np.int64)
+        self._cols = np.asarray(cols, dtype=np.int64)
+        self._owners = np.asarray(owners, dtype=np.int64)
+        self._sizes = np.asarray(sizes, dtype=np.float64)
+        self._firsts = np.asarray(firsts, dtype=np.int64)
+        self._lasts = np.asarray(lasts, dtype=np.int64)
+        self._lengths = np.asarray(lengths, dtype=np.int64)
+        self._initials = np.asarray(
+            [ord(indexed.initial) if len(indexed.initial) == 1 else -1 for indexed in indexed_entries],
+            dtype=np.int64,
+        )
+
+    def score(self, english_norm: str) -> "np.ndarray":
+        """Return one score per entry, in index order, for a normalized input."""
+        grams = extract_ngrams(english_norm)
+        query = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for gram in grams:
+            column = self.vocabulary.get(gram)
+            if column is not None:
+                query[column] = 1.0
+
+        overlap = np.bincount(self._rows, weights=query[self._cols], minlength=len(self._owners))
+        ratio = 2.0 * overlap / (self._sizes + len(grams))
+        ratio += 0.08 * (self._firsts == ord(english_norm[0]))
+        ratio += 0.04 * (self._lasts == ord(english_norm[-1]))
+        ratio -= np.minimum(0.15, np.abs(self._lengths - len(english_norm)) * 0.015)
+
+        best = np.zeros(self.entry_count, dtype=np.float64)
+        np.maximum.at(best, self._owners, ratio)
+        best += 0.03 * (self._initials == ord(english_norm[0].upper()))
+        return np.round(best, 6)
+
+
+class ScoreBounds:
+    """Upper bounds on an input's score against every entry of one pool.
+
+    Whatever a backend aligns, it can match no more characters than the
+    input and a romanization have in common, counted with repetition. Each
+    candidate keeps a count per character, so that overlap bounds the ratio
+    of every edit-distance backend; the letter, length and initial bonuses
+    are added exactly, as the scorers do.
+    """
+
+    def __init__(self, indexed_entries: Sequence[IndexedEntry]) -> None:
+        features = getattr(indexed_entries, "features", None)
+        alphabet: Dict[str, int] = {}
+        chars: List[int] = []
+        char_rows: List[int] = []
+        owners: List[int] = []
+        firsts: List[int] = []
+        lasts: List[int] = []
+        lengths: List[int] = []
+        initials: List[int] = []
+
+        for entry_id in range(len(indexed_entries)):
+            if features is not None:
+                candidates, initial = features(entry_id)
+            else:
+                indexed = indexed_entries[entry_id]
+                candidates, initial = indexed.candidates, indexed.initial
+            initials.append(ord(initial) if len(initial) == 1 else -1)
+            for candidate in candidates:
+                row = len(owners)
+                for char in candidate.text:
+                    chars.append(alphabet.setdefault(char, len(alphabet)))
+                    char_rows.append(row)
+                owners.append(entry_id)
+                firsts.append(ord(candidate.first))
+                lasts.append(ord(candidate.last))
+                lengths.append(candidate.length)
+
+        self.alphabet = alphabet
+        self.entry_count = len(indexed_entries)
+        rows = len(owners)
+        # One row of counts per character, so an input only reads its own characters' rows
+        counts = np.bincount(
+            np.asarray(chars, dtype=np.int64) * rows + np.asarray(char_rows, dtype=np.int64),
+            minlength=len(alphabet) * rows,
+        )
+        self._counts = np.minimum(counts, 0xFF).astype(np.uint8).reshape(len(alphabet), rows)
+        self._owners = np.asarray(owners, dtype=np.int64)
+        self._starts = np.flatnonzero(np.diff(self._owners, prepend=-1)) if rows else np.zeros(0, dtype=np.int64)
+        self._firsts = np.asarray(firsts, dtype=np.int64)
+        self._lasts = np.asarray(lasts, dtype=np.int64)
+        self._lengths = np.asarray(lengths, dtype=np.float64)
+        self._initials = np.asarray(initials, dtype=np.int64)
+
+    def bounds(self, english_norm: str, metric: str) -> "np.ndarray":
+        """Return, per entry, a score the ``metric`` backend cannot exceed for the input."""
+        best = np.zeros(self.entry_count, dtype=np.float64)
+        if not english_norm:
+            return best
+        length = len(english_norm)
+        overlap = np.zeros(len(self._owners), dtype=np.float64)
+        for char, count in Counter(english_norm).items():
+            row = self.alphabet.get(char)
+            if row is not None:
+                overlap += np.minimum(self._counts[row], count)
+
+        if metric == "levenshtein":
+            ratio = overlap / np.maximum(self._lengths, length)
+        elif metric == "jaro_winkler":
+            jaro = np.where(overlap > 0, (overlap / length + overlap / self._lengths + 1.0) / 3.0, 0.0)
+            # A common prefix needs the first letters to match; it is at most four long
+            boost = 0.4 * (self._firsts == ord(english_norm[0]))
+            ratio = jaro + boost * (1.0 - jaro)
+        else:
+            ratio = 2.0 * overlap / (self._lengths + length)
+        ratio += 0.08 * (self._firsts == ord(english_norm[0]))
+        ratio += 0.04 * (self._lasts == ord(english_norm[-1]))
+        ratio -= np.minimum(0.15, np.abs(self._lengths - length) * 0.015)
+
+        if len(self._starts):
+            best[self._owners[self._starts]] = np.maximum(np.maximum.reduceat(ratio, self._starts), 0.0)
+        best += 0.03 * (self._initials == ord(english_norm[0].upper()))
+        # Scores are rounded to six places, which may lift them past the exact bound
+        return best + 1e-6
+
+
+def resolve_scoring_backend(requested: str) -> str:
+    """Validate the configured scoring backend, falling back to difflib."""
+    backend = requested.strip().lower()
+    if backend not in SCORING_BACKENDS:
+        logger.warning("Unknown scoring backend '%s'; using %s", requested, DEFAULT_SCORING_BACKEND)
+        return DEFAULT_SCORING_BACKEND
+    if backend == "ngram" and np is None:
+        logger.warning("NumPy is not installed; using %s scoring backend", DEFAULT_SCORING_BACKEND)
+        return DEFAULT_SCORING_BACKEND
+    return backend
+
+
+def build_ngram_scorers(name_index: Dict[str, Tuple[IndexedEntry, ...]]) -> Dict[str, NgramScorer]:
+    """Build one n-gram scorer per gender pool."""
+    return {gender: NgramScorer(entries) for gender, entries in name_index.items()}
+
+
+def build_edit_scorers(name_index: Dict[str, Tuple[IndexedEntry, ...]], metric: str) -> Dict[str, EditDistanceScorer]:
+    """Build one bit-parallel edit scorer per gender pool."""
+    return {gender: EditDistanceScorer(entries, metric) for gender, entries in name_index.items()}
+
+
+def phonetic_key(text: str) -> str:
+    """Map a romanized or English name to a coarse consonant-class key.
+
+    Folds l/r, f/p/v/b, th/t, ch/j, lenis/aspirated/tense stops and drops
+    vowels and non-initial h, keeping a single marker for a leading vowel.
+    """
+    folded = normalize_romanization(text)
+    for source, target in PHONETIC_DIGRAPHS:
+        folded = folded.replace(source, target)
+    folded = folded.translate(PHONETIC_FOLDS)
+
+    key: List[str] = []
+    previous = ""
+    for position, char in enumerate(folded):
+        if char in PHONETIC_VOWELS:
+            if position == 0:
+                key.append("a")
+        elif char != previous and (char != "h" or position == 0):
+            key.append(char)
+        previous = char
+    return "".join(key)
+
+
+class PhoneticIndex:
+    """Buckets of entry ids keyed by the phonetic keys of their romanizations."""
+
+    def __init__(self, indexed_entries: Sequence[IndexedEntry]) -> None:
+        buckets: Dict[str, List[int]] = {}
+        prefix_buckets: Dict[str, List[int]] = {}
+        for entry_id, indexed in enumerate(indexed_entries):
+            keys, prefixes = self.entry_keys(indexed)
+            for key in keys:
+                buckets.setdefault(key, []).append(entry_id)
+            for prefix in prefixes:
+                prefix_buckets.setdefault(prefix, []).append(entry_id)
+        self.buckets: Mapping[str, Sequence[int]] = {key: tuple(ids) for key, ids in buckets.items()}
+        self.prefix_buckets: Mapping[str, Sequence[int]] = {key: tuple(ids) for key, ids in prefix_buckets.items()}
+
+    @classmethod
+    def from_postings(
+        cls, buckets: Mapping[str, Sequence[int]], prefix_buckets: Mapping[str, Sequence[int]]
+    ) -> "PhoneticIndex":
+        """Wrap prebuilt buckets, such as those read from the name store."""
+        index = cls.__new__(cls)
+        index.buckets = buckets
+        index.prefix_buckets = prefix_buckets
+        return index
+
+    @staticmethod
+    def entry_keys(indexed: IndexedEntry) -> Tuple[set[str], set[str]]:
+        """Return an entry's phonetic keys and the shorter prefixes of those keys."""
+        keys = {phonetic_key(candidate.text) for candidate in indexed.candidates}
+        prefixes = {key[:size] for key in keys for size in range(PHONETIC_MIN_NEAR_KEY, len(key))}
+        keys.discard("")
+        return keys, prefixes
+
+    def with_changes(self, changes: Sequence[SlotChange]) -> "PhoneticIndex":
+        """Return a copy with the changed slots moved between buckets."""
+        edits = []
+        for position in (0, 1):
+            removals = [
+                (key, change.slot) for change in changes if change.old
+                for key in self.entry_keys(change.old)[position]
+            ]
+            additions = [
+                (key, change.slot) for change in changes if change.new
+                for key in self.entry_keys(change.new)[position]
+            ]
+            edits.append((removals, additions))
+        return self.from_postings(
+            edit_postings(self.buckets, *edits[0]), edit_postings(self.prefix_buckets, *edits[1])
+        )
+
+    def lookup(self, english_name: str) -> Dict[int, float]:
+        """Return entry ids in exact and near buckets, mapped to their score bonus."""
+        key = phonetic_key(english_name)
+        hits: Dict[int, float] = {}
+        if not key:
+            return hits
+        for entry_id in self.buckets.get(key, ()):
+            hits[entry_id] = PHONETIC_EXACT_BONUS
+        # Near keys: entries extending the input key, then those sharing ever shorter prefixes
+        near_ids = list(self.prefix_buckets.get(key, ()))
+        for size in range(len(key) - 1, PHONETIC_MIN_NEAR_KEY - 1, -1):
+            near_ids.extend(self.buckets.get(key[:size], ()))
+            near_ids.extend(self.prefix_buckets.get(key[:size], ()))
+        for entry_id in near_ids:
+            hits.setdefault(entry_id, PHONETIC_NEAR_BONUS)
+        return hits
+
+    @classmethod
+    def entry_bonus(cls, english_name: str, indexed: IndexedEntry) -> float:
+        """Return the bonus ``lookup`` would give an entry that is not in the index."""
+        key = phonetic_key(english_name)
+        if not key:
+            return 0.0
+        keys, prefixes = cls.entry_keys(indexed)
+        if key in keys:
+            return PHONETIC_EXACT_BONUS
+        shorter = (key[:size] for size in range(PHONETIC_MIN_NEAR_KEY, len(key)))
+        if key in prefixes or any(prefix in keys or prefix in prefixes for prefix in shorter):
+            return PHONETIC_NEAR_BONUS
+        return 0.0
 
-    normalized_input = normalize_name(original_name)
-    selections: List[Dict[str, Any]] = []
 
-    # Prefer exact special matches if provided in the dataset
-    for entry in gender_names:
-        special = entry.get("special_match")
-        if special and normalize_name(special) == normalized_input:
-            selections.append(entry)
-            break
+def build_phonetic_indexes(name_index: Dict[str, Tuple[IndexedEntry, ...]]) -> Dict[str, PhoneticIndex]:
+    """Build one phonetic bucket index per gender pool."""
+    return {gender: PhoneticIndex(entries) for gender, entries in name_index.items()}
+
+
+def build_trigram_indexes(name_index: Dict[str, Tuple[IndexedEntry, ...]]) -> Dict[str, TrigramIndex]:
+    """Build one trigram inverted index per gender pool."""
+    return {gender: TrigramIndex(entries) for gender, entries in name_index.items()}
+
+
+def build_special_matches(name_index: Dict[str, Tuple[IndexedEntry, ...]]) -> Dict[str, Dict[str, int]]:
+    """Map each pool's normalized ``special_match`` names to their entry ids."""
+    special_matches: Dict[str, Dict[str, int]] = {}
+    for gender, entries in name_index.items():
+        lookup: Dict[str, int] = {}
+        for entry_id, indexed in enumerate(entries):
+            if indexed.special:
+                lookup.setdefault(normalize_name(indexed.entry.special_match or ""), entry_id)
+        special_matches[gender] = lookup
+    return special_matches
+
+
+def build_special_ids(name_index: Dict[str, Sequence[IndexedEntry]]) -> Dict[str, frozenset[int]]:
+    """Collect the ids of entries flagged as special matches, per pool."""
+    return {
+        gender: frozenset(entry_id for entry_id, indexed in enumerate(entries) if indexed.special)
+        for gender, entries in name_index.items()
+    }
+
+
+def update_special_matches(
+    indexed_entries: Sequence[IndexedEntry], special_ids: frozenset[int], changes: Sequence[SlotChange]
+) -> Tuple[Dict[str, int], frozenset[int]]:
+    """Patch one pool's special ids for changed slots and rebuild its small lookup."""
+    ids = set(special_ids)
+    for change in changes:
+        ids.discard(change.slot)
+        if change.new is not None and change.new.special:
+            ids.add(change.slot)
+    lookup: Dict[str, int] = {}
+    for entry_id in sorted(ids):
+        lookup.setdefault(normalize_name(indexed_entries[entry_id].entry.special_match or ""), entry_id)
+    return lookup, frozenset(ids)
+
+
+class NameColumns:
+    """Column-oriented view of the catalog, kept alongside a dataset's name pools.
+
+    Pools are stored back to back, so row ``pool_start + entry_id`` holds an
+    entry. Gender, category, initial and Korean name are small integer codes
+    (0 means empty); names and romanizations live in one packed string
+    buffer, addressed by three offsets per row (name start, romanization
+    start and end). With NumPy installed, filters and the diversity rules
+    run as vectorized masks over these columns.
+    """
+
+    COLUMNS = ("gender_codes", "category_codes", "initial_codes", "name_codes", "romanization_lengths")
+
+    def __init__(self, names_data: Dict[str, Sequence[NameEntry]], name_index: Dict[str, Tuple[IndexedEntry, ...]]) -> None:
+        self.genders: List[str] = list(names_data)
+        self.categories: List[str] = [""]
+        self.initials: List[str] = [""]
+        self.names: List[str] = [""]
+        self.pool_ranges: Dict[str, Tuple[int, int]] = {}
+        self.gender_codes = array("B")
+        self.category_codes = array("I")
+        self.initial_codes = array("I")
+        self.name_codes = array("I")
+        self.romanization_lengths = array("H")
+        self.text_offsets = array("I")
+        self.stale_text = 0
+        self.category_lookup: Dict[str, int] = {"": 0}
+        self._lookups = {"category": self.category_lookup, "initial": {"": 0}, "name": {"": 0}}
+
+        parts: List[str] = []
+        text_length = 0
+        for gender_code, gender in enumerate(self.genders):
+            start = len(self.gender_codes)
+            for entry, indexed in zip(names_data[gender], name_index.get(gender, ())):
+                self.gender_codes.append(gender_code)
+                for column, value in zip(self.COLUMNS[1:], self._encode_row(indexed)):
+                    getattr(self, column).append(value)
+                offsets, texts = self._text_row(indexed, text_length)
+                self.text_offsets.extend(offsets)
+                parts.extend(texts)
+                text_length = offsets[2]
+            self.pool_ranges[gender] = (start, len(self.gender_codes))
+        self.text_buffer = "".join(parts)
+        self._attach_arrays()
+
+    @classmethod
+    def from_store(cls, store: MappedStore) -> "NameColumns":
+        """Build the columns as zero-copy views over a mapped name store."""
+        meta = store.metadata["columns"]
+        columns = cls.__new__(cls)
+        columns.genders = list(store.metadata["genders"])
+        columns.categories = list(meta["categories"])
+        columns.initials = list(meta["initials"])
+        columns.names = store.strings("columns.names")
+        columns.pool_ranges = {gender: (start, stop) for gender, (start, stop) in meta["pool_ranges"].items()}
+        for column in cls.COLUMNS + ("text_offsets",):
+            setattr(columns, column, store.section(f"columns.{column}"))
+        columns.text_buffer = store.text("columns.text_buffer")
+        columns.category_lookup = {category: code for code, category in enumerate(columns.categories)}
+        columns._attach_arrays()
+        return columns
+
+    def store_sections(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return the metadata and sections that ``from_store`` reads back."""
+        meta = {
+            "categories": self.categories,
+            "initials": self.initials,
+            "pool_ranges": {gender: list(bounds) for gender, bounds in self.pool_ranges.items()},
+        }
+        names_blob, names_offsets = pack_strings(self.names)
+        sections: Dict[str, Any] = {"columns.names.blob": names_blob, "columns.names.offsets": names_offsets}
+        for column in self.COLUMNS + ("text_offsets",):
+            sections[f"columns.{column}"] = getattr(self, column)
+        sections["columns.text_buffer"] = self.text_buffer.encode("utf-32-le")
+        return meta, sections
+
+    def _attach_arrays(self) -> None:
+        self._arrays: Dict[str, Any] = {}
+        if np is not None:
+            for column in self.COLUMNS:
+                values = getattr(self, column)
+                dtype = np.dtype(memoryview(values).format)
+                self._arrays[column] = np.frombuffer(values, dtype=dtype) if len(values) else np.zeros(0, dtype=dtype)
+
+    @staticmethod
+    def _encode(lookup: Dict[str, int], vocabulary: List[str], value: str) -> int:
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(vocabulary)
+            vocabulary.append(value)
+        return code
+
+    def _encode_row(self, indexed: IndexedEntry) -> Tuple[int, int, int, int]:
+        """Return an entry's category, initial, name and romanization length codes."""
+        entry = indexed.entry
+        return (
+            self._encode(self._lookups["category"], self.categories, entry.category),
+            self._encode(self._lookups["initial"], self.initials, entry.initial),
+            self._encode(self._lookups["name"], self.names, entry.name),
+            min(indexed.candidates[0].length, 0xFFFF) if indexed.candidates else 0,
+        )
+
+    @staticmethod
+    def _text_row(indexed: IndexedEntry, start: int) -> Tuple[Tuple[int, int, int], Tuple[str, str]]:
+        """Return an entry's text offsets when written at ``start``, and the texts."""
+        name = indexed.entry.name
+        romanization = "\t".join(indexed.entry.romanization)
+        return (start, start + len(name), start + len(name) + len(romanization)), (name, romanization)
+
+    def with_changes(self, gender: str, changes: Sequence[SlotChange], pool_length: int) -> "NameColumns":
+        """Return columns with one pool's changed slots rewritten.
+
+        The pool is truncated or extended to ``pool_length``; every other
+        pool is copied as whole array slices and shifted. Vocabularies are
+        copied before new values are added, and categories no row uses any
+        more are dropped. New text is appended to the end of the buffer;
+        ``stale_text`` counts the characters left behind by replaced rows.
+        This instance is left unchanged.
+        """
+        if not hasattr(self, "_lookups"):
+            raise ValueError("Columns mapped from a name store cannot be updated")
+        columns = copy.copy(self)
+        columns.categories = list(self.categories)
+        columns.initials = list(self.initials)
+        columns.names = list(self.names)
+        columns._lookups = {key: dict(lookup) for key, lookup in self._lookups.items()}
+        columns.category_lookup = columns._lookups["category"]
+        gender_code = self.genders.index(gender)
+        start, stop = self.pool_ranges[gender]
+        pool = {column: getattr(self, column)[start:stop] for column in self.COLUMNS}
+        pool["text_offsets"] = self.text_offsets[3 * start:3 * stop]
+        for column, values in pool.items():
+            length = pool_length * (3 if column == "text_offsets" else 1)
+            if len(values) > length:
+                del values[length:]
+            else:
+                values.extend([0] * (length - len(values)))
+
+        offsets = pool["text_offsets"]
+        parts: List[str] = []
+        text_length = len(self.text_buffer)
+        stale_text = self.stale_text
+        for change in changes:
+            if change.old is not None:
+                row = 3 * (start + change.slot)
+                stale_text += self.text_offsets[row + 2] - self.text_offsets[row]
+            if change.new is None:
+                continue
+            slot = change.slot
+            pool["gender_codes"][slot] = gender_code
+            for column, value in zip(self.COLUMNS[1:], columns._encode_row(change.new)):
+                pool[column][slot] = value
+            row_offsets, texts = self._text_row(change.new, text_length)
+            offsets[3 * slot:3 * slot + 3] = array("I", row_offsets)
+            parts.extend(texts)
+            text_length = row_offsets[2]
+
+        for column, values in pool.items():
+            width = 3 if column == "text_offsets" else 1
+            whole = getattr(self, column)
+            setattr(columns, column, whole[:width * start] + values + whole[width * stop:])
+        columns.text_buffer = self.text_buffer + "".join(parts)
+        columns.stale_text = stale_text
+        columns._drop_unused_categories()
+
+        shift = pool_length - (stop - start)
+        columns.pool_ranges = {}
+        for code, name in enumerate(self.genders):
+            first, last = self.pool_ranges[name]
+            if code == gender_code:
+                last = first + pool_length
+            elif code > gender_code:
+                first, last = first + shift, last + shift
+            columns.pool_ranges[name] = (first, last)
+        columns._attach_arrays()
+        return columns
+
+    def _drop_unused_categories(self) -> None:
+        """Renumber the categories still in use, so removed ones no longer look up."""
+        if np is not None:
+            counts = np.bincount(np.asarray(self.category_codes), minlength=len(self.categories))
+            used = [code for code, count in enumerate(counts.tolist()) if count or not code]
+        else:
+            used = sorted(set(self.category_codes) | {0})
+        if len(used) == len(self.categories):
+            return
+        remap = [0] * len(self.categories)
+        for code, old_code in enumerate(used):
+            remap[old_code] = code
+        self.category_codes = array("I", [remap[code] for code in self.category_codes])
+        self.categories = [self.categories[code] for code in used]
+        self.category_lookup = self._lookups["category"] = {
+            category: code for code, category in enumerate(self.categories)
+        }
+
+    @property
+    def vectorized(self) -> bool:
+        """Whether NumPy-backed masks are available."""
+        return bool(self._arrays)
+
+    def pool_column(self, column: str, gender: str) -> Any:
+        """Return a NumPy view of a column restricted to one gender pool."""
+        start, stop = self.pool_ranges.get(gender, (0, 0))
+        return self._arrays[column][start:stop]
+
+    def korean_name(self, row: int) -> str:
+        """Read a row's Korean name from the packed buffer."""
+        return self.text_buffer[self.text_offsets[3 * row]:self.text_offsets[3 * row + 1]]
+
+    def romanizations(self, row: int) -> Tuple[str, ...]:
+        """Read a row's listed romanizations from the packed buffer."""
+        packed = self.text_buffer[self.text_offsets[3 * row + 1]:self.text_offsets[3 * row + 2]]
+        return tuple(packed.split("\t")) if packed else ()
+
+    def has_category(self, gender: str, category: str) -> bool:
+        """Return whether any entry of a pool belongs to ``category``."""
+        code = self.category_lookup.get(category)
+        if code is None:
+            return False
+        if self.vectorized:
+            return bool((self.pool_column("category_codes", gender) == code).any())
+        start, stop = self.pool_ranges.get(gender, (0, 0))
+        return code in self.category_codes[start:stop]
+
+    def category_ids(self, gender: str, category: str) -> List[int]:
+        """Return the entry ids of a pool that belong to ``category``."""
+        code = self.category_lookup.get(category)
+        if code is None:
+            return []
+        if self.vectorized:
+            return np.flatnonzero(self.pool_column("category_codes", gender) == code).tolist()
+        start, stop = self.pool_ranges.get(gender, (0, 0))
+        return [row - start for row in range(start, stop) if self.category_codes[row] == code]
+
+    def select_diverse(
+        self,
+        gender: str,
+        entry_ids: Sequence[int],
+        scores: Sequence[float],
+        tie_breaks: Sequence[float],
+        selected_ids: Sequence[int],
+        k: int = RECOMMENDATION_COUNT,
+    ) -> Tuple[List[int], set[str]]:
+        """Vectorized equivalent of ``select_diverse_top_k``.
+
+        Only the best-scored prefix of the ranking is sorted, doubling it
+        until the picks are complete. Each slot is filled by the first
+        candidate past the previous pick whose initial (first slots) or
+        category (later slots) and name codes pass the seen masks.
+        """
+        ids = np.asarray(entry_ids, dtype=np.int64)
+        score_values = np.asarray(scores, dtype=np.float64)
+        tie_values = np.asarray(tie_breaks, dtype=np.float64)
+        prefix = min(len(ids), max(64, 16 * k))
+
+        while True:
+            if prefix < len(ids):
+                threshold = np.partition(score_values, len(ids) - prefix)[len(ids) - prefix]
+                subset = np.flatnonzero(score_values >= threshold)
+            else:
+                subset = np.arange(len(ids))
+            order = subset[np.lexsort((tie_values[subset], -score_values[subset]))]
+            picked, seen_names, exhausted = self._pick_ranked(gender, ids[order], selected_ids, k)
+            if not exhausted or len(subset) >= len(ids):
+                return picked, seen_names
+            prefix *= 2
+
+    def _pick_ranked(
+        self, gender: str, ranked: Any, selected_ids: Sequence[int], k: int
+    ) -> Tuple[List[int], set[str], bool]:
+        """Apply the diversity rules over ranked ids; report if the ranking ran out."""
+        initials = self.pool_column("initial_codes", gender)[ranked]
+        categories = self.pool_column("category_codes", gender)[ranked]
+        names = self.pool_column("name_codes", gender)[ranked]
+
+        picked = list(selected_ids)
+        seen_initials: List[int] = []
+        seen_categories: List[int] = []
+        seen_names: List[int] = []
+        position = 0
+        exhausted = False
+        while len(picked) < k:
+            if len(picked) < DISTINCT_INITIAL_SLOTS:
+                allowed = ~np.isin(initials[position:], seen_initials)
+            else:
+                allowed = ~np.isin(categories[position:], seen_categories)
+            allowed &= ~np.isin(names[position:], seen_names)
+            hits = np.flatnonzero(allowed)
+            if not hits.size:
+                exhausted = True
+                break
+            position += int(hits[0])
+            picked.append(int(ranked[position]))
+            for seen, codes in ((seen_initials, initials), (seen_categories, categories), (seen_names, names)):
+                if codes[position]:
+                    seen.append(int(codes[position]))
+            position += 1
+
+        return picked, {self.names[code] for code in seen_names}, exhausted
+
+
+class Syllable(NamedTuple):
+    """A syllable of the composer's inventory and the entry it was taken from."""
+
+    hangul: str
+    hanja: str
+    pattern: similarity.BitPattern
+    source: NameEntry
+
+
+class NameComposer:
+    """Compose new two-syllable names from syllables of a pool's entries.
+
+    Each position keeps its ``GENERATOR_INVENTORY_SIZE`` most common
+    syllable and hanja pairs from two-syllable entries. ``compose`` runs a
+    beam search: first syllables are ranked by how well their romanization
+    fits the start of the input, and the best ``GENERATOR_BEAM_WIDTH`` are
+    extended with every second syllable fitted against the rest, starting
+    up to one character either side of where the first one ends. The fit of
+    a syllable to a piece of input is memoized across requests, since
+    inputs share their beginnings. The beam width bounds the work, so the
+    names composed for an input never depend on machine load.
+    """
+
+    def __init__(self, entries: Sequence[NameEntry]) -> None:
+        counts: Tuple[Counter[Tuple[str, str]], Counter[Tuple[str, str]]] = (Counter(), Counter())
+        sources: Tuple[Dict[Tuple[str, str], NameEntry], Dict[Tuple[str, str], NameEntry]] = ({}, {})
+        existing: set[str] = set()
+        for entry in entries:
+            existing.add(entry.name)
+            if len(entry.name) != 2 or len(entry.hanja) != 2 or entry.special_match:
+                continue
+            for position in (0, 1):
+                key = (entry.name[position], entry.hanja[position])
+                counts[position][key] += 1
+                sources[position].setdefault(key, entry)
+        self.existing = frozenset(existing)
+        self._fits: Dict[Tuple[str, str], float] = {}
+        self.inventory = tuple(
+            tuple(
+                Syllable(hangul, hanja, similarity.compile_pattern(romanization.romanize(hangul)), sources[position][key])
+                for key, _ in counts[position].most_common(GENERATOR_INVENTORY_SIZE)
+                for hangul, hanja in (key,)
+            )
+            for position in (0, 1)
+        )
+
+    def compose(
+        self, english_norm: str, count: int, category: Optional[str] = None, beam_width: int = GENERATOR_BEAM_WIDTH
+    ) -> List[NameEntry]:
+        """Return up to ``count`` novel names whose romanization best fits ``english_norm``."""
+        firsts, seconds = (
+            [syllable for syllable in syllables if category is None or syllable.source.category == category]
+            for syllables in self.inventory
+        )
+        if not english_norm or not firsts or not seconds or count <= 0:
+            return []
+
+        fits = self._fits
+        if len(fits) > GENERATOR_FIT_CACHE_SIZE:
+            fits.clear()
+
+        def fit(syllable: Syllable, offset: int) -> float:
+            key = (syllable.pattern.text, english_norm[offset:offset + syllable.pattern.length])
+            score = fits.get(key)
+            if score is None:
+                score = fits[key] = similarity.levenshtein_ratio(syllable.pattern, key[1])
+            return score
+
+        beam = heapq.nlargest(beam_width, firsts, key=lambda syllable: fit(syllable, 0))
+        limit = count * beam_width
+        best: List[Tuple[float, str, Syllable, Syllable]] = []
+        # Matched characters of every second syllable, per length of the first
+        tails: Dict[int, List[float]] = {}
+        for first in beam:
+            offset = first.pattern.length
+            tail = tails.get(offset)
+            if tail is None:
+                starts = range(max(1, offset - 1), offset + 2)
+                tail = tails[offset] = [
+                    second.pattern.length * max(fit(second, start) for start in starts) for second in seconds
+                ]
+            prefix = offset * fit(first, 0)
+            for second, matched in zip(seconds, tail):
+                # Input left over after both syllables counts as unmatched
+                score = (prefix + matched) / max(len(english_norm), offset + second.pattern.length)
+                if len(best) >= limit and score <= best[0][0]:
+                    continue
+                name = first.hangul + second.hangul
+                if name in self.existing or first.hangul == second.hangul:
+                    continue
+                if len(best) < limit:
+                    heapq.heappush(best, (score, name, first, second))
+                else:
+                    heapq.heapreplace(best, (score, name, first, second))
+
+        composed: Dict[str, NameEntry] = {}
+        for _, name, first, second in sorted(best, reverse=True):
+            if len(composed) >= count:
+                break
+            if name not in composed:
+                composed[name] = self._entry(first, second)
+        return list(composed.values())
+
+    @staticmethod
+    def _entry(first: Syllable, second: Syllable) -> NameEntry:
+        name = first.hangul + second.hangul
+        romanized = romanization.romanize(name)
+        return NameEntry(
+            -1,
+            name,
+            first.hanja + second.hanja,
+            (romanized.capitalize(), f"{first.pattern.text.capitalize()}-{second.pattern.text}"),
+            first.source.category,
+            f"Composed of {first.hanja} from {first.source.name} and {second.hanja} from {second.source.name}",
+            romanized[:1].upper(),
+        )
+
+
+def parse_name_token_weights(raw: Optional[str]) -> Tuple[float, float, float]:
+    """Parse "first,middle,last" token weights, falling back to the defaults."""
+    if not raw:
+        return DEFAULT_NAME_TOKEN_WEIGHTS
+    try:
+        first, middle, last = (float(part) for part in raw.split(","))
+    except ValueError:
+        logger.warning("Invalid name token weights '%s'; using defaults", raw)
+        return DEFAULT_NAME_TOKEN_WEIGHTS
+    return first, middle, last
+
+
+def tokenize_name(name: str) -> List[str]:
+    """Split a full name on whitespace into normalized romanization tokens."""
+    tokens = [normalize_romanization(part) for part in name.split()]
+    return [token for token in tokens if token]
+
+
+def name_token_weights(count: int) -> List[float]:
+    """Return the combination weight of each token in a name of ``count`` tokens."""
+    if count <= 1:
+        return [1.0] * count
+    first, middle, last = NAME_TOKEN_WEIGHTS
+    return [first, *([middle] * (count - 2)), last]
+
+
+def score_gender_pool(
+    english_norm: str,
+    gender: str,
+    entry_ids: Sequence[int],
+    bonuses: Optional[Dict[int, float]] = None,
+    prune: bool = True,
+    dataset: Optional[Dataset] = None,
+    pruned: Optional[Dict[int, float]] = None,
+) -> List[float]:
+    """Score a normalized input against the given entries of a gender pool.
+
+    ``bonuses`` are the extra points the caller will add per entry; the
+    edit-distance backends use them to set their early-exit cutoffs, which
+    ``prune=False`` disables when scores are combined across name tokens.
+    Entries whose scores the cutoffs may have lowered are added to
+    ``pruned`` with an upper bound on their exact score.
+    """
+    dataset = dataset or current_dataset()
+    indexed_entries = dataset.name_index.get(gender, ())
+    if not english_norm:
+        return [0.0] * len(entry_ids)
+
+    scorer = dataset.ngram_scorers.get(gender)
+    if scorer is not None:
+        scores = scorer.score(english_norm)
+        return scores[list(entry_ids)].tolist()
+
+    edit_scorer = dataset.edit_scorers.get(gender)
+    if edit_scorer is not None:
+        if not prune:
+            return [edit_scorer.score_entry(english_norm, entry_id) for entry_id in entry_ids]
+        return edit_scorer.score(english_norm, entry_ids, bonuses, pruned)
+
+    matcher = SequenceMatcher(None, english_norm, "")
+    if isinstance(indexed_entries, MappedIndexPool):
+        # Decoding whole entries would dominate a full scan; the packed features suffice
+        return [score_candidates(english_norm, matcher, *indexed_entries.features(entry_id)) for entry_id in entry_ids]
+    return [score_indexed_entry(english_norm, matcher, indexed_entries[entry_id]) for entry_id in entry_ids]
+
+
+SCORING_BACKEND = resolve_scoring_backend(os.environ.get("NAEILUM_SCORING_BACKEND", DEFAULT_SCORING_BACKEND))
+NAME_TOKEN_WEIGHTS = parse_name_token_weights(os.environ.get("NAEILUM_NAME_TOKEN_WEIGHTS"))
+
+
+@lru_cache(maxsize=1024)
+def resolve_timezone(name: str) -> tzinfo:
+    """Return the IANA zone called ``name``; raise ValueError for unknown names."""
+    if not name or len(name) > MAX_TIMEZONE_LENGTH:
+        raise ValueError(f"Invalid timezone: {name!r}")
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise ValueError(f"Unknown timezone: {name!r}") from exc
+
 
-    scored_candidates: List[Tuple[float, float, Dict[str, Any]]] = []
-    for entry in gender_names:
-        if entry in selections or entry.get("special_match"):
+@lru_cache(maxsize=1)
+def default_timezone() -> Optional[tzinfo]:
+    """Return the zone of ``NAEILUM_FORTUNE_TIMEZONE``, or None for the server's local time."""
+    if not FORTUNE_DEFAULT_TIMEZONE:
+        return None
+    try:
+        return resolve_timezone(FORTUNE_DEFAULT_TIMEZONE)
+    except ValueError:
+        logger.warning("Ignoring NAEILUM_FORTUNE_TIMEZONE=%r; using local time", FORTUNE_DEFAULT_TIMEZONE)
+        return None
+
+
+def fortune_day(moment: Optional[datetime] = None, zone: Optional[tzinfo] = None) -> str:
+    """Return the date string fortunes are drawn for, today in ``zone`` by default."""
+    if moment is None:
+        moment = datetime.now(zone or default_timezone())
+    elif zone is not None:
+        moment = moment.astimezone(zone)
+    return moment.date().isoformat()
+
+
+def next_midnight(moment: datetime) -> datetime:
+    """Return the start of the day after ``moment``."""
+    return datetime(moment.year, moment.month, moment.day) + timedelta(days=1)
+
+
+def utc_now() -> datetime:
+    """Return the current UTC time as a naive datetime."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def active_fortune_days(now: Optional[datetime] = None) -> List[str]:
+    """Return every date that is today in some timezone, oldest first.
+
+    ``now`` is a naive UTC time. The next date is included from
+    ``FORTUNE_ROLLOVER_LEAD`` seconds before it starts anywhere, so the
+    list never holds more than three dates.
+    """
+    now = now or utc_now()
+    first = (now + EARLIEST_UTC_OFFSET).date()
+    last = (now + LATEST_UTC_OFFSET + timedelta(seconds=FORTUNE_ROLLOVER_LEAD)).date()
+    return [(first + timedelta(days=offset)).isoformat() for offset in range((last - first).days + 1)]
+
+
+def next_fortune_rollover(now: datetime) -> datetime:
+    """Return the next naive UTC time at which ``active_fortune_days`` changes."""
+    lead = LATEST_UTC_OFFSET + timedelta(seconds=FORTUNE_ROLLOVER_LEAD)
+    added = next_midnight(now + lead) - lead
+    dropped = next_midnight(now + EARLIEST_UTC_OFFSET) - EARLIEST_UTC_OFFSET
+    return min(added, dropped)
+
+
+class FortuneTable:
+    """One day's fortune for every catalog name, as a message position per category.
+
+    A row is one keyed BLAKE2 digest of the day, the category names and the
+    Korean name, read as 32-bit words: each category takes its own word
+    modulo its message count, with further digests past 16 categories. The
+    hasher holding the day and categories is prepared once per table, so a
+    row costs one short update. ``legacy_seeding`` draws rows from a
+    generator seeded with the name and day instead, reproducing the
+    fortunes given before. Rows are packed into bytes while every category
+    has at most 256 messages.
+    """
+
+    def __init__(
+        self,
+        day: str,
+        fortunes: Sequence[Dict[str, Any]],
+        names: Iterable[str] = (),
+        legacy_seeding: bool = FORTUNE_LEGACY_SEEDING,
+    ) -> None:
+        self.day = day
+        self.legacy_seeding = legacy_seeding
+        self.categories: List[Tuple[str, str, List[Tuple[str, str]]]] = []
+        for category_data in fortunes:
+            category = category_data.get("category", "")
+            messages = [
+                (message.get("en", ""), message.get("ko", "")) if isinstance(message, dict) else (str(message), "")
+                for message in category_data.get("messages", [])
+            ]
+            if messages:
+                self.categories.append((category, category_data.get("category_ko", category), messages))
+        self._pack = bytes if all(len(messages) <= 256 for _, _, messages in self.categories) else tuple
+        self._counts = [len(messages) for _, _, messages in self.categories]
+        categories = RECORD_SEPARATOR.join(category for category, _, _ in self.categories)
+        self._hashers = []
+        words_per_digest = FORTUNE_DIGEST_WORDS.size // 4
+        for block in range(-(-len(self._counts) // words_per_digest)):
+            prefix = RECORD_SEPARATOR.join((day, str(block), categories, "")).encode("utf-8")
+            self._hashers.append(hashlib.blake2b(prefix, key=FORTUNE_KEY))
+        self.rows: Dict[str, Sequence[int]] = {}
+        self.add(names)
+
+    def row(self, korean_name: str) -> Sequence[int]:
+        """Draw a name's message positions for the table's day."""
+        if self.legacy_seeding:
+            seed_string = f"{korean_name}{self.day}"
+            rng = random.Random(hashlib.md5(seed_string.encode(), usedforsecurity=False).hexdigest())
+            return self._pack(rng.randrange(len(messages)) for _, _, messages in self.categories)
+        name = korean_name.encode("utf-8")
+        words: List[int] = []
+        for prefix in self._hashers:
+            hasher = prefix.copy()
+            hasher.update(name)
+            words.extend(FORTUNE_DIGEST_WORDS.unpack(hasher.digest()))
+        # 32-bit words leave a modulo bias of under count / 2**32
+        return self._pack([word % count for word, count in zip(words, self._counts)])
+
+    def add(self, names: Iterable[str]) -> None:
+        """Precompute rows for names not in the table yet."""
+        rows = self.rows
+        for name in names:
+            if name not in rows:
+                rows[name] = self.row(name)
+
+    def with_names(self, names: Iterable[str]) -> "FortuneTable":
+        """Return a copy that also holds rows for ``names``, leaving this table untouched."""
+        table = copy.copy(self)
+        table.rows = dict(self.rows)
+        table.add(names)
+        return table
+
+    def render(self, row: Sequence[int]) -> List[Dict[str, str]]:
+        """Return the fortune messages a row points to."""
+        return [
+            {"category": category, "category_ko": category_ko, "message": message_en, "message_ko": message_ko}
+            for (category, category_ko, messages), index in zip(self.categories, row)
+            for message_en, message_ko in (messages[index],)
+        ]
+
+
+class Dataset(NamedTuple):
+    """One load of the names and fortunes with every index derived from them.
+
+    A dataset is never modified after it is built. Reloads build a new one
+    and swap the module reference, so code holding a dataset keeps a
+    consistent view of a single version.
+    """
+
+    version: str
+    source_hash: str
+    names: Dict[str, Sequence[NameEntry]]
+    fortunes: List[Dict[str, Any]]
+    name_index: Dict[str, Sequence[IndexedEntry]]
+    trigram_indexes: Dict[str, TrigramIndex]
+    phonetic_indexes: Dict[str, PhoneticIndex]
+    special_matches: Dict[str, Dict[str, int]]
+    special_ids: Dict[str, frozenset[int]]
+    columns: NameColumns
+    ngram_scorers: Dict[str, NgramScorer]
+    edit_scorers: Dict[str, EditDistanceScorer]
+    composers: Dict[str, NameComposer]
+    score_bounds: Dict[str, ScoreBounds]
+    store: Optional[MappedStore] = None
+
+
+def build_scorers(name_index: Dict[str, Sequence[IndexedEntry]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build the n-gram or edit-distance scorers the configured backend needs."""
+    ngram_scorers = build_ngram_scorers(name_index) if SCORING_BACKEND == "ngram" else {}
+    edit_scorers = build_edit_scorers(name_index, SCORING_BACKEND) if SCORING_BACKEND in similarity.METRICS else {}
+    return ngram_scorers, edit_scorers
+
+
+def build_dataset(
+    names_data: Dict[str, Sequence[NameEntry]], fortunes: List[Dict[str, Any]], version: str, source_hash: str
+) -> Dataset:
+    """Precompute match features and indexes for loaded name entries."""
+    name_index = build_name_index(names_data)
+    return Dataset(
+        version,
+        source_hash,
+        names_data,
+        fortunes,
+        name_index,
+        build_trigram_indexes(name_index),
+        build_phonetic_indexes(name_index),
+        build_special_matches(name_index),
+        build_special_ids(name_index),
+        NameColumns(names_data, name_index),
+        *build_scorers(name_index),
+        {},
+        {},
+    )
+
+
+def load_store_dataset(store: MappedStore, source_hash: str) -> Dataset:
+    """Wrap the mapped store's sections as a dataset, without rebuilding indexes."""
+    names_data: Dict[str, Sequence[NameEntry]] = {
+        gender: MappedNamePool(store.strings(f"{gender}.records")) for gender in store.metadata["genders"]
+    }
+    name_index: Dict[str, Sequence[IndexedEntry]] = {}
+    trigram_indexes: Dict[str, TrigramIndex] = {}
+    phonetic_indexes: Dict[str, PhoneticIndex] = {}
+    for gender, entries in names_data.items():
+        name_index[gender] = MappedIndexPool(entries, store.strings(f"{gender}.candidates"))
+        trigram_indexes[gender] = TrigramIndex.from_postings(store.postings(f"{gender}.trigrams"), len(entries))
+        phonetic_indexes[gender] = PhoneticIndex.from_postings(
+            store.postings(f"{gender}.phonetic"), store.postings(f"{gender}.phonetic_prefixes")
+        )
+    return Dataset(
+        store.dataset_version,
+        source_hash,
+        names_data,
+        json.loads(bytes(store.section("fortunes"))),
+        name_index,
+        trigram_indexes,
+        phonetic_indexes,
+        {gender: dict(lookup) for gender, lookup in store.metadata["special_matches"].items()},
+        {gender: frozenset(ids) for gender, ids in store.metadata["special_ids"].items()},
+        NameColumns.from_store(store),
+        *build_scorers(name_index),
+        {},
+        {},
+        store=store,
+    )
+
+
+NameDiff = Tuple[List[int], Dict[int, NameEntry], List[NameEntry]]
+
+
+def diff_name_pool(old_entries: Sequence[NameEntry], new_entries: Sequence[NameEntry]) -> NameDiff:
+    """Match two versions of a pool by ``(name, hanja)``.
+
+    Returns the ids of removed entries, the changed entries keyed by the id
+    they replace, and the added entries.
+    """
+    old_ids = {entry.identity: entry_id for entry_id, entry in enumerate(old_entries)}
+    updated: Dict[int, NameEntry] = {}
+    added: List[NameEntry] = []
+    for entry in new_entries:
+        entry_id = old_ids.pop(entry.identity, None)
+        if entry_id is None:
+            added.append(entry)
+        elif old_entries[entry_id].content() != entry.content():
+            updated[entry_id] = entry
+    # Whatever was not claimed by a new entry was removed
+    return sorted(old_ids.values()), updated, added
+
+
+def apply_name_diff(
+    indexed_entries: Sequence[IndexedEntry], diff: NameDiff
+) -> Tuple[List[IndexedEntry], List[SlotChange]]:
+    """Apply a pool diff and return the new pool with the slots it changed.
+
+    Entry ids stay stable: updates are written in place, a removed entry's
+    slot is filled by moving the last entry into it, and additions are
+    appended.
+    """
+    removed, updated, added = diff
+    pool = list(indexed_entries)
+    before: Dict[int, Optional[IndexedEntry]] = {}
+
+    def remember(slot: int) -> None:
+        if slot not in before:
+            before[slot] = pool[slot] if slot < len(pool) else None
+
+    for entry_id, entry in updated.items():
+        remember(entry_id)
+        pool[entry_id] = build_entry_features(entry.with_id(entry_id))
+    for entry_id in reversed(removed):
+        last = len(pool) - 1
+        remember(entry_id)
+        remember(last)
+        if entry_id != last:
+            pool[entry_id] = pool[last]._replace(entry=pool[last].entry.with_id(entry_id))
+        pool.pop()
+    for entry in added:
+        remember(len(pool))
+        pool.append(build_entry_features(entry.with_id(len(pool))))
+
+    changes = [
+        SlotChange(slot, old, pool[slot] if slot < len(pool) else None) for slot, old in sorted(before.items())
+    ]
+    return pool, changes
+
+
+def update_dataset(
+    base: Dataset, names_data: Dict[str, Sequence[NameEntry]], fortunes: List[Dict[str, Any]], source_hash: str
+) -> Optional[Dataset]:
+    """Derive a dataset from ``base`` by editing its indexes for the changed entries.
+
+    Returns None when a full build is the better choice: ``base`` is mapped
+    from a snapshot, the pools differ, or more than
+    ``INCREMENTAL_RELOAD_MAX_FRACTION`` of the catalog changed.
+    """
+    if base.store is not None or list(base.names) != list(names_data):
+        return None
+    diffs = {gender: diff_name_pool(base.names[gender], entries) for gender, entries in names_data.items()}
+    changed = sum(len(removed) + len(updated) + len(added) for removed, updated, added in diffs.values())
+    if changed > INCREMENTAL_RELOAD_MAX_FRACTION * sum(len(entries) for entries in names_data.values()):
+        return None
+
+    names = dict(base.names)
+    name_index = dict(base.name_index)
+    trigram_indexes = dict(base.trigram_indexes)
+    phonetic_indexes = dict(base.phonetic_indexes)
+    special_matches = dict(base.special_matches)
+    special_ids = dict(base.special_ids)
+    ngram_scorers = dict(base.ngram_scorers)
+    edit_scorers = dict(base.edit_scorers)
+    composers = dict(base.composers)
+    score_bounds = dict(base.score_bounds)
+    columns = base.columns
+    version = int(base.version, 16)
+    if fortunes != base.fortunes:
+        version += fortunes_digest(fortunes) - fortunes_digest(base.fortunes)
+    for gender, diff in diffs.items():
+        removed, updated, added = diff
+        if not (removed or updated or added):
             continue
-        score = compute_similarity_score(original_name, entry)
-        scored_candidates.append((score, random.random(), entry))
+        pool, changes = apply_name_diff(base.name_index[gender], diff)
+        name_index[gender] = tuple(pool)
+        entries = list(base.names[gender][:len(pool)])
+        entries.extend(indexed.entry for indexed in pool[len(entries):])
+        for change in changes:
+            if change.new is not None:
+                entries[change.slot] = change.new.entry
+        names[gender] = tuple(entries)
+        trigram_indexes[gender] = base.trigram_indexes[gender].with_changes(changes, len(pool))
+        phonetic_indexes[gender] = base.phonetic_indexes[gender].with_changes(changes)
+        special_matches[gender], special_ids[gender] = update_special_matches(
+            name_index[gender], base.special_ids[gender], changes
+        )
+        columns = columns.with_changes(gender, changes, len(pool))
+        if gender in ngram_scorers:
+            ngram_scorers[gender] = NgramScorer(name_index[gender])
+        if gender in edit_scorers:
+            edit_scorers[gender] = edit_scorers[gender].with_changes(name_index[gender], changes)
+        composers.pop(gender, None)
+        score_bounds.pop(gender, None)
+        for change in changes:
+            if change.old is not None:
+                version -= entry_digest(gender, change.old.entry)
+            if change.new is not None:
+                version += entry_digest(gender, change.new.entry)
+
+    # Replaced rows leave their text behind; compact once it outweighs the live text
+    if columns.stale_text * 2 > len(columns.text_buffer):
+        columns = NameColumns(names, name_index)
+    return Dataset(
+        format(version % DATASET_VERSION_MODULUS, "016x"),
+        source_hash,
+        names,
+        fortunes,
+        name_index,
+        trigram_indexes,
+        phonetic_indexes,
+        special_matches,
+        special_ids,
+        columns,
+        ngram_scorers,
+        edit_scorers,
+        composers,
+        score_bounds,
+    )
 
-    scored_candidates.sort(key=lambda item: (-item[0], item[1]))
 
+def load_dataset(source_hash: Optional[str] = None, base: Optional[Dataset] = None) -> Dataset:
+    """Load the current snapshot, or the JSON files when it is missing or stale.
+
+    When reloading JSON over a ``base`` dataset, small edits are applied to
+    its indexes incrementally instead of rebuilding them.
+    """
+    source_hash = source_hash or compute_source_hash()
+    store = open_name_store(NAME_STORE_PATH, source_hash)
+    if store is not None:
+        return load_store_dataset(store, source_hash)
+    names_data = build_name_entries(load_names())
+    fortunes = load_fortunes()
+    if base is not None:
+        started = time.perf_counter()
+        dataset = update_dataset(base, names_data, fortunes, source_hash)
+        if dataset is not None:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info("Updated dataset %s incrementally in %.1f ms", dataset.version, elapsed_ms)
+            return dataset
+    return build_dataset(names_data, fortunes, compute_dataset_version(names_data, fortunes), source_hash)
+
+
+# Load data on startup; reload_dataset() swaps in a new one
+DATASET = load_dataset()
+
+
+_composer_lock = threading.Lock()
+_score_bounds_lock = threading.Lock()
+
+
+def dataset_composer(dataset: Dataset, gender: str) -> Optional[NameComposer]:
+    """Return a pool's name composer, building it on first use.
+
+    Building reads every entry once, so it is deferred until a request
+    needs it rather than slowing down snapshot loads and incremental reloads.
+    """
+    composer = dataset.composers.get(gender)
+    if composer is None and gender in dataset.names:
+        with _composer_lock:
+            composer = dataset.composers.get(gender)
+            if composer is None:
+                composer = dataset.composers[gender] = NameComposer(dataset.names[gender])
+    return composer
+
+
+def dataset_score_bounds(dataset: Dataset, gender: str) -> Optional[ScoreBounds]:
+    """Return a pool's score bounds, built on first use like the composer; None without NumPy."""
+    if np is None or gender not in dataset.name_index:
+        return None
+    bounds = dataset.score_bounds.get(gender)
+    if bounds is None:
+        with _score_bounds_lock:
+            bounds = dataset.score_bounds.get(gender)
+            if bounds is None:
+                bounds = dataset.score_bounds[gender] = ScoreBounds(dataset.name_index[gender])
+    return bounds
+
+
+def current_dataset() -> Dataset:
+    """Return the live dataset, pinned for the rest of the current request."""
+    if has_request_context():
+        if "dataset" not in g:
+            g.dataset = DATASET
+        return g.dataset
+    return DATASET
+
+
+def write_name_store(path: str, dataset: Dataset) -> None:
+    """Write a dataset's catalog, fortunes and indexes as a memory-mappable snapshot.
+
+    The dataset's ``source_hash`` identifies the files it was loaded from, so
+    a later start can tell whether the snapshot is stale.
+    """
+    sections: Dict[str, Any] = {"fortunes": json.dumps(dataset.fortunes, ensure_ascii=False).encode("utf-8")}
+    for gender, entries in dataset.names.items():
+        candidate_texts = (
+            "\t".join([indexed.initial, *(candidate.text for candidate in indexed.candidates)])
+            for indexed in dataset.name_index[gender]
+        )
+        for name, values in (("records", (entry.to_record() for entry in entries)), ("candidates", candidate_texts)):
+            sections[f"{gender}.{name}.blob"], sections[f"{gender}.{name}.offsets"] = pack_strings(values)
+        for name, postings in (
+            ("trigrams", dataset.trigram_indexes[gender].postings),
+            ("phonetic", dataset.phonetic_indexes[gender].buckets),
+            ("phonetic_prefixes", dataset.phonetic_indexes[gender].prefix_buckets),
+        ):
+            for suffix, data in pack_postings(dict(postings)).items():
+                sections[f"{gender}.{name}.{suffix}"] = data
+
+    columns_meta, column_sections = dataset.columns.store_sections()
+    sections.update(column_sections)
+    metadata = {
+        "source_hash": dataset.source_hash,
+        "genders": list(dataset.names),
+        "special_matches": dataset.special_matches,
+        "special_ids": {gender: sorted(ids) for gender, ids in dataset.special_ids.items()},
+        "columns": columns_meta,
+    }
+    write_store(path, dataset.version, metadata, sections)
+
+
+def select_diverse_top_k(
+    heap: List[Tuple[float, float, int]],
+    indexed_entries: Sequence[IndexedEntry],
+    selected_ids: Sequence[int],
+    k: int = RECOMMENDATION_COUNT,
+) -> Tuple[List[int], set[str]]:
+    """Pop the best-scored entry ids off a heap under the diversity rules.
+
+    ``heap`` holds ``(-score, tie_break, entry_id)`` tuples and is heapified in
+    place, so only as many items as needed to fill ``k`` slots are ordered.
+    The first ``DISTINCT_INITIAL_SLOTS`` picks need distinct initials and the
+    remaining picks need unseen categories; Korean names never repeat.
+    """
+    heapq.heapify(heap)
+    picked = list(selected_ids)
     seen_initials: set[str] = set()
     seen_categories: set[str] = set()
     seen_korean_names: set[str] = set()
 
-    for score, _, entry in scored_candidates:
-        if len(selections) >= 5:
-            break
-        korean_name = entry.get("name", "")
+    while heap and len(picked) < k:
+        _, _, entry_id = heapq.heappop(heap)
+        entry = indexed_entries[entry_id].entry
+        korean_name = entry.name
         if korean_name in seen_korean_names:
             continue
-        initial = entry.get("initial", "")
-        category = entry.get("category", "")
-        if initial in seen_initials and len(selections) < 3:
+        initial = entry.initial
+        category = entry.category
+        if initial in seen_initials and len(picked) < DISTINCT_INITIAL_SLOTS:
             continue
-        if category in seen_categories and len(selections) >= 3:
+        if category in seen_categories and len(picked) >= DISTINCT_INITIAL_SLOTS:
             continue
-        selections.append(entry)
+        picked.append(entry_id)
         if korean_name:
             seen_korean_names.add(korean_name)
         if initial:
@@ -298,43 +2213,564 @@ def select_korean_names(original_name: str, gender: str) -> List[Dict[str, Any]]
         if category:
             seen_categories.add(category)
 
-    if len(selections) < 5:
-        leftovers = [entry for entry in gender_names if entry not in selections and entry.get("name", "") not in seen_korean_names]
-        random.shuffle(leftovers)
-        selections.extend(leftovers[: 5 - len(selections)])
-
-    return selections[:5]
-
-
-def get_daily_fortune(korean_name: str) -> List[Dict[str, str]]:
-    """Generate daily fortune based on Korean name."""
-    today = datetime.now().strftime("%Y-%m-%d")
-    seed_string = f"{korean_name}{today}"
-    rng = random.Random(hashlib.md5(seed_string.encode(), usedforsecurity=False).hexdigest())
-
-    fortunes: List[Dict[str, str]] = []
-    for category_data in FORTUNES_DATA:
-        category = category_data.get("category", "")
-        category_ko = category_data.get("category_ko", category)
-        messages = category_data.get("messages", [])
-        if messages:
-            message_obj = rng.choice(messages)
-            if isinstance(message_obj, dict):
-                message_en = message_obj.get("en", "")
-                message_ko = message_obj.get("ko", "")
+    return picked, seen_korean_names
+
+
+def sample_leftover_ids(
+    indexed_entries: Sequence[IndexedEntry],
+    picked_ids: Sequence[int],
+    seen_korean_names: set[str],
+    count: int,
+    rng: Any = random,
+    pool_ids: Optional[Sequence[int]] = None,
+) -> List[int]:
+    """Sample ``count`` unpicked entry ids with unseen names, without shuffling the pool.
+
+    ``pool_ids`` restricts sampling to a subset of the pool, such as one category.
+    """
+    if pool_ids is None:
+        pool_ids = range(len(indexed_entries))
+    if not pool_ids:
+        return []
+    excluded = set(picked_ids)
+    chosen: List[int] = []
+
+    def eligible(entry_id: int) -> bool:
+        return entry_id not in excluded and indexed_entries[entry_id].entry.name not in seen_korean_names
+
+    # Rejection sampling is enough almost always; scan only when the pool is mostly excluded
+    for _ in range(count * LEFTOVER_SAMPLE_ATTEMPTS):
+        if len(chosen) >= count:
+            break
+        entry_id = pool_ids[rng.randrange(len(pool_ids))]
+        if eligible(entry_id):
+            chosen.append(entry_id)
+            excluded.add(entry_id)
+
+    if len(chosen) < count:
+        remaining = [entry_id for entry_id in pool_ids if eligible(entry_id)]
+        chosen.extend(rng.sample(remaining, min(count - len(chosen), len(remaining))))
+    return chosen
+
+
+CandidateTier = Tuple[Sequence[int], Optional[float]]
+
+
+def iter_candidate_tiers(
+    tokens: Sequence[str],
+    weights: Sequence[float],
+    gender: str,
+    phonetic_hits: Dict[int, float],
+    allowed_ids: Optional[Sequence[int]],
+    dataset: Dataset,
+) -> Generator[CandidateTier, Optional[float], None]:
+    """Yield batches of entry ids to score, most likely matches first.
+
+    Large pools start with the phonetic buckets and the trigram shortlist,
+    then go through the rest in decreasing order of ``ScoreBounds``, in
+    batches that double in size. Each batch comes with an upper bound on
+    the score of every entry not yet yielded, or None when NumPy is missing
+    and no bound is known. The consumer sends back the score of its weakest
+    pick; entries bounded below it are left out of later batches.
+    """
+    indexed_entries = dataset.name_index[gender]
+    pool_ids: Sequence[int] = allowed_ids if allowed_ids is not None else range(len(indexed_entries))
+    trigram_index = dataset.trigram_indexes.get(gender)
+    # The n-gram scorer covers a whole pool in one product, so batching would only repeat it
+    if (
+        trigram_index is None
+        or not tokens[0]
+        or len(pool_ids) <= SHORTLIST_SIZE
+        or gender in dataset.ngram_scorers
+    ):
+        yield pool_ids, float("-inf")
+        return
+
+    allowed = set(allowed_ids) if allowed_ids is not None else None
+    shortlist = [entry_id for token in tokens for entry_id in trigram_index.shortlist(token, SHORTLIST_SIZE)]
+    tiers = [list(phonetic_hits)[:SHORTLIST_SIZE], [*phonetic_hits, *shortlist]]
+    score_bounds = dataset_score_bounds(dataset, gender)
+    if score_bounds is None:
+        yielded: set[int] = set()
+        for tier in tiers:
+            batch = [
+                entry_id for entry_id in dict.fromkeys(tier)
+                if entry_id not in yielded and (allowed is None or entry_id in allowed)
+            ]
+            yielded.update(batch)
+            if batch:
+                yield batch, None
+        yield [entry_id for entry_id in pool_ids if entry_id not in yielded], float("-inf")
+        return
+
+    total_weight = sum(weights) or 1.0
+    remaining = sum(
+        weight * score_bounds.bounds(token, SCORING_BACKEND) for token, weight in zip(tokens, weights)
+    ) / total_weight
+    if phonetic_hits:
+        remaining[np.fromiter(phonetic_hits, dtype=np.int64)] += np.fromiter(phonetic_hits.values(), dtype=np.float64)
+    remaining[list(dataset.special_ids.get(gender, ()))] = -np.inf
+    if allowed_ids is not None:
+        remaining[np.setdiff1d(np.arange(len(remaining)), np.asarray(allowed_ids, dtype=np.int64))] = -np.inf
+
+    for tier in tiers:
+        batch = [entry_id for entry_id in dict.fromkeys(tier) if remaining[entry_id] > -np.inf]
+        remaining[batch] = -np.inf
+        if batch:
+            yield batch, float(remaining.max())
+
+    threshold: Optional[float] = None
+    batch_size = SHORTLIST_SIZE
+    while True:
+        # Bounds are positive, so without a threshold every entry not yet yielded qualifies
+        live = np.flatnonzero(remaining >= (threshold if threshold is not None else 0.0))
+        if not live.size:
+            return
+        if live.size > batch_size:
+            live = live[np.argpartition(remaining[live], live.size - batch_size)[live.size - batch_size:]]
+        live = live[np.argsort(-remaining[live], kind="stable")]
+        remaining[live] = -np.inf
+        batch_size *= 2
+        threshold = yield live.tolist(), float(remaining.max())
+
+
+def score_tiers(
+    tiers: Generator[CandidateTier, Optional[float], None],
+    tokens: Sequence[str],
+    weights: Sequence[float],
+    gender: str,
+    phonetic_hits: Dict[int, float],
+    dataset: Dataset,
+    pruned: Optional[Dict[int, float]] = None,
+) -> Generator[Tuple[Sequence[int], List[float], Optional[float]], Optional[float], None]:
+    """Score each batch of ``tiers``, passing the thresholds sent in back to the source.
+
+    ``pruned`` collects the entries the edit-distance cutoffs may have
+    scored too low, as ``score_gender_pool`` reports them.
+    """
+    total_weight = sum(weights) or 1.0
+    threshold: Optional[float] = None
+    while True:
+        try:
+            candidate_ids, bound = tiers.send(threshold)
+        except StopIteration:
+            return
+        if len(tokens) == 1:
+            scores = score_gender_pool(
+                tokens[0], gender, candidate_ids, phonetic_hits, dataset=dataset, pruned=pruned
+            )
+        else:
+            token_scores = [
+                score_gender_pool(token, gender, candidate_ids, prune=False, dataset=dataset) for token in tokens
+            ]
+            scores = [
+                round(sum(weight * score for weight, score in zip(weights, entry_scores)) / total_weight, 6)
+                for entry_scores in zip(*token_scores)
+            ]
+        threshold = yield candidate_ids, scores, bound
+
+
+def select_korean_names(
+    original_name: str,
+    gender: str,
+    rng: Any = random,
+    category: Optional[str] = None,
+    dataset: Optional[Dataset] = None,
+) -> List[NameEntry]:
+    """Select Korean names based on English input and similarity scoring.
+
+    Ties and leftover slots are broken with ``rng``, the global generator by
+    default; pass a seeded ``random.Random`` for reproducible output.
+    ``category`` restricts the picks to one name category.
+    """
+    dataset = dataset or current_dataset()
+    indexed_entries = dataset.name_index.get(gender, ())
+    if not indexed_entries:
+        return []
+
+    allowed_ids: Optional[List[int]] = None
+    if category is not None:
+        allowed_ids = dataset.columns.category_ids(gender, category)
+        if not allowed_ids:
+            return []
+
+    selected_ids: List[int] = []
+    special_ids = dataset.special_ids.get(gender, frozenset())
+
+    # Prefer exact special matches if provided in the dataset
+    special_id = dataset.special_matches.get(gender, {}).get(normalize_name(original_name))
+    if special_id is not None:
+        selected_ids.append(special_id)
+
+    # Each name token is looked up and scored on its own, then combined by weight
+    tokens = tokenize_name(original_name) or [""]
+    weights = name_token_weights(len(tokens))
+    total_weight = sum(weights) or 1.0
+    english_norm = " ".join(tokens)
+
+    phonetic_hits: Dict[int, float] = {}
+    phonetic_index = dataset.phonetic_indexes.get(gender)
+    if phonetic_index is not None:
+        for token, weight in zip(tokens, weights):
+            for entry_id, bonus in phonetic_index.lookup(token).items():
+                phonetic_hits[entry_id] = phonetic_hits.get(entry_id, 0.0) + bonus * weight / total_weight
+
+    # Batches stream from the candidate source through the scorer into the diversity rules
+    pruned: Dict[int, float] = {}
+    scored_tiers = score_tiers(
+        iter_candidate_tiers(tokens, weights, gender, phonetic_hits, allowed_ids, dataset),
+        tokens,
+        weights,
+        gender,
+        phonetic_hits,
+        dataset,
+        pruned,
+    )
+    total_scores: Dict[int, float] = {}
+    tie_breaks: Dict[int, float] = {}
+    picked_ids, seen_korean_names = list(selected_ids), set()
+    threshold: Optional[float] = None
+    while True:
+        try:
+            candidate_ids, scores, bound = scored_tiers.send(threshold)
+        except StopIteration:
+            break
+        for entry_id, score in zip(candidate_ids, scores):
+            if entry_id in selected_ids or entry_id in special_ids:
+                pruned.pop(entry_id, None)
+                continue
+            total_scores[entry_id] = score + phonetic_hits.get(entry_id, 0.0)
+            tie_breaks[entry_id] = rng.random()
+
+        while True:
+            heap = [(-total, tie_breaks[entry_id], entry_id) for entry_id, total in total_scores.items()]
+            if dataset.columns.vectorized and len(heap) >= COLUMNAR_SELECT_MIN_CANDIDATES:
+                picked_ids, seen_korean_names = dataset.columns.select_diverse(
+                    gender, list(total_scores), list(total_scores.values()), list(tie_breaks.values()), selected_ids
+                )
             else:
-                message_en = str(message_obj)
-                message_ko = ""
-            fortunes.append({
-                "category": category,
-                "category_ko": category_ko,
-                "message": message_en,
-                "message_ko": message_ko
-            })
+                picked_ids, seen_korean_names = select_diverse_top_k(heap, indexed_entries, selected_ids)
+            weakest = (
+                min(total_scores[entry_id] for entry_id in picked_ids[len(selected_ids):])
+                if len(picked_ids) >= RECOMMENDATION_COUNT else float("-inf")
+            )
+            # The cutoffs follow the raw top scores, but the diversity rules can pick lower; entries cut
+            # short that might still reach the weakest pick are scored in full before the picks stand
+            suspects = [
+                entry_id for entry_id, cutoff in pruned.items() if cutoff + phonetic_hits.get(entry_id, 0.0) >= weakest
+            ]
+            if not suspects:
+                break
+            for entry_id in suspects:
+                del pruned[entry_id]
+                score = dataset.edit_scorers[gender].score_entry(tokens[0], entry_id)
+                total_scores[entry_id] = score + phonetic_hits.get(entry_id, 0.0)
+
+        if len(picked_ids) < RECOMMENDATION_COUNT:
+            logger.debug("Only %d diverse picks from %d candidates for %s", len(picked_ids), len(heap), english_norm)
+            continue
+        # Done once no entry left can reach the weakest pick; without a bound, the first full set stands
+        threshold = weakest
+        if bound is None or threshold > bound:
+            break
 
+    if len(picked_ids) < RECOMMENDATION_COUNT:
+        picked_ids.extend(
+            sample_leftover_ids(
+                indexed_entries, picked_ids, seen_korean_names, RECOMMENDATION_COUNT - len(picked_ids), rng, allowed_ids
+            )
+        )
+    picked_ids = picked_ids[:RECOMMENDATION_COUNT]
+
+    composed = compose_candidates(tokens, weights, gender, category, dataset) if GENERATED_NAME_SLOTS > 0 else []
+    if composed:
+        picks = [
+            (total_scores.get(entry_id, phonetic_hits.get(entry_id, 0.0)), indexed_entries[entry_id])
+            for entry_id in picked_ids
+        ]
+        return merge_composed_names(picks, composed, len(selected_ids), rng)
+
+    return [indexed_entries[entry_id].entry for entry_id in picked_ids]
+
+
+def score_unindexed_entries(
+    english_norm: str, gender: str, indexed_entries: Sequence[IndexedEntry], dataset: Dataset
+) -> List[float]:
+    """Score entries outside a pool, such as composed names, as the pool's backend would."""
+    if not english_norm or not indexed_entries:
+        return [0.0] * len(indexed_entries)
+    if gender in dataset.ngram_scorers:
+        return NgramScorer(indexed_entries).score(english_norm).tolist()
+    if gender in dataset.edit_scorers:
+        scorer = EditDistanceScorer(indexed_entries, SCORING_BACKEND)
+        return [scorer.score_entry(english_norm, entry_id) for entry_id in range(len(indexed_entries))]
+    matcher = SequenceMatcher(None, english_norm, "")
+    return [score_indexed_entry(english_norm, matcher, indexed) for indexed in indexed_entries]
+
+
+def compose_candidates(
+    tokens: Sequence[str], weights: Sequence[float], gender: str, category: Optional[str], dataset: Dataset
+) -> List[Tuple[float, IndexedEntry]]:
+    """Compose names for the first name token and score them the way pool entries are scored."""
+    composer = dataset_composer(dataset, gender)
+    if composer is None or not tokens[0]:
+        return []
+    indexed_entries = [
+        build_entry_features(entry) for entry in composer.compose(tokens[0], GENERATED_NAME_SLOTS, category)
+    ]
+    total_weight = sum(weights) or 1.0
+    token_scores = [score_unindexed_entries(token, gender, indexed_entries, dataset) for token in tokens]
+    return [
+        (
+            round(sum(weight * scores[index] for weight, scores in zip(weights, token_scores)) / total_weight, 6)
+            + sum(weight * PhoneticIndex.entry_bonus(token, indexed) for token, weight in zip(tokens, weights))
+            / total_weight,
+            indexed,
+        )
+        for index, indexed in enumerate(indexed_entries)
+    ]
+
+
+def merge_composed_names(
+    picks: List[Tuple[float, IndexedEntry]], composed: List[Tuple[float, IndexedEntry]], fixed: int, rng: Any = random
+) -> List[NameEntry]:
+    """Rank pool picks and composed names together under the diversity rules.
+
+    Both lists hold ``(score, indexed_entry)``; the first ``fixed`` picks,
+    such as a special match, keep their place. Picks the rules turn away
+    fill any slots left, as the leftover sampling would.
+    """
+    candidates = picks + composed
+    heap = [(-score, rng.random(), index) for index, (score, _) in enumerate(candidates) if index >= fixed]
+    chosen, _ = select_diverse_top_k(heap, [indexed for _, indexed in candidates], list(range(fixed)))
+    chosen.extend(index for index in range(len(picks)) if index not in chosen)
+    return [candidates[index][1].entry for index in chosen[:RECOMMENDATION_COUNT]]
+
+
+class RecommendationCache:
+    """Thread-safe LRU cache with per-item TTL and hit/miss counters."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[Tuple[str, ...], Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, ...]) -> Any:
+        """Return a cached value, or None if missing or expired."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Tuple[str, ...], value: Any) -> None:
+        """Store a value, evicting the least recently used item when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached item, keeping the counters."""
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+RECOMMENDATION_CACHE = RecommendationCache(RECOMMENDATION_CACHE_SIZE, RECOMMENDATION_CACHE_TTL)
+
+
+def recommendation_rng(*key_parts: str) -> random.Random:
+    """Derive a reproducible tie-break generator from a recommendation cache key."""
+    seed = hashlib.sha256("|".join(key_parts).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(seed[:8], "big"))
+
+
+def recommend_names(
+    original_name: str, gender: str, category: Optional[str] = None, dataset: Optional[Dataset] = None
+) -> List[NameEntry]:
+    """Return recommendations, deterministic and cached when configured."""
+    dataset = dataset or current_dataset()
+    if not DETERMINISTIC_RECOMMENDATIONS:
+        return select_korean_names(original_name, gender, category=category, dataset=dataset)
+
+    normalized_input = normalize_name(original_name)
+    key = (normalized_input, gender, dataset.version) + ((category,) if category else ())
+    cached = RECOMMENDATION_CACHE.get(key)
+    if cached is not None:
+        return list(cached)
+
+    names = select_korean_names(original_name, gender, recommendation_rng(*key), category, dataset)
+    RECOMMENDATION_CACHE.set(key, names)
+    return list(names)
+
+
+FORTUNE_CACHE = RecommendationCache(FORTUNE_CACHE_SIZE, 24 * 60 * 60)
+_fortune_thread: Optional[threading.Thread] = None
+_fortune_thread_lock = threading.Lock()
+
+
+class FortuneTables:
+    """Each day's fortune tables, kept beside the immutable datasets.
+
+    Tables are published for one dataset version at a time as a whole dict
+    that is never modified afterwards, so readers take no lock. Days
+    without a precomputed table, such as those of a range, get a table
+    without rows, kept per version and day so its hashers are prepared once.
+    """
+
+    def __init__(self, fallback_size: int) -> None:
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict[str, FortuneTable]] = {}
+        self._fallbacks = RecommendationCache(fallback_size, 24 * 60 * 60)
+
+    def days(self, version: str) -> Dict[str, FortuneTable]:
+        """Return a dataset version's precomputed tables by day."""
+        return self._tables.get(version, {})
+
+    def table(self, dataset: Dataset, day: str) -> FortuneTable:
+        """Return a dataset's table for ``day``, precomputed or without rows."""
+        table = self.days(dataset.version).get(day)
+        if table is not None:
+            return table
+        key = (dataset.version, day)
+        table = self._fallbacks.get(key)
+        if table is None:
+            table = FortuneTable(day, dataset.fortunes)
+            self._fallbacks.set(key, table)
+        return table
+
+    def prepare(self, dataset: Dataset, now: Optional[datetime] = None, base: Optional[Dataset] = None) -> None:
+        """Build a table for every date that is today in some timezone and publish them for ``dataset``.
+
+        ``now`` is a naive UTC time, the current one by default. Tables of
+        ``base`` are extended with the new names instead of rebuilt when its
+        fortunes are the same, since a fortune depends only on the name, the
+        day and the messages. Tables of other versions are dropped.
+        """
+        days = active_fortune_days(now)
+        with self._lock:
+            current = self.days(dataset.version)
+            reusable = self.days(base.version) if base is not None and base.fortunes == dataset.fortunes else {}
+            tables: Dict[str, FortuneTable] = {}
+            for day in days:
+                table = current.get(day)
+                if table is None and day in reusable:
+                    table = reusable[day].with_names(dataset.columns.names)
+                if table is None:
+                    started = time.perf_counter()
+                    table = FortuneTable(day, dataset.fortunes, dataset.columns.names)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    logger.info(
+                        "Built %s fortune table of %d names in %.1f ms", day, len(dataset.columns.names), elapsed_ms
+                    )
+                tables[day] = table
+            self._tables = {dataset.version: tables}
+
+    def clear(self) -> None:
+        """Drop the tables kept for days without a precomputed one."""
+        self._fallbacks.clear()
+
+
+FORTUNE_TABLES = FortuneTables(FORTUNE_FALLBACK_TABLES)
+
+
+def get_daily_fortune(
+    korean_name: str, dataset: Optional[Dataset] = None, day: Optional[str] = None, zone: Optional[tzinfo] = None
+) -> List[Dict[str, str]]:
+    """Return a Korean name's fortune for ``day``, today in ``zone`` by default.
+
+    Catalog names are read from the day's precomputed table. Other names,
+    such as composed ones, are drawn once a day into ``FORTUNE_CACHE``, as
+    are all names while a table is still being built.
+    """
+    dataset = dataset or current_dataset()
+    day = day or fortune_day(zone=zone)
+    table = FORTUNE_TABLES.table(dataset, day)
+    row = table.rows.get(korean_name)
+    if row is None:
+        key = (dataset.version, day, korean_name)
+        row = FORTUNE_CACHE.get(key)
+        if row is None:
+            row = table.row(korean_name)
+            FORTUNE_CACHE.set(key, row)
+    return table.render(row)
+
+
+def get_fortune_range(
+    korean_names: Sequence[str], start: date, days: int, dataset: Optional[Dataset] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Return each name's fortunes for ``days`` consecutive days from ``start``.
+
+    Days with a precomputed table read it; any other day gets one table
+    for all the names, so its hashers are prepared once rather than per
+    name and day.
+    """
+    dataset = dataset or current_dataset()
+    fortunes: Dict[str, List[Dict[str, Any]]] = {name: [] for name in korean_names}
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        table = FORTUNE_TABLES.table(dataset, day)
+        for name, name_fortunes in fortunes.items():
+            row = table.rows.get(name)
+            if row is None:
+                row = table.row(name)
+            name_fortunes.append({"date": day, "fortune": table.render(row)})
     return fortunes
 
 
+def roll_fortune_tables() -> None:
+    """Keep the live dataset's fortune tables ready, building each date's before it starts anywhere."""
+    while True:
+        try:
+            # Reloads prepare the tables of the dataset they swap in; holding their lock keeps
+            # this thread from publishing tables of a dataset that was just replaced
+            with _reload_lock:
+                FORTUNE_TABLES.prepare(DATASET)
+        except Exception:
+            logger.exception("Building the fortune tables failed")
+        now = utc_now()
+        wake = next_fortune_rollover(now)
+        time.sleep(min(max((wake - now).total_seconds(), 1.0), FORTUNE_ROLLOVER_CHECK_INTERVAL))
+
+
+def start_fortune_rollover() -> None:
+    """Start the fortune table thread in this process unless it is running."""
+    global _fortune_thread
+    with _fortune_thread_lock:
+        if _fortune_thread is not None and _fortune_thread.is_alive():
+            return
+        _fortune_thread = threading.Thread(target=roll_fortune_tables, name="fortune-rollover", daemon=True)
+        _fortune_thread.start()
+
+
+def validate_category(
+    raw_category: Any, gender: str, dataset: Optional[Dataset] = None
+) -> Tuple[bool, Optional[str]]:
+    """Validate an optional category filter against the categories of one gender's names."""
+    if raw_category is None or raw_category == "":
+        return True, None
+    if isinstance(raw_category, str) and (dataset or current_dataset()).columns.has_category(gender, raw_category):
+        return True, raw_category
+    logger.warning("Invalid category value received: %s", raw_category)
+    return False, None
+
+
 def validate_gender(raw_gender: Optional[str]) -> str:
     """Validate gender input and fall back to 'male' if invalid."""
     if raw_gender not in ALLOWED_GENDERS:
@@ -343,6 +2779,207 @@ def validate_gender(raw_gender: Optional[str]) -> str:
     return raw_gender
 
 
+def batch_item_error(index: int, message: str, code: str) -> Dict[str, Any]:
+    """Build the inline error result for one batch item."""
+    return {"index": index, "success": False, "error": {"message": message, "code": code}}
+
+
+def recommend_batch_item(index: int, item: Any, dataset: Optional[Dataset] = None) -> Dict[str, Any]:
+    """Recommend names for one batch item, reporting validation errors inline."""
+    if not isinstance(item, dict):
+        return batch_item_error(index, "Item must be an object", "INVALID_ITEM")
+
+    raw_name = item.get("name")
+    original_name = raw_name.strip() if isinstance(raw_name, str) else ""
+    if not original_name:
+        return batch_item_error(index, "Name is required", "NAME_REQUIRED")
+    if len(original_name) > MAX_NAME_LENGTH:
+        return batch_item_error(index, "Name is too long", "NAME_TOO_LONG")
+
+    gender = validate_gender(item.get("gender"))
+    dataset = dataset or current_dataset()
+    valid_category, category = validate_category(item.get("category"), gender, dataset)
+    if not valid_category:
+        return batch_item_error(index, "Unknown category", "INVALID_CATEGORY")
+
+    korean_names = recommend_names(original_name, gender, category, dataset)
+    if not korean_names:
+        logger.error("No Korean names generated for %s (%s)", original_name, gender)
+        return batch_item_error(index, "Could not generate names", "NAME_GENERATION_FAILED")
+
+    names = [entry.to_dict() for entry in korean_names]
+    return {"index": index, "success": True, "name": original_name, "gender": gender, "names": names}
+
+
+def recommend_batch_chunk(start: int, items: List[Any], dataset_version: str) -> Optional[List[Dict[str, Any]]]:
+    """Recommend names for a contiguous chunk of batch items (runs in pool workers).
+
+    Returns None when the worker loaded another dataset version than the
+    caller serves, such as files changed on disk but not reloaded yet.
+    """
+    dataset = current_dataset()
+    if dataset.version != dataset_version:
+        return None
+    return [recommend_batch_item(start + offset, item, dataset) for offset, item in enumerate(items)]
+
+
+_batch_executor: Optional[ProcessPoolExecutor] = None
+_batch_executor_lock = threading.Lock()
+
+
+def get_batch_executor() -> ProcessPoolExecutor:
+    """Return the shared batch process pool, starting it on first use.
+
+    Workers are spawned rather than forked: the server process runs request
+    and background threads, and a fork could copy a lock one of them holds.
+    Each worker imports this module and loads the data files itself.
+    """
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            _batch_executor = ProcessPoolExecutor(
+                max_workers=BATCH_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("Started batch recommendation pool with %d workers", BATCH_WORKERS)
+        return _batch_executor
+
+
+def iter_batch_results(items: List[Any], dataset: Optional[Dataset] = None) -> Iterator[Dict[str, Any]]:
+    """Yield batch results in input order, fanning large batches out to the pool.
+
+    Pool workers load the data files when they start, and a reload replaces
+    the pool along with the dataset. Chunks a worker answers from another
+    dataset version are recommended here instead.
+    """
+    dataset = dataset or current_dataset()
+    if BATCH_WORKERS <= 1 or len(items) < BATCH_PARALLEL_THRESHOLD:
+        for index, item in enumerate(items):
+            yield recommend_batch_item(index, item, dataset)
+        return
+
+    starts = list(range(0, len(items), BATCH_CHUNK_SIZE))
+    chunks = [items[start:start + BATCH_CHUNK_SIZE] for start in starts]
+    versions = [dataset.version] * len(chunks)
+    for start, chunk, chunk_results in zip(
+        starts, chunks, get_batch_executor().map(recommend_batch_chunk, starts, chunks, versions)
+    ):
+        if chunk_results is None:
+            chunk_results = [recommend_batch_item(start + offset, item, dataset) for offset, item in enumerate(chunk)]
+        yield from chunk_results
+
+
+def reset_batch_executor() -> None:
+    """Retire the batch pool so the next batch starts workers on the live dataset.
+
+    Work already submitted to the old pool still completes.
+    """
+    global _batch_executor
+    with _batch_executor_lock:
+        executor, _batch_executor = _batch_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+_reload_lock = threading.Lock()
+_reload_thread: Optional[threading.Thread] = None
+_reload_thread_lock = threading.Lock()
+
+
+def reload_dataset(force: bool = False) -> bool:
+    """Build a dataset from the files on disk and swap it in if they changed.
+
+    The new dataset is complete before the swap, so requests keep using the
+    previous one until then, and a failed build leaves it in place. Returns
+    whether a new dataset went live.
+    """
+    global DATASET
+    with _reload_lock:
+        source_hash = compute_source_hash()
+        # Also reload when a snapshot appeared for a dataset that was loaded from JSON
+        unchanged = source_hash == DATASET.source_hash
+        if unchanged and not force and (DATASET.store is not None or not os.path.exists(NAME_STORE_PATH)):
+            logger.info("Dataset %s is up to date", DATASET.version)
+            return False
+        try:
+            dataset = load_dataset(source_hash, base=DATASET)
+        except Exception:
+            logger.exception("Dataset reload failed; keeping %s", DATASET.version)
+            return False
+        FORTUNE_TABLES.prepare(dataset, base=DATASET)
+        previous, DATASET = DATASET, dataset
+        RECOMMENDATION_CACHE.clear()
+        FORTUNE_CACHE.clear()
+        FORTUNE_TABLES.clear()
+        if COMPRESSION is not None:
+            COMPRESSION.cache.clear()
+        reset_batch_executor()
+        logger.info("Reloaded dataset %s -> %s", previous.version, dataset.version)
+        return True
+
+
+def request_reload(reason: str, force: bool = False) -> bool:
+    """Start a background reload unless one is already running."""
+    global _reload_thread
+    with _reload_thread_lock:
+        if _reload_thread is not None and _reload_thread.is_alive():
+            return False
+        logger.info("Dataset reload requested by %s", reason)
+        _reload_thread = threading.Thread(target=reload_dataset, args=(force,), name="dataset-reload", daemon=True)
+        _reload_thread.start()
+        return True
+
+
+def source_fingerprint() -> Tuple[Tuple[str, int, int], ...]:
+    """Return the modification time and size of every data file and the snapshot."""
+    filenames = [name for _, filename in NAME_FILES for name in name_shard_files(filename)]
+    paths = [*(os.path.join(DATA_DIR, name) for name in [*filenames, FORTUNES_FILE]), NAME_STORE_PATH]
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            fingerprint.append((path, -1, -1))
+    return tuple(fingerprint)
+
+
+def watch_sources(interval: float) -> None:
+    """Poll the data files and request a reload whenever they change."""
+    last_seen = source_fingerprint()
+    while True:
+        time.sleep(interval)
+        fingerprint = source_fingerprint()
+        # Keep the old fingerprint while a reload is running, so the change is retried
+        if fingerprint != last_seen and request_reload("file watcher"):
+            last_seen = fingerprint
+
+
+def start_reload_watcher(interval: float) -> threading.Thread:
+    """Start the data file watcher thread."""
+    watcher = threading.Thread(target=watch_sources, args=(interval,), name="dataset-watcher", daemon=True)
+    watcher.start()
+    logger.info("Watching data files every %.1fs", interval)
+    return watcher
+
+
+def install_reload_signal() -> bool:
+    """Reload the dataset in the background on SIGHUP; call from the main thread."""
+    if not hasattr(signal, "SIGHUP"):
+        return False
+
+    def handle_sighup(signum: int, frame: Any) -> None:
+        # Hand off to a thread: the handler may interrupt code holding the reload locks
+        threading.Thread(target=request_reload, args=("SIGHUP",), daemon=True).start()
+
+    signal.signal(signal.SIGHUP, handle_sighup)
+    return True
+
+
+# Batch pool workers import this module too; the server process alone watches the files
+if RELOAD_INTERVAL > 0 and multiprocessing.parent_process() is None:
+    start_reload_watcher(RELOAD_INTERVAL)
+
+
 def ensure_csrf_token() -> str:
     """Ensure a CSRF token exists in the session and return it."""
     token = session.get("csrf_token")
@@ -410,14 +3047,240 @@ def validate_theme_value(theme: Optional[str]) -> bool:
     return theme in THEME_CHOICES
 
 
+def asset_name(path: str, data: bytes) -> str:
+    """Return ``path`` with a hash of ``data`` before its extension."""
+    stem, suffix = posixpath.splitext(path)
+    return f"{stem}.{hashlib.blake2b(data, digest_size=ASSET_HASH_SIZE).hexdigest()}{suffix}"
+
+
+def rewrite_css_urls(css: str, css_path: str, assets: Mapping[str, Dict[str, Any]]) -> str:
+    """Point a stylesheet's ``url()`` references to built assets at their fingerprinted names."""
+    static_prefix = f"{app.static_url_path}/"
+    base = posixpath.dirname(css_path)
+
+    def replace(match: re.Match) -> str:
+        quote, url = match.groups()
+        if url.startswith(static_prefix):
+            asset = assets.get(url[len(static_prefix):])
+            target = static_prefix + asset["path"] if asset else None
+        elif url.startswith(("/", "data:", "#")) or "://" in url:
+            target = None
+        else:
+            asset = assets.get(posixpath.normpath(posixpath.join(base, url)))
+            target = posixpath.relpath(asset["path"], base or ".") if asset else None
+        return f"url({quote}{target}{quote})" if target else match.group(0)
+
+    return CSS_URL_PATTERN.sub(replace, css)
+
+
+def write_bytes(path: str, data: bytes) -> None:
+    """Write a file atomically, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp.{os.getpid()}"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def build_assets(output_dir: str = ASSET_DIR) -> Dict[str, Dict[str, Any]]:
+    """Copy the static files under content-hashed names, with gzip variants and a manifest.
+
+    Stylesheets go last so their ``url()`` references can be rewritten to
+    hashed names first and their own hash covers the rewrite. Files of
+    earlier builds are left in place for pages that still refer to them.
+    """
+    static_dir = app.static_folder or os.path.join(app.root_path, "static")
+    paths = sorted(
+        os.path.relpath(path, static_dir).replace(os.sep, "/")
+        for path in glob.glob(os.path.join(static_dir, "**", "*"), recursive=True)
+        if os.path.isfile(path)
+    )
+    assets: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(paths, key=lambda path: path.endswith(".css")):
+        with open(os.path.join(static_dir, path), "rb") as file:
+            data = file.read()
+        if path.endswith(".css"):
+            data = rewrite_css_urls(data.decode("utf-8"), path, assets).encode("utf-8")
+        hashed = asset_name(path, data)
+        write_bytes(os.path.join(output_dir, hashed), data)
+
+        gzipped = False
+        if posixpath.splitext(path)[1] in ASSET_COMPRESSIBLE_SUFFIXES:
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            gzipped = len(compressed) <= len(data) * (1 - ASSET_GZIP_MIN_SAVING)
+            if gzipped:
+                write_bytes(os.path.join(output_dir, f"{hashed}.gz"), compressed)
+        assets[path] = {"path": hashed, "gzip": gzipped}
+        logger.info(
+            "Built %s: %.1f KiB%s", hashed, len(data) / 1024,
+            f", gzip {len(compressed) / 1024:.1f} KiB" if gzipped else "",
+        )
+
+    manifest = json.dumps({"assets": assets}, ensure_ascii=False, indent=2, sort_keys=True)
+    write_bytes(os.path.join(output_dir, ASSET_MANIFEST_FILE), manifest.encode("utf-8"))
+    return assets
+
+
+def load_asset_manifest(asset_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Return the assets listed by ``build_assets`` in ``asset_dir``, or none without a build."""
+    path = os.path.join(asset_dir, ASSET_MANIFEST_FILE)
+    try:
+        with open(path, encoding="utf-8") as file:
+            return dict(json.load(file)["assets"])
+    except FileNotFoundError:
+        logger.info("No asset build at %s; serving static files under their own names", asset_dir)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Ignoring asset manifest %s: %s", path, exc)
+    return {}
+
+
+ASSET_MANIFEST = load_asset_manifest(ASSET_DIR)
+# Fingerprinted file name -> whether it has a gzip variant
+HASHED_ASSETS = {asset["path"]: asset["gzip"] for asset in ASSET_MANIFEST.values()}
+
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint: str, values: Dict[str, Any]) -> None:
+    """Point ``url_for('static', ...)`` at the fingerprinted name of a built asset."""
+    if endpoint == "static":
+        asset = ASSET_MANIFEST.get(values.get("filename"))
+        if asset is not None:
+            values["filename"] = asset["path"]
+
+
+def send_static_asset(filename: str) -> Response:
+    """Serve a built asset for good, gzipped when accepted; other static files as Flask would.
+
+    ``send_file`` hands the open file to the server's ``wsgi.file_wrapper``
+    (``sendfile`` under gunicorn) and answers ``Range`` requests, which font
+    loaders use; ``NAEILUM_X_SENDFILE`` hands the file to a fronting proxy.
+    """
+    gzipped = HASHED_ASSETS.get(filename)
+    if gzipped is None:
+        return app.send_static_file(filename)
+    encode = gzipped and request.accept_encodings["gzip"] > 0
+    response = send_from_directory(
+        ASSET_DIR,
+        f"{filename}.gz" if encode else filename,
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        max_age=365 * 24 * 60 * 60,
+    )
+    if encode:
+        response.headers["Content-Encoding"] = "gzip"
+    if gzipped:
+        response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = ASSET_CACHE_CONTROL
+    return response
+
+
+app.view_functions["static"] = send_static_asset
+
+
+class CachePolicy(NamedTuple):
+    """How successful responses of one endpoint may be cached.
+
+    ``etag_key`` returns what the response depends on besides the endpoint
+    and dataset version, or None when the request has no stable ETag.
+    Policies whose ``Cache-Control`` is public are left without a session,
+    so no ``Set-Cookie`` reaches a shared cache.
+    """
+
+    cache_control: str
+    etag_key: Optional[Callable[[], Optional[Sequence[Any]]]] = None
+    vary: Tuple[str, ...] = ()
+
+    @property
+    def shared(self) -> bool:
+        return "public" in self.cache_control
+
+
+NO_STORE_POLICY = CachePolicy("no-store")
+CACHE_POLICIES: Dict[str, CachePolicy] = {"static": CachePolicy(f"public, max-age={PUBLIC_MAX_AGE}")}
+
+
+def cache_policy(policy: CachePolicy) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Declare the cache policy of a view; endpoints without one are not stored."""
+    def register(view: Callable[..., Any]) -> Callable[..., Any]:
+        CACHE_POLICIES[view.__name__] = policy
+        return view
+    return register
+
+
+def request_cache_policy() -> CachePolicy:
+    """Return the cache policy of the current request's endpoint."""
+    return CACHE_POLICIES.get(request.endpoint or "", NO_STORE_POLICY)
+
+
+@lru_cache(maxsize=1)
+def pages_fingerprint() -> str:
+    """Return a digest of the templates and asset names, so page ETags change with a deploy."""
+    digest = hashlib.blake2b(digest_size=ETAG_DIGEST_SIZE)
+    for path in sorted(glob.glob(os.path.join(app.root_path, app.template_folder or "templates", "*.html"))):
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    digest.update(json.dumps(ASSET_MANIFEST, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def page_etag_key() -> Sequence[Any]:
+    """Pages depend on the theme and the deployed templates and assets."""
+    return resolve_theme()[0], pages_fingerprint()
+
+
+def fortune_range_etag_key() -> Optional[Sequence[Any]]:
+    """Fortune ranges depend on the names, the first date and the length."""
+    try:
+        zone = request_timezone()
+    except ValueError:
+        return None
+    start = request.args.get("from") or fortune_day(zone=zone)
+    return (start, request.args.get("days", ""), *request.args.getlist("name"))
+
+
+def response_etag(policy: CachePolicy) -> Optional[str]:
+    """Return the current request's ETag under ``policy``, if it has one."""
+    if policy.etag_key is None or request.method not in ("GET", "HEAD"):
+        return None
+    key = policy.etag_key()
+    if key is None:
+        return None
+    parts = (request.endpoint or "", current_dataset().version, *map(str, key))
+    return hashlib.blake2b(RECORD_SEPARATOR.join(parts).encode("utf-8"), digest_size=ETAG_DIGEST_SIZE).hexdigest()
+
+
+class CachePolicySessionInterface(SecureCookieSessionInterface):
+    """Signed cookie sessions that stay off responses meant for shared caches."""
+
+    def should_set_cookie(self, app: Flask, session: Any) -> bool:
+        if "cache_policy" in g and g.cache_policy.shared and not session.modified:
+            # Only the expiry refresh of an unchanged session would be sent
+            return False
+        return super().should_set_cookie(app, session)
+
+    def save_session(self, app: Flask, session: Any, response: Response) -> None:
+        if "cache_policy" in g and g.cache_policy.shared and session.modified:
+            response.headers["Cache-Control"] = "private, no-cache"
+        super().save_session(app, session, response)
+
+
+app.session_interface = CachePolicySessionInterface()
+
+
 @app.before_request
-def apply_before_request() -> None:
-    """Set up session defaults before each request."""
-    session.permanent = True
-    if "session_id" not in session:
-        session["session_id"] = generate_session_id()
-        logger.debug("Assigned new session_id %s", session["session_id"])
-    ensure_csrf_token()
+def apply_before_request() -> Optional[Response]:
+    """Set up session defaults, or answer a conditional request for a cacheable endpoint."""
+    policy = g.cache_policy = request_cache_policy()
+    if not policy.shared:
+        session.permanent = True
+        if "session_id" not in session:
+            session["session_id"] = generate_session_id()
+            logger.debug("Assigned new session_id %s", session["session_id"])
+        ensure_csrf_token()
+
+    etag = g.etag = response_etag(policy)
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        return Response(status=304)
+    return None
 
 
 @app.context_processor
@@ -427,29 +3290,54 @@ def inject_theme_context() -> Dict[str, Any]:
     return {"theme": theme, "is_dark": theme == "dark"}
 
 
+def apply_cache_policy(response: Response) -> None:
+    """Apply the endpoint's cache policy to a successful response; store nothing else."""
+    policy = g.get("cache_policy", NO_STORE_POLICY)
+    if response.status_code not in (200, 206, 304):
+        response.headers["Cache-Control"] = NO_STORE_POLICY.cache_control
+        return
+    response.headers.setdefault("Cache-Control", policy.cache_control)
+    for header in policy.vary:
+        response.vary.add(header)
+    etag = g.get("etag")
+    if etag is not None and "ETag" not in response.headers:
+        response.set_etag(etag)
+
+
 @app.after_request
 def apply_security_headers(response: Response) -> Response:
     """Append basic security headers to every response."""
     response.headers.setdefault("X-Content-Type-Options", "nosniff")
     response.headers.setdefault("X-Frame-Options", "SAMEORIGIN")
     response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
-    response.headers.setdefault("Cache-Control", "public, max-age=300")
+    apply_cache_policy(response)
+    if "dataset" in g:
+        response.headers.setdefault(DATASET_VERSION_HEADER, g.dataset.version)
     return response
 
 
+PAGE_POLICY = CachePolicy(f"public, max-age={PUBLIC_MAX_AGE}", page_etag_key, ("Cookie",))
+FORTUNE_RANGE_POLICY = CachePolicy(
+    f"public, max-age={PUBLIC_MAX_AGE}", fortune_range_etag_key, (TIMEZONE_HEADER_NAME,)
+)
+
+
 @app.route("/")
+@cache_policy(PAGE_POLICY)
 def index() -> Response:
     """Main page."""
     return render_template("index.html")
 
 
 @app.route("/privacy")
+@cache_policy(PAGE_POLICY)
 def privacy() -> Response:
     """Privacy policy page."""
     return render_template("privacy.html", page_class="legal")
 
 
 @app.route("/about")
+@cache_policy(PAGE_POLICY)
 def about() -> Response:
     """About page."""
     return render_template("about.html", page_class="legal")
@@ -458,7 +3346,36 @@ def about() -> Response:
 @app.route("/health")
 def health() -> Response:
     """Health check endpoint."""
-    return jsonify({"success": True, "status": "ok"})
+    dataset = current_dataset()
+    return jsonify({
+        "success": True,
+        "status": "ok",
+        "dataset_version": dataset.version,
+        "dataset_source": "snapshot" if dataset.store is not None else "json",
+        "recommendation_cache": RECOMMENDATION_CACHE.stats(),
+        "fortune_cache": FORTUNE_CACHE.stats(),
+        "fortune_days": sorted(FORTUNE_TABLES.days(dataset.version)),
+        "compression": COMPRESSION.stats() if COMPRESSION is not None else None,
+    })
+
+
+@app.route("/api/admin/reload", methods=["POST"])
+def admin_reload() -> Tuple[Response, int] | Response:
+    """Reload the name and fortune data; requires the admin token."""
+    if not ADMIN_TOKEN:
+        return error_response("Not found", status=404, code="NOT_FOUND")
+    provided = request.headers.get(ADMIN_TOKEN_HEADER, "")
+    if not secrets.compare_digest(provided.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        return error_response("Invalid admin token", status=403, code="ADMIN_TOKEN_INVALID")
+
+    data = request.get_json(silent=True) or {}
+    force = data.get("force") is True
+    if data.get("wait") is True:
+        reloaded = reload_dataset(force)
+        return jsonify({"success": True, "reloaded": reloaded, "dataset_version": DATASET.version})
+
+    started = request_reload("admin endpoint", force)
+    return jsonify({"success": True, "started": started, "dataset_version": DATASET.version}), 202
 
 
 @app.route("/api/csrf_token", methods=["GET"])
@@ -530,13 +3447,18 @@ def recommend() -> Tuple[Response, int] | Response:
     if not original_name:
         return error_response("Name is required", status=400, code="NAME_REQUIRED")
 
-    if len(original_name) > 100:
+    if len(original_name) > MAX_NAME_LENGTH:
         return error_response("Name is too long", status=400, code="NAME_TOO_LONG")
 
+    dataset = current_dataset()
+    valid_category, category = validate_category(data.get("category"), gender, dataset)
+    if not valid_category:
+        return error_response("Unknown category", status=400, code="INVALID_CATEGORY")
+
     session["original_name"] = original_name
     session["gender"] = gender
 
-    korean_names = select_korean_names(original_name, gender)
+    korean_names = [entry.to_dict() for entry in recommend_names(original_name, gender, category, dataset)]
 
     if not korean_names:
         logger.error("No Korean names generated for %s (%s)", original_name, gender)
@@ -547,6 +3469,34 @@ def recommend() -> Tuple[Response, int] | Response:
     return jsonify({"success": True, "names": korean_names})
 
 
+@app.route("/api/recommend/batch", methods=["POST"])
+def recommend_batch() -> Tuple[Response, int] | Response:
+    """Return recommendations for a list of {name, gender} items, in order."""
+    if not enforce_csrf(strict=False):
+        return error_response("Invalid CSRF token", status=403, code="CSRF_FAILED")
+
+    data = request.get_json(silent=True)
+    if not data:
+        return error_response("No data provided", status=400, code="NO_DATA")
+
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return error_response("Items must be a non-empty list", status=400, code="INVALID_ITEMS")
+
+    if len(items) > BATCH_MAX_ITEMS:
+        return error_response(
+            f"Batch is limited to {BATCH_MAX_ITEMS} items", status=413, code="BATCH_TOO_LARGE"
+        )
+
+    dataset = current_dataset()
+    stream = data.get("stream") is True or NDJSON_MIMETYPE in request.headers.get("Accept", "")
+    if stream:
+        lines = (json.dumps(result) + "\n" for result in iter_batch_results(items, dataset))
+        return Response(lines, mimetype=NDJSON_MIMETYPE)
+
+    return jsonify({"success": True, "results": list(iter_batch_results(items, dataset))})
+
+
 @app.route("/select", methods=["POST"])
 def select() -> Tuple[Response, int] | Response:
     """Handle name selection."""
@@ -570,12 +3520,99 @@ def select() -> Tuple[Response, int] | Response:
     selected_name = recommendations[selected_index]
     session["selected_name"] = selected_name
 
-    fortune = get_daily_fortune(selected_name["name"])
+    try:
+        zone = request_timezone(data)
+    except ValueError:
+        logger.debug("Ignoring invalid timezone on /select")
+        zone = None
+    fortune = get_daily_fortune(selected_name["name"], zone=zone)
     session["fortune"] = fortune
 
     return jsonify({"success": True, "name": selected_name, "fortune": fortune})
 
 
+def request_timezone(data: Optional[Dict[str, Any]] = None) -> Optional[tzinfo]:
+    """Return the client's IANA timezone, or None when it sent none.
+
+    The zone is read from the body's ``timezone`` field, then the
+    ``timezone`` query parameter, then the ``X-Timezone`` header. Unknown
+    names raise ValueError.
+    """
+    raw = (data or {}).get("timezone") or request.args.get("timezone") or request.headers.get(TIMEZONE_HEADER_NAME)
+    if raw is None:
+        return None
+    if not isinstance(raw, str):
+        raise ValueError("Timezone must be a string")
+    return resolve_timezone(raw.strip())
+
+
+def parse_fortune_range(max_names: int) -> Tuple[List[str], date, int, Optional[tzinfo]] | Tuple[Response, int]:
+    """Read the ``name``, ``from``, ``days`` and timezone parameters of a fortune range request."""
+    names = [name.strip() for name in request.args.getlist("name")]
+    if not names or not all(names):
+        return error_response("Name is required", status=400, code="NAME_REQUIRED")
+    if len(names) > max_names:
+        return error_response(f"Too many names; the limit is {max_names}", status=400, code="TOO_MANY_NAMES")
+    if any(len(name) > MAX_NAME_LENGTH for name in names):
+        return error_response("Name is too long", status=400, code="NAME_TOO_LONG")
+
+    try:
+        zone = request_timezone()
+    except ValueError:
+        return error_response("Unknown timezone", status=400, code="INVALID_TIMEZONE")
+
+    raw_start = request.args.get("from")
+    try:
+        start = date.fromisoformat(raw_start) if raw_start else datetime.now(zone or default_timezone()).date()
+        days = int(request.args.get("days", FORTUNE_RANGE_DEFAULT_DAYS))
+    except ValueError:
+        return error_response("Invalid date range", status=400, code="INVALID_RANGE")
+    if not 1 <= days <= FORTUNE_RANGE_MAX_DAYS:
+        return error_response(
+            f"Ranges are limited to {FORTUNE_RANGE_MAX_DAYS} days", status=400, code="INVALID_RANGE"
+        )
+    if (date.max - start).days < days - 1:
+        return error_response("Invalid date range", status=400, code="INVALID_RANGE")
+    return list(dict.fromkeys(names)), start, days, zone
+
+
+def fortune_range_response(payload: Dict[str, Any], start: date, days: int, zone: Optional[tzinfo]) -> Response:
+    """Serialize a fortune range, cacheable for good once its last day is past."""
+    response = jsonify(payload)
+    if start + timedelta(days=days - 1) < datetime.now(zone or default_timezone()).date():
+        response.headers["Cache-Control"] = PAST_FORTUNE_CACHE_CONTROL
+    return response
+
+
+@app.route("/api/fortune/range", methods=["GET"])
+@cache_policy(FORTUNE_RANGE_POLICY)
+def fortune_range() -> Tuple[Response, int] | Response:
+    """Return one name's daily fortunes for up to ``FORTUNE_RANGE_MAX_DAYS`` days."""
+    parsed = parse_fortune_range(max_names=1)
+    if isinstance(parsed[0], Response):
+        return parsed
+    names, start, days, zone = parsed
+    fortunes = get_fortune_range(names, start, days)
+    return fortune_range_response(
+        {"success": True, "name": names[0], "from": start.isoformat(), "days": fortunes[names[0]]}, start, days, zone
+    )
+
+
+@app.route("/api/fortune/range/batch", methods=["GET"])
+@cache_policy(FORTUNE_RANGE_POLICY)
+def fortune_range_batch() -> Tuple[Response, int] | Response:
+    """Return daily fortunes over one range for several names, given as repeated ``name`` parameters."""
+    parsed = parse_fortune_range(max_names=FORTUNE_RANGE_MAX_NAMES)
+    if isinstance(parsed[0], Response):
+        return parsed
+    names, start, days, zone = parsed
+    fortunes = get_fortune_range(names, start, days)
+    results = [{"name": name, "days": name_fortunes} for name, name_fortunes in fortunes.items()]
+    return fortune_range_response(
+        {"success": True, "from": start.isoformat(), "results": results}, start, days, zone
+    )
+
+
 @app.route("/save_preference", methods=["POST"])
 def save_preference() -> Tuple[Response, int] | Response:
     """Save user preference (stored in session only)."""
@@ -600,5 +3637,47 @@ def save_preference() -> Tuple[Response, int] | Response:
     return jsonify({"success": True})
 
 
-if __name__ == "__main__":
+def build_snapshot(path: str) -> None:
+    """Compile the current data into a snapshot keyed by its source hash.
+
+    If this process mapped an up-to-date snapshot, rewriting it from the mapped
+    data yields the same content, since the hash also covers the builder code.
+    """
+    dataset = current_dataset()
+    if dataset.source_hash != compute_source_hash():
+        dataset = load_dataset()
+    write_name_store(path, dataset)
+    counts = ", ".join(f"{len(entries)} {gender}" for gender, entries in dataset.names.items())
+    logger.info(
+        "Wrote snapshot %s: %s names, %d fortune categories, dataset %s, %.1f KiB",
+        path, counts, len(dataset.fortunes), dataset.version, os.path.getsize(path) / 1024,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the development server, or compile the data snapshot or static assets."""
+    parser = argparse.ArgumentParser(prog="naeilum", description="Naeilum Korean name recommendation app")
+    commands = parser.add_subparsers(dest="command")
+    build = commands.add_parser(
+        "build", aliases=["build-store"], help="validate the JSON data and write the memory-mapped snapshot"
+    )
+    build.add_argument("--output", default=NAME_STORE_PATH, help="snapshot file path")
+    build_static = commands.add_parser(
+        "build-assets", help="write content-hashed, precompressed copies of the static files"
+    )
+    build_static.add_argument("--output", default=ASSET_DIR, help="asset directory")
+    args = parser.parse_args(argv)
+
+    if args.command in {"build", "build-store"}:
+        build_snapshot(args.output)
+        return
+    if args.command == "build-assets":
+        build_assets(args.output)
+        return
+    install_reload_signal()
+    start_fortune_rollover()
     app.run(debug=False, host="0.0.0.0", port=5000)
+
+
+if __name__ == "__main__":
+    main()
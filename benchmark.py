@@ -0,0 +1,562 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Naeilum matching benchmarks.
+
+Times the per-request recommendation path against the shipped name files and
+against a synthetic catalog. Run with ``python benchmark.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import app
+import romanization
+import similarity
+from tests.helpers import (
+    SAMPLE_INPUTS,
+    edit_records,
+    legacy_daily_fortune,
+    legacy_pick_diverse,
+    make_selector_pool,
+    make_synthetic_catalog,
+    make_synthetic_records,
+    pool_columns,
+    top_k_ids,
+)
+
+def bench_romanization(size: int) -> None:
+    """Time romanizing a catalog name by name against the bulk path."""
+    names = [record["name"] for record in make_synthetic_records(size)]
+    start = time.perf_counter()
+    for name in names:
+        romanization.romanize(name)
+    single_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    romanization.romanize_many(names)
+    bulk_ms = (time.perf_counter() - start) * 1000
+    print(f"[romanize] {size} names: one by one {single_ms:8.1f} ms | bulk {bulk_ms:8.1f} ms")
+
+
+def time_per_call(func: Callable[[], Any], repeat: int) -> float:
+    """Return the mean wall time of ``func`` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_candidate_index(label: str, entries: Sequence[app.NameEntry], repeat: int) -> None:
+    """Compare per-entry derivation against the precompiled candidate index."""
+    build_start = time.perf_counter()
+    indexed = app.build_name_index({"bench": entries})["bench"]
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    def legacy() -> None:
+        for name in SAMPLE_INPUTS:
+            for entry in entries:
+                app.compute_similarity_score(name, entry)
+
+    def precompiled() -> None:
+        for name in SAMPLE_INPUTS:
+            english_norm = app.normalize_romanization(name)
+            matcher = SequenceMatcher(None, english_norm, "")
+            for item in indexed:
+                app.score_indexed_entry(english_norm, matcher, item)
+
+    legacy_ms = time_per_call(legacy, repeat) / len(SAMPLE_INPUTS)
+    indexed_ms = time_per_call(precompiled, repeat) / len(SAMPLE_INPUTS)
+    print(
+        f"[candidate-index] {label:>16}: build {build_ms:9.1f} ms | "
+        f"legacy {legacy_ms:9.3f} ms/req | indexed {indexed_ms:9.3f} ms/req | "
+        f"speedup {legacy_ms / indexed_ms:5.2f}x"
+    )
+
+
+def bench_ngram_backend(label: str, entries: Sequence[app.NameEntry], repeat: int) -> None:
+    """Time the n-gram backend and report top-5 parity with difflib."""
+    if app.np is None:
+        print("[ngram] skipped: NumPy is not installed")
+        return
+
+    indexed = app.build_name_index({"bench": entries})["bench"]
+    build_start = time.perf_counter()
+    scorer = app.NgramScorer(indexed)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    def reference(english_norm: str) -> List[float]:
+        matcher = SequenceMatcher(None, english_norm, "")
+        return [app.score_indexed_entry(english_norm, matcher, item) for item in indexed]
+
+    inputs = [app.normalize_romanization(name) for name in SAMPLE_INPUTS]
+    difflib_ms = time_per_call(lambda: [reference(name) for name in inputs], repeat) / len(inputs)
+    ngram_ms = time_per_call(lambda: [scorer.score(name) for name in inputs], repeat) / len(inputs)
+
+    exact = 0
+    overlap = 0
+    for name in inputs:
+        expected = top_k_ids(reference(name))
+        actual = top_k_ids(scorer.score(name).tolist())
+        exact += expected == actual
+        overlap += len(set(expected) & set(actual))
+    print(
+        f"[ngram] {label:>16}: build {build_ms:9.1f} ms | difflib {difflib_ms:9.3f} ms/req | "
+        f"ngram {ngram_ms:9.3f} ms/req | top-5 identical {exact}/{len(inputs)} | "
+        f"mean top-5 overlap {overlap / len(inputs):.2f}/5"
+    )
+
+
+def bench_edit_metrics(label: str, entries: Sequence[app.NameEntry], repeat: int) -> None:
+    """Compare difflib ratios against the bit-parallel metrics, per pair and per pool."""
+    indexed = app.build_name_index({"bench": entries})["bench"]
+    inputs = [app.normalize_romanization(name) for name in SAMPLE_INPUTS]
+    texts = [candidate.text for item in indexed for candidate in item.candidates]
+    pairs = len(inputs) * len(texts)
+
+    def difflib_pairs() -> None:
+        for name in inputs:
+            matcher = SequenceMatcher(None, name, "")
+            for text in texts:
+                matcher.set_seq2(text)
+                matcher.ratio()
+
+    difflib_us = time_per_call(difflib_pairs, repeat) * 1000 / pairs
+    line = f"[edit] {label:>16}: difflib {difflib_us:6.2f} us/pair"
+    for metric, func in similarity.METRICS.items():
+        patterns = [similarity.compile_pattern(text) for text in texts]
+        pair_us = time_per_call(lambda: [func(pattern, name) for name in inputs for pattern in patterns], repeat)
+        scorer = app.EditDistanceScorer(indexed, metric)
+        pool_ms = time_per_call(lambda: [scorer.score(name, range(len(indexed))) for name in inputs], repeat)
+        line += (
+            f" | {metric} {pair_us * 1000 / pairs:6.2f} us/pair, "
+            f"{pool_ms / len(inputs):8.3f} ms/req with cutoff"
+        )
+    print(line)
+
+
+def install_catalog(gender: str, entries: Sequence[app.NameEntry]) -> None:
+    """Swap in a dataset that adds or replaces one gender's catalog."""
+    dataset = app.current_dataset()
+    names = {**dataset.names, gender: entries}
+    app.DATASET = app.build_dataset(names, dataset.fortunes, dataset.version, dataset.source_hash)
+
+
+def bench_trigram_shortlist(label: str, entries: Sequence[app.NameEntry], repeat: int) -> None:
+    """Compare select_korean_names with and without the trigram shortlist."""
+    install_catalog("bench", entries)
+    shortlist_size = app.SHORTLIST_SIZE
+    try:
+        app.SHORTLIST_SIZE = len(entries)
+        full_ms = time_per_call(lambda: [app.select_korean_names(name, "bench") for name in SAMPLE_INPUTS], repeat)
+        app.SHORTLIST_SIZE = shortlist_size
+        short_ms = time_per_call(lambda: [app.select_korean_names(name, "bench") for name in SAMPLE_INPUTS], repeat)
+    finally:
+        app.SHORTLIST_SIZE = shortlist_size
+    full_ms /= len(SAMPLE_INPUTS)
+    short_ms /= len(SAMPLE_INPUTS)
+    print(
+        f"[trigram] {label:>16}: full scan {full_ms:9.3f} ms/req | "
+        f"shortlist({shortlist_size}) {short_ms:9.3f} ms/req | speedup {full_ms / short_ms:6.2f}x"
+    )
+
+
+def bench_select_latency(label: str, entries: Sequence[app.NameEntry], samples: int) -> None:
+    """Report select_korean_names latency percentiles over varied inputs."""
+    install_catalog("bench", entries)
+    rng = random.Random(11)
+    inputs = [rng.choice(SAMPLE_INPUTS)[: rng.randint(3, 8)] for _ in range(samples)]
+    timings: List[float] = []
+    for name in inputs:
+        start = time.perf_counter()
+        app.select_korean_names(name, "bench")
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"[select] {label:>16}: p50 {p50:9.3f} ms | p99 {p99:9.3f} ms over {samples} inputs")
+
+
+def bench_name_composer(size: int, samples: int) -> None:
+    """Time the beam-search composer on a large inventory and count composed picks on the shipped pools."""
+    rng = random.Random(17)
+    records = make_synthetic_records(size)
+    for record in records:
+        record["hanja"] = "".join(chr(0x4E00 + rng.randrange(2000)) for _ in range(2))
+    composer = app.NameComposer(app.build_name_entries({"bench": records})["bench"])
+    timings: List[float] = []
+    for _ in range(samples):
+        token = app.tokenize_name(rng.choice(SAMPLE_INPUTS))[0]
+        start = time.perf_counter()
+        composer.compose(token, app.GENERATED_NAME_SLOTS)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+    composed = 0
+    for name in SAMPLE_INPUTS:
+        for gender in ("male", "female"):
+            picks = app.select_korean_names(name, gender, random.Random(1))
+            composed += sum(entry.entry_id < 0 for entry in picks)
+    total = 2 * len(SAMPLE_INPUTS) * app.RECOMMENDATION_COUNT
+    print(
+        f"[compose] inventory of {sum(map(len, composer.inventory))} syllables from {size} names: "
+        f"p50 {p50:6.3f} ms | p99 {p99:6.3f} ms | {composed}/{total} shipped picks composed"
+    )
+
+
+def bench_daily_fortune(size: int, repeat: int) -> None:
+    """Time fortune lookups against the per-call draw, and both ways of drawing a table."""
+    dataset = app.current_dataset()
+    names = [entry.name for entries in dataset.names.values() for entry in entries] + ["새봄빛", "가온누리"]
+    today = app.fortune_day()
+    app.FORTUNE_TABLES.prepare(dataset)
+    per_call_ms = time_per_call(lambda: [legacy_daily_fortune(name, today, dataset.fortunes) for name in names], repeat)
+    table_ms = time_per_call(lambda: [app.get_daily_fortune(name, dataset) for name in names], repeat)
+    synthetic = [record["name"] for record in make_synthetic_records(size)]
+    build_ms = {}
+    for legacy_seeding in (True, False):
+        start = time.perf_counter()
+        app.FortuneTable(today, dataset.fortunes, synthetic, legacy_seeding)
+        build_ms[legacy_seeding] = (time.perf_counter() - start) * 1000
+    print(
+        f"[fortune] {len(names)} names: per call {per_call_ms * 1000 / len(names):7.1f} us | "
+        f"table {table_ms * 1000 / len(names):7.1f} us"
+    )
+    print(
+        f"[fortune] table of {size} names: seeded generator {build_ms[True]:8.1f} ms | "
+        f"BLAKE2 {build_ms[False]:8.1f} ms | speedup {build_ms[True] / build_ms[False]:5.2f}x"
+    )
+
+
+def bench_fortune_range(repeat: int) -> None:
+    """Time a month of fortunes for several names, batched per day against one call per name and day."""
+    dataset = app.current_dataset()
+    names = [entry.name for entry in dataset.names["female"][:app.FORTUNE_RANGE_MAX_NAMES]]
+    start = app.datetime.now().date()
+    days = app.FORTUNE_RANGE_MAX_DAYS
+    dates = [(start + app.timedelta(days=offset)).isoformat() for offset in range(days)]
+    per_day_ms = time_per_call(
+        lambda: [legacy_daily_fortune(name, day, dataset.fortunes) for name in names for day in dates], repeat
+    )
+    batched_ms = time_per_call(lambda: app.get_fortune_range(names, start, days, dataset), repeat)
+    print(
+        f"[fortune] {len(names)} names x {days} days: per call {per_day_ms:8.2f} ms | "
+        f"batched {batched_ms:8.2f} ms | speedup {per_day_ms / batched_ms:5.2f}x"
+    )
+
+
+def bench_conditional_requests(repeat: int) -> None:
+    """Time full responses against 304s for a page and a fortune range."""
+    client = app.app.test_client()
+    for url in ("/", "/api/fortune/range?name=민준&from=2030-01-01&days=31"):
+        etag = client.get(url).headers["ETag"]
+        full_ms = time_per_call(lambda: client.get(url), repeat)
+        revalidated_ms = time_per_call(lambda: client.get(url, headers={"If-None-Match": etag}), repeat)
+        print(f"[cache] {url.split('?')[0]:24} 200 {full_ms:7.2f} ms | 304 {revalidated_ms:7.2f} ms")
+
+
+def bench_asset_build() -> None:
+    """Build the static assets and report their size as built and with gzip variants."""
+    with tempfile.TemporaryDirectory() as asset_dir:
+        assets = app.build_assets(asset_dir)
+        raw_bytes = sent_bytes = 0
+        for asset in assets.values():
+            size = os.path.getsize(os.path.join(asset_dir, asset["path"]))
+            raw_bytes += size
+            sent_bytes += os.path.getsize(os.path.join(asset_dir, f"{asset['path']}.gz")) if asset["gzip"] else size
+        print(
+            f"[assets] {len(assets)} files: {raw_bytes / 1024:8.1f} KiB as built | "
+            f"{sent_bytes / 1024:8.1f} KiB with gzip variants"
+        )
+
+
+def bench_compression(repeat: int) -> None:
+    """Time responses with and without gzip and report the compressed sizes."""
+    if app.COMPRESSION is None:
+        print("[compress] disabled by NAEILUM_COMPRESSION")
+        return
+    client = app.app.test_client()
+    token = client.get("/api/csrf_token").get_json()["token"]
+    items = [{"name": name, "gender": "female"} for name in ("Emily", "Olivia", "Sophia", "Grace")] * 25
+    requests = (
+        ("/", lambda headers: client.get("/", headers=headers)),
+        ("fortune range", lambda headers: client.get(
+            "/api/fortune/range?name=민준&from=2030-01-01&days=31", headers=headers
+        )),
+        ("batch (100 items)", lambda headers: client.post(
+            "/api/recommend/batch", json={"items": items}, headers={**headers, app.CSRF_HEADER_NAME: token}
+        )),
+    )
+    for label, send in requests:
+        identity = send({})
+        compressed = send({"Accept-Encoding": "gzip"})
+        identity_ms = time_per_call(lambda: send({}), repeat)
+        gzip_ms = time_per_call(lambda: send({"Accept-Encoding": "gzip"}), repeat)
+        print(
+            f"[compress] {label:18} {len(identity.data) / 1024:7.1f} KiB -> {len(compressed.data) / 1024:6.1f} KiB | "
+            f"identity {identity_ms:7.2f} ms | gzip {gzip_ms:7.2f} ms"
+        )
+    gzip_stats = app.COMPRESSION.stats()["codings"]["gzip"]
+    print(f"[compress] {gzip_stats['cpu_us_per_response']:.0f} us CPU per compressed response, "
+          f"{app.COMPRESSION.stats()['cache_hits']} cache hits")
+
+
+def bench_diverse_selector(size: int) -> None:
+    """Time the legacy full sort against the heap selector on a pool of ``size`` entries."""
+    pool = make_selector_pool(size)
+    entries = [item.entry.to_dict() for item in pool]
+    rng = random.Random(9)
+    scores = [rng.random() for _ in range(size)]
+
+    def legacy() -> None:
+        legacy_pick_diverse([(score, random.random(), entry) for score, entry in zip(scores, entries)], entries)
+
+    def heap() -> None:
+        picked, seen = app.select_diverse_top_k(
+            [(-score, random.random(), entry_id) for entry_id, score in enumerate(scores)], pool, []
+        )
+        if len(picked) < 5:
+            app.sample_leftover_ids(pool, picked, seen, 5 - len(picked))
+
+    legacy_ms = time_per_call(legacy, 1)
+    heap_ms = time_per_call(heap, 1)
+    line = (
+        f"[selector] {size:>16}: legacy {legacy_ms:9.1f} ms | heap {heap_ms:9.1f} ms | "
+        f"speedup {legacy_ms / heap_ms:5.2f}x"
+    )
+    if app.np is not None:
+        columns = pool_columns(pool)
+        ties = [random.random() for _ in range(size)]
+        columnar_ms = time_per_call(lambda: columns.select_diverse("bench", range(size), scores, ties, []), 1)
+        line += f" | columnar {columnar_ms:9.1f} ms"
+    print(line)
+
+
+def bench_entry_memory(size: int) -> None:
+    """Report traced bytes per entry for parsed JSON dicts versus compact entries."""
+    serialized = json.dumps(make_synthetic_records(size), ensure_ascii=False)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        raw = json.loads(serialized)
+        dict_bytes = tracemalloc.get_traced_memory()[0] - baseline
+        entries = app.build_name_entries({"bench": raw})
+        del raw
+        gc.collect()
+        entry_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    print(
+        f"[memory] {len(entries['bench']):>16}: json dicts {dict_bytes / size:7.1f} B/entry | "
+        f"NameEntry {entry_bytes / size:7.1f} B/entry | saved {1 - entry_bytes / dict_bytes:6.1%}"
+    )
+
+
+WORKER_SCRIPT = (
+    "import sys, app; app.recommend_names('Michael', 'male'); "
+    "sys.stdout.write('ready\\n'); sys.stdout.flush(); sys.stdin.read()"
+)
+
+
+def read_smaps_rollup(pid: int) -> Dict[str, int]:
+    """Return the kB fields of ``/proc/<pid>/smaps_rollup``."""
+    fields: Dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r", encoding="ascii") as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields
+
+
+def measure_workers(count: int, env: Dict[str, str]) -> Tuple[float, float]:
+    """Start ``count`` independent app imports; return mean USS and total PSS in MiB."""
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER_SCRIPT],
+            cwd=os.path.dirname(os.path.abspath(app.__file__)),
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        for _ in range(count)
+    ]
+    try:
+        for worker in workers:
+            if worker.stdout.readline().strip() != "ready":
+                raise RuntimeError(f"worker {worker.pid} failed to start")
+        rollups = [read_smaps_rollup(worker.pid) for worker in workers]
+    finally:
+        for worker in workers:
+            worker.stdin.close()
+        for worker in workers:
+            worker.wait()
+    uss = sum(rollup["Private_Clean"] + rollup["Private_Dirty"] for rollup in rollups) / len(rollups) / 1024
+    pss = sum(rollup["Pss"] for rollup in rollups) / 1024
+    return uss, pss
+
+
+def bench_worker_memory(size: int, worker_counts: Sequence[int]) -> None:
+    """Compare per-worker USS and total PSS with JSON loading versus the mapped store.
+
+    Each worker imports the app on its own, as gunicorn workers do without
+    ``--preload``, over a synthetic catalog of ``size`` names per gender.
+    """
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("[workers] skipped: /proc/<pid>/smaps_rollup is not available")
+        return
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_synthetic_data(data_dir, size)
+        store_path = os.path.join(data_dir, "names.store")
+        env = {**os.environ, "NAEILUM_DATA_DIR": data_dir, "NAEILUM_NAME_STORE": ""}
+        subprocess.run(
+            [sys.executable, app.__file__, "build", "--output", store_path],
+            env=env, check=True, stderr=subprocess.DEVNULL,
+        )
+        print(f"[workers] {2 * size} names, store {os.path.getsize(store_path) / 2**20:.1f} MiB")
+        for count in worker_counts:
+            json_uss, json_pss = measure_workers(count, env)
+            mmap_uss, mmap_pss = measure_workers(count, {**env, "NAEILUM_NAME_STORE": store_path})
+            print(
+                f"[workers] {count:>3} workers: json USS {json_uss:7.1f} MiB/worker PSS {json_pss:8.1f} MiB | "
+                f"mmap USS {mmap_uss:7.1f} MiB/worker PSS {mmap_pss:8.1f} MiB"
+            )
+
+
+def write_synthetic_data(data_dir: str, size: int, shards: int = 1) -> None:
+    """Write ``size`` synthetic names per gender, split over ``shards`` files."""
+    for seed, gender in enumerate(("male", "female")):
+        records = make_synthetic_records(size, seed)
+        step = -(-size // shards)
+        for shard in range(shards):
+            filename = f"names_{gender}.json" if shard == 0 else f"names_{gender}.{shard:03d}.json"
+            with open(os.path.join(data_dir, filename), "w", encoding="utf-8") as file:
+                json.dump(records[shard * step:(shard + 1) * step], file, ensure_ascii=False)
+
+
+def bench_snapshot_load(size: int, shards: int) -> None:
+    """Compare loading the JSON files and building indexes with mapping the snapshot."""
+    data_dir_before = app.DATA_DIR
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_synthetic_data(data_dir, size, shards)
+        store_path = os.path.join(data_dir, "names.store")
+        subprocess.run(
+            [sys.executable, app.__file__, "build", "--output", store_path],
+            env={**os.environ, "NAEILUM_DATA_DIR": data_dir}, check=True, stderr=subprocess.DEVNULL,
+        )
+        app.DATA_DIR = data_dir
+        try:
+            start = time.perf_counter()
+            names_data = app.build_name_entries(app.load_names())
+            json_ms = (time.perf_counter() - start) * 1000
+            name_index = app.build_name_index(names_data)
+            app.build_trigram_indexes(name_index)
+            app.build_phonetic_indexes(name_index)
+            app.NameColumns(names_data, name_index)
+            index_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            source_hash = app.compute_source_hash()
+            store = app.open_name_store(store_path, source_hash)
+            if store is None:
+                raise RuntimeError("freshly built snapshot was rejected")
+            app.load_store_dataset(store, source_hash)
+            snapshot_ms = (time.perf_counter() - start) * 1000
+        finally:
+            app.DATA_DIR = data_dir_before
+    print(
+        f"[snapshot] {2 * size} names in {shards} shard(s): json parse {json_ms:8.1f} ms, "
+        f"with indexes {index_ms:8.1f} ms | snapshot {snapshot_ms:6.1f} ms"
+    )
+
+
+def bench_incremental_update(size: int, edits: int) -> None:
+    """Time applying a small edit to a large catalog against rebuilding it."""
+    records = {"male": make_synthetic_records(size, 1)}
+    names_data = app.build_name_entries(records)
+    start = time.perf_counter()
+    dataset = app.build_dataset(names_data, [], app.compute_dataset_version(names_data, []), "")
+    full_ms = (time.perf_counter() - start) * 1000
+
+    records["male"] = edit_records(records["male"], edits, random.Random(5), 1)
+    edited = app.build_name_entries(records)
+    start = time.perf_counter()
+    app.diff_name_pool(dataset.names["male"], edited["male"])
+    diff_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    app.update_dataset(dataset, edited, [], "")
+    update_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"[incremental] {size} names, {3 * edits} changed: full build {full_ms:9.1f} ms | "
+        f"diff {diff_ms:7.1f} ms, diff + apply {update_ms:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic-size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--selector-sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--memory-size", type=int, default=1_000_000)
+    parser.add_argument("--worker-counts", type=int, nargs="*", default=[], help="e.g. 4 16 64")
+    parser.add_argument("--worker-catalog-size", type=int, default=50_000)
+    parser.add_argument("--snapshot-size", type=int, default=50_000)
+    parser.add_argument("--snapshot-shards", type=int, default=4)
+    parser.add_argument("--incremental-size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    if args.incremental_size:
+        bench_incremental_update(args.incremental_size, 10)
+
+    if args.snapshot_size:
+        bench_snapshot_load(args.snapshot_size, 1)
+        bench_snapshot_load(args.snapshot_size, args.snapshot_shards)
+
+    if args.worker_counts:
+        bench_worker_memory(args.worker_catalog_size, args.worker_counts)
+
+    if args.memory_size:
+        bench_entry_memory(args.memory_size)
+
+    bench_daily_fortune(args.synthetic_size, args.repeat)
+    bench_fortune_range(args.repeat)
+    bench_conditional_requests(args.repeat)
+    bench_asset_build()
+    bench_compression(args.repeat)
+    bench_romanization(args.synthetic_size)
+    for size in args.selector_sizes:
+        bench_diverse_selector(size)
+
+    for gender in ("male", "female"):
+        entries = app.current_dataset().names[gender]
+        bench_candidate_index(f"{gender} ({len(entries)})", entries, args.repeat)
+        bench_ngram_backend(f"{gender} ({len(entries)})", entries, args.repeat)
+        bench_edit_metrics(f"{gender} ({len(entries)})", entries, args.repeat)
+
+    synthetic = make_synthetic_catalog(args.synthetic_size)
+    bench_candidate_index(f"synthetic ({len(synthetic)})", synthetic, 1)
+    bench_ngram_backend(f"synthetic ({len(synthetic)})", synthetic, 1)
+    bench_edit_metrics(f"synthetic ({len(synthetic)})", synthetic, 1)
+    bench_trigram_shortlist(f"synthetic ({len(synthetic)})", synthetic, 1)
+    bench_select_latency(f"synthetic ({len(synthetic)})", synthetic, 100)
+    bench_name_composer(args.synthetic_size, 200)
+
+
+if __name__ == "__main__":
+    main()
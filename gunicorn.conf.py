@@ -0,0 +1,8 @@
+"""gunicorn settings: start each worker's background threads once it has loaded the app."""
+
+
+def post_worker_init(worker) -> None:
+    """Start the thread that builds each date's fortune tables before it starts anywhere."""
+    import app
+
+    app.start_fortune_rollover()
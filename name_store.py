@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Versioned, checksummed binary store for the name catalog.
+
+A store is a fixed header, a JSON metadata block and a sequence of 8-byte
+aligned binary sections. Readers ``mmap`` the file read-only, so every
+worker process shares the same physical pages for the section data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+MAGIC = b"NAEILUM\x00"
+FORMAT_VERSION = 3
+HEADER = struct.Struct("<8sHH16s32sQ")
+ALIGNMENT = 8
+
+SectionData = Union[bytes, array]
+
+
+class StoreError(Exception):
+    """Raised when a store file is missing, malformed or fails its checksum."""
+
+
+def _padding(length: int) -> bytes:
+    return b"\x00" * (-length % ALIGNMENT)
+
+
+def pack_strings(values: Iterable[str]) -> Tuple[bytes, array]:
+    """Pack strings into one UTF-8 blob and an offsets array with a trailing end."""
+    parts = []
+    offsets = array("Q", [0])
+    for value in values:
+        raw = value.encode("utf-8")
+        parts.append(raw)
+        offsets.append(offsets[-1] + len(raw))
+    return b"".join(parts), offsets
+
+
+def pack_postings(postings: Dict[str, Sequence[int]]) -> Dict[str, SectionData]:
+    """Pack a string-keyed postings map as sorted keys, offsets and one id array."""
+    keys = sorted(postings)
+    blob, key_offsets = pack_strings(keys)
+    offsets = array("Q", [0])
+    ids = array("I")
+    for key in keys:
+        ids.extend(postings[key])
+        offsets.append(len(ids))
+    return {"keys.blob": blob, "keys.offsets": key_offsets, "offsets": offsets, "ids": ids}
+
+
+class PackedStrings(Sequence):
+    """A read-only sequence of strings decoded on access from a packed blob."""
+
+    def __init__(self, blob: memoryview, offsets: memoryview) -> None:
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return max(0, len(self._offsets) - 1)
+
+    def __getitem__(self, index: int) -> str:
+        offsets = self._offsets
+        if index < 0:
+            index += len(offsets) - 1
+            if index < 0:
+                raise IndexError("string index out of range")
+        # Past the end, the lookup of ``index + 1`` raises IndexError itself
+        return str(self._blob[offsets[index]:offsets[index + 1]], "utf-8")
+
+
+class PackedPostings(Mapping):
+    """A read-only map from string keys to id views, found by binary search."""
+
+    def __init__(self, keys: PackedStrings, offsets: memoryview, ids: memoryview) -> None:
+        self._keys = keys
+        self._offsets = offsets
+        self._ids = ids
+
+    def __getitem__(self, key: str) -> memoryview:
+        position = bisect_left(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            raise KeyError(key)
+        return self._ids[self._offsets[position]:self._offsets[position + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class PackedText:
+    """A str-like view of UTF-32-LE text, sliced by character offsets."""
+
+    def __init__(self, data: memoryview) -> None:
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._data) // 4
+
+    def __getitem__(self, index: slice) -> str:
+        start, stop, _ = index.indices(len(self))
+        return str(self._data[4 * start:4 * max(start, stop)], "utf-32-le")
+
+
+def write_store(path: str, dataset_version: str, metadata: Dict[str, Any], sections: Dict[str, SectionData]) -> None:
+    """Write a store atomically: sections, metadata, then the checksummed header."""
+    layout: Dict[str, list] = {}
+    blobs = []
+    offset = 0
+    for name, data in sections.items():
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        typecode = data.typecode if isinstance(data, array) else "B"
+        layout[name] = [offset, len(raw), typecode]
+        blobs.append(raw + _padding(len(raw)))
+        offset += len(raw) + len(_padding(len(raw)))
+
+    meta = json.dumps({**metadata, "sections": layout}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    meta += _padding(HEADER.size + len(meta))
+    digest = hashlib.sha256(meta)
+    for blob in blobs:
+        digest.update(blob)
+
+    version = dataset_version.encode("ascii")[:16].ljust(16, b"\x00")
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, version, digest.digest(), len(meta))
+    temp_path = f"{path}.tmp.{os.getpid()}"
+    with open(temp_path, "wb") as file:
+        file.write(header)
+        file.write(meta)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temp_path, path)
+
+
+class MappedStore:
+    """A read-only, memory-mapped view of a store file."""
+
+    def __init__(self, path: str, verify: bool = True) -> None:
+        try:
+            with open(path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            raise StoreError(f"Cannot map store {path}: {exc}") from exc
+
+        if len(self._mmap) < HEADER.size:
+            raise StoreError(f"Store {path} is truncated")
+        magic, format_version, _, version, checksum, meta_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise StoreError(f"{path} is not a name store")
+        if format_version != FORMAT_VERSION:
+            raise StoreError(f"Store {path} has format {format_version}, expected {FORMAT_VERSION}")
+
+        self.path = path
+        self.dataset_version = version.rstrip(b"\x00").decode("ascii")
+        self._view = memoryview(self._mmap)
+        if verify and hashlib.sha256(self._view[HEADER.size:]).digest() != checksum:
+            raise StoreError(f"Store {path} failed its checksum")
+
+        meta_end = HEADER.size + meta_length
+        self.metadata: Dict[str, Any] = json.loads(bytes(self._view[HEADER.size:meta_end]).rstrip(b"\x00"))
+        self._data_start = meta_end
+
+    def section(self, name: str) -> memoryview:
+        """Return a zero-copy view of a section, cast to its stored item type."""
+        layout: Optional[list] = self.metadata["sections"].get(name)
+        if layout is None:
+            raise StoreError(f"Store {self.path} has no section {name}")
+        offset, length, typecode = layout
+        start = self._data_start + offset
+        view = self._view[start:start + length]
+        return view if typecode == "B" else view.cast(typecode)
+
+    def strings(self, name: str) -> PackedStrings:
+        """Return the strings written by ``pack_strings`` under ``name``."""
+        return PackedStrings(self.section(f"{name}.blob"), self.section(f"{name}.offsets"))
+
+    def postings(self, name: str) -> PackedPostings:
+        """Return the map written by ``pack_postings`` under ``name``."""
+        return PackedPostings(
+            self.strings(f"{name}.keys"), self.section(f"{name}.offsets"), self.section(f"{name}.ids")
+        )
+
+    def text(self, name: str) -> PackedText:
+        """Return a UTF-32-LE text section as a sliceable view."""
+        return PackedText(self.section(name))
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Revised Romanization of Korean with sound changes across syllables.
+
+Every romanized syllable is an onset, a vowel and a coda. The onset and
+coda a consonant takes depend on its neighbour across the syllable
+boundary (liaison, nasalization, ㄹ-assimilation, palatalization and
+ㅎ-aspiration), so both are looked up in a precomputed boundary table and
+the three parts select one of a fixed set of precomputed segment strings.
+Tables are built once at import; ``romanize`` walks a text in one pass and
+``romanize_many`` does the same for a whole catalog as NumPy array
+operations over code points.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+HANGUL_BASE = 0xAC00
+SYLLABLE_COUNT = 11172
+MEDIAL_COUNT = 21
+FINAL_COUNT = 28
+MEDIAL_I = 20
+
+# Onset (choseong) order: ㄱ ㄲ ㄴ ㄷ ㄸ ㄹ ㅁ ㅂ ㅃ ㅅ ㅆ ㅇ ㅈ ㅉ ㅊ ㅋ ㅌ ㅍ ㅎ
+INITIALS = ("g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h")
+MEDIALS = (
+    "a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe",
+    "yo", "u", "wo", "we", "wi", "yu", "eu", "ui", "i",
+)
+# Coda (jongseong) as pronounced at the end of a word, in jongseong order:
+# none ㄱ ㄲ ㄳ ㄴ ㄵ ㄶ ㄷ ㄹ ㄺ ㄻ ㄼ ㄽ ㄾ ㄿ ㅀ ㅁ ㅂ ㅄ ㅅ ㅆ ㅇ ㅈ ㅊ ㅋ ㅌ ㅍ ㅎ
+FINALS = (
+    "", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l",
+    "p", "l", "m", "p", "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t",
+)
+
+(G, KK, N, D, TT, R, M, B, PP, S, SS, SILENT, J, JJ, CH, K, T, P, H) = range(19)
+
+# For each coda: the consonant that stays behind and the onset that moves to
+# a following vowel (liaison). None means nothing stays or nothing moves.
+CODA_SPLITS: Tuple[Tuple[object, object], ...] = (
+    (None, None), (None, G), (None, KK), (G, S), (None, N), (N, J), (N, H), (None, D),
+    (None, R), (R, G), (R, M), (R, B), (R, S), (R, T), (R, P), (R, H),
+    (None, M), (None, B), (B, S), (None, S), (None, SS), (None, None), (None, J), (None, CH),
+    (None, K), (None, T), (None, P), (None, H),
+)
+KEPT_CODAS = {G: "k", N: "n", R: "l", B: "p"}
+NASAL_CODAS = {"k": "ng", "t": "n", "p": "m"}
+ASPIRATED = {G: K, D: T, J: CH, S: S}
+
+ONSET_FORMS: Tuple[str, ...] = tuple(dict.fromkeys([*INITIALS, "l"]))
+CODA_FORMS: Tuple[str, ...] = tuple(dict.fromkeys(FINALS))
+ONSET_IDS = {form: index for index, form in enumerate(ONSET_FORMS)}
+CODA_IDS = {form: index for index, form in enumerate(CODA_FORMS)}
+
+
+def _boundary(final: int, initial: int, before_i: bool) -> Tuple[str, str]:
+    """Return how a coda and the next syllable's onset are written together."""
+    coda = FINALS[final]
+    onset = INITIALS[initial]
+    kept, moved = CODA_SPLITS[final]
+    if initial == SILENT and final != 21:
+        if moved == H:
+            # ㅎ falls silent, so a consonant left in front of it moves instead
+            return "", INITIALS[kept] if kept is not None else ""
+        if before_i and moved in (D, T):
+            moved = J if moved == D else CH
+        return KEPT_CODAS.get(kept, ""), INITIALS[moved] if moved is not None else ""
+    if moved == H and initial in ASPIRATED:
+        return KEPT_CODAS.get(kept, ""), INITIALS[ASPIRATED[initial]]
+    if coda == "l" and initial in (N, R):
+        return "l", "l"
+    if coda == "n" and initial == R:
+        return "l", "l"
+    if initial in (N, M, R) and coda in NASAL_CODAS:
+        coda = NASAL_CODAS[coda]
+    if initial == R and coda in ("m", "ng", "n"):
+        onset = "n"
+    return coda, onset
+
+
+def _segment_id(onset: str, medial: int, coda: str) -> int:
+    return (ONSET_IDS[onset] * MEDIAL_COUNT + medial) * len(CODA_FORMS) + CODA_IDS[coda]
+
+
+SEGMENTS: Tuple[str, ...] = tuple(
+    onset + medial + coda for onset in ONSET_FORMS for medial in MEDIALS for coda in CODA_FORMS
+)
+# (coda id, onset id) for every coda, next onset and whether the next vowel is ㅣ
+BOUNDARIES: Tuple[Tuple[int, int], ...] = tuple(
+    (CODA_IDS[coda], ONSET_IDS[onset])
+    for final in range(FINAL_COUNT)
+    for initial in range(len(INITIALS))
+    for before_i in (False, True)
+    for coda, onset in (_boundary(final, initial, before_i),)
+)
+INITIAL_ONSET_IDS = tuple(ONSET_IDS[onset] for onset in INITIALS)
+FINAL_CODA_IDS = tuple(CODA_IDS[coda] for coda in FINALS)
+# Every syllable romanized on its own, as at the start and end of a word
+SYLLABLES: Tuple[str, ...] = tuple(
+    SEGMENTS[_segment_id(INITIALS[index // 588], (index // FINAL_COUNT) % MEDIAL_COUNT, FINALS[index % FINAL_COUNT])]
+    for index in range(SYLLABLE_COUNT)
+)
+
+if np is not None:
+    _SEGMENT_ARRAY = np.array(SEGMENTS, dtype=object)
+    _BOUNDARY_CODAS = np.array([coda for coda, _ in BOUNDARIES], dtype=np.int64)
+    _BOUNDARY_ONSETS = np.array([onset for _, onset in BOUNDARIES], dtype=np.int64)
+    _INITIAL_ONSETS = np.array(INITIAL_ONSET_IDS, dtype=np.int64)
+    _FINAL_CODAS = np.array(FINAL_CODA_IDS, dtype=np.int64)
+
+
+def boundary_index(final: int, initial: int, before_i: bool) -> int:
+    """Return the position of a coda and next onset pair in ``BOUNDARIES``."""
+    return (final * len(INITIALS) + initial) * 2 + before_i
+
+
+def romanize_syllable(char: str) -> str:
+    """Romanize one character on its own; anything but a Hangul syllable is returned as is."""
+    index = ord(char) - HANGUL_BASE
+    return SYLLABLES[index] if 0 <= index < SYLLABLE_COUNT else char
+
+
+def romanize(text: str) -> str:
+    """Romanize Hangul in ``text``, applying sound changes within runs of syllables."""
+    parts: List[str] = []
+    onset_id = -1
+    medial = final = 0
+    for char in text:
+        index = ord(char) - HANGUL_BASE
+        if 0 <= index < SYLLABLE_COUNT:
+            initial, next_medial, next_final = index // 588, (index // FINAL_COUNT) % MEDIAL_COUNT, index % FINAL_COUNT
+            if onset_id < 0:
+                onset_id = INITIAL_ONSET_IDS[initial]
+            else:
+                coda_id, next_onset_id = BOUNDARIES[boundary_index(final, initial, next_medial == MEDIAL_I)]
+                parts.append(SEGMENTS[(onset_id * MEDIAL_COUNT + medial) * len(CODA_FORMS) + coda_id])
+                onset_id = next_onset_id
+            medial, final = next_medial, next_final
+            continue
+        if onset_id >= 0:
+            parts.append(SEGMENTS[(onset_id * MEDIAL_COUNT + medial) * len(CODA_FORMS) + FINAL_CODA_IDS[final]])
+            onset_id = -1
+        parts.append(char)
+    if onset_id >= 0:
+        parts.append(SEGMENTS[(onset_id * MEDIAL_COUNT + medial) * len(CODA_FORMS) + FINAL_CODA_IDS[final]])
+    return "".join(parts)
+
+
+def romanize_many(texts: Sequence[str]) -> List[str]:
+    """Romanize many texts at once, as ``romanize`` would one by one.
+
+    With NumPy, texts made only of Hangul syllables are decomposed and
+    matched against the boundary table as arrays over their concatenated
+    code points; the rest fall back to ``romanize``.
+    """
+    if np is None or not texts:
+        return [romanize(text) for text in texts]
+
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype="<u4").astype(np.int64) - HANGUL_BASE
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    hangul = (codes >= 0) & (codes < SYLLABLE_COUNT)
+    codes[~hangul] = 0
+
+    initial = codes // 588
+    medial = (codes // FINAL_COUNT) % MEDIAL_COUNT
+    final = codes % FINAL_COUNT
+    first = np.zeros(len(codes), dtype=bool)
+    last = np.zeros(len(codes), dtype=bool)
+    first[starts[lengths > 0]] = True
+    last[ends[lengths > 0] - 1] = True
+
+    # Boundary between each syllable and the one after it, within a text
+    boundary = np.zeros(len(codes), dtype=np.int64)
+    boundary[:-1] = (final[:-1] * len(INITIALS) + initial[1:]) * 2 + (medial[1:] == MEDIAL_I)
+    onsets = np.where(first, _INITIAL_ONSETS[initial], _BOUNDARY_ONSETS[np.roll(boundary, 1)])
+    codas = np.where(last, _FINAL_CODAS[final], _BOUNDARY_CODAS[boundary])
+    pieces = _SEGMENT_ARRAY[(onsets * MEDIAL_COUNT + medial) * len(CODA_FORMS) + codas].tolist()
+
+    mixed = set(np.searchsorted(ends, np.flatnonzero(~hangul), side="right").tolist())
+    return [
+        romanize(text) if position in mixed else "".join(pieces[start:end])
+        for position, (text, start, end) in enumerate(zip(texts, starts.tolist(), ends.tolist()))
+    ]
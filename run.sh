@@ -4,6 +4,9 @@ echo ""
 echo "Installing dependencies..."
 pip3 install -r requirements.txt
 echo ""
+echo "Building static assets..."
+python3 app.py build-assets
+echo ""
 echo "Starting server..."
 echo ""
 echo "========================================"
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+String similarity for short ASCII names.
+
+Bit-parallel Levenshtein (Myers/Hyyrö) and Jaro-Winkler over precompiled
+per-pattern character bitmasks. Both accept a ``score_cutoff`` and give up
+as soon as the result provably cannot reach it.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, NamedTuple
+
+
+class BitPattern(NamedTuple):
+    """A string with one bitmask of its positions per character."""
+
+    text: str
+    masks: Dict[str, int]
+    length: int
+
+
+def compile_pattern(text: str) -> BitPattern:
+    """Precompute the position bitmasks of ``text``."""
+    masks: Dict[str, int] = {}
+    for position, char in enumerate(text):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    return BitPattern(text, masks, len(text))
+
+
+def levenshtein_distance(pattern: BitPattern, text: str, max_distance: int = -1) -> int:
+    """Return the edit distance between ``pattern`` and ``text``.
+
+    With ``max_distance`` >= 0, returns ``max_distance + 1`` as soon as the
+    distance is known to exceed it.
+    """
+    length = pattern.length
+    if not length:
+        distance = len(text)
+        return distance if max_distance < 0 or distance <= max_distance else max_distance + 1
+    if 0 <= max_distance < abs(length - len(text)):
+        return max_distance + 1
+
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    masks = pattern.masks
+    positive = full
+    negative = 0
+    distance = length
+    remaining = len(text)
+
+    for char in text:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        horizontal_positive = negative | ~(horizontal | positive)
+        horizontal_negative = positive & horizontal
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+        remaining -= 1
+        # Each remaining character can lower the distance by at most one
+        if 0 <= max_distance < distance - remaining:
+            return max_distance + 1
+        horizontal_positive = ((horizontal_positive << 1) | 1) & full
+        horizontal_negative = (horizontal_negative << 1) & full
+        positive = (horizontal_negative | ~(vertical | horizontal_positive)) & full
+        negative = horizontal_positive & vertical
+
+    if 0 <= max_distance < distance:
+        return max_distance + 1
+    return distance
+
+
+def levenshtein_ratio(pattern: BitPattern, text: str, score_cutoff: float = 0.0) -> float:
+    """Return ``1 - distance / longest length``, or 0.0 below ``score_cutoff``."""
+    longest = max(pattern.length, len(text))
+    if not longest:
+        return 1.0
+    max_distance = int((1.0 - score_cutoff) * longest + 1e-9) if score_cutoff > 0 else -1
+    distance = levenshtein_distance(pattern, text, max_distance)
+    ratio = 1.0 - distance / longest
+    return ratio if ratio >= score_cutoff else 0.0
+
+
+def jaro_similarity(pattern: BitPattern, text: str, score_cutoff: float = 0.0) -> float:
+    """Return the Jaro similarity, matching characters through the bitmasks."""
+    pattern_length = pattern.length
+    text_length = len(text)
+    if not pattern_length or not text_length:
+        return 1.0 if pattern_length == text_length else 0.0
+
+    shortest = min(pattern_length, text_length)
+    if (shortest / pattern_length + shortest / text_length + 1.0) / 3.0 < score_cutoff:
+        return 0.0
+
+    window = max(0, max(pattern_length, text_length) // 2 - 1)
+    masks = pattern.masks
+    matched = 0
+    text_matches = []
+    for position, char in enumerate(text):
+        low = max(0, position - window)
+        high = min(pattern_length, position + window + 1)
+        available = masks.get(char, 0) & ~matched & (((1 << high) - 1) ^ ((1 << low) - 1))
+        if available:
+            matched |= available & -available
+            text_matches.append(char)
+
+    matches = len(text_matches)
+    if not matches:
+        return 0.0
+    if (matches / pattern_length + matches / text_length + 1.0) / 3.0 < score_cutoff:
+        return 0.0
+
+    transpositions = 0
+    index = 0
+    bits = matched
+    while bits:
+        lowest = bits & -bits
+        if pattern.text[lowest.bit_length() - 1] != text_matches[index]:
+            transpositions += 1
+        index += 1
+        bits ^= lowest
+
+    similarity = (matches / pattern_length + matches / text_length + (matches - transpositions // 2) / matches) / 3.0
+    return similarity if similarity >= score_cutoff else 0.0
+
+
+def jaro_winkler_similarity(
+    pattern: BitPattern, text: str, score_cutoff: float = 0.0, prefix_weight: float = 0.1
+) -> float:
+    """Return the Jaro-Winkler similarity, or 0.0 below ``score_cutoff``."""
+    prefix = 0
+    for pattern_char, text_char in zip(pattern.text[:4], text[:4]):
+        if pattern_char != text_char:
+            break
+        prefix += 1
+
+    # Invert the prefix boost to get the Jaro score needed to reach the cutoff
+    boost = prefix * prefix_weight
+    jaro_cutoff = (score_cutoff - boost) / (1.0 - boost) if score_cutoff > 0 else 0.0
+    jaro = jaro_similarity(pattern, text, max(0.0, jaro_cutoff))
+    if not jaro:
+        return 0.0
+    similarity = jaro + boost * (1.0 - jaro)
+    return similarity if similarity >= score_cutoff else 0.0
+
+
+METRICS: Dict[str, Callable[..., float]] = {
+    "levenshtein": levenshtein_ratio,
+    "jaro_winkler": jaro_winkler_similarity,
+}
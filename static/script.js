@@ -25,6 +25,15 @@ let currentData = {
   fortune: []
 };
 
+// IANA timezone of the browser, so the daily fortune turns over at local midnight
+function clientTimezone() {
+  try {
+    return Intl.DateTimeFormat().resolvedOptions().timeZone || null;
+  } catch {
+    return null;
+  }
+}
+
 // Delay helper function
 function delay(ms) {
   return new Promise(resolve => setTimeout(resolve, ms));
@@ -614,7 +623,7 @@ async function selectName(index) {
 
   try {
     const [data] = await Promise.all([
-      postJSON('/select', { index }),
+      postJSON('/select', { index, timezone: clientTimezone() }),
       delay(DELAYS.nameSelection)
     ]);
 
@@ -0,0 +1,34 @@
+"""Shared pytest setup: make the root modules importable and isolate data reloads."""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+
+
+def clear_caches() -> None:
+    """Drop everything cached against a dataset."""
+    app.RECOMMENDATION_CACHE.clear()
+    app.FORTUNE_CACHE.clear()
+    app.FORTUNE_TABLES.clear()
+    if app.COMPRESSION is not None:
+        app.COMPRESSION.cache.clear()
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point reloads at a copy of the data files and restore the live dataset afterwards."""
+    for _, filename in app.NAME_FILES:
+        shutil.copy(os.path.join(ROOT, filename), tmp_path / filename)
+    shutil.copy(os.path.join(ROOT, app.FORTUNES_FILE), tmp_path / app.FORTUNES_FILE)
+    monkeypatch.setattr(app, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(app, "NAME_STORE_PATH", str(tmp_path / "names.store"))
+    monkeypatch.setattr(app, "DATASET", app.DATASET)
+    yield tmp_path
+    clear_caches()
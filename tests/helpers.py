@@ -0,0 +1,142 @@
+"""Shared test fixtures and reference implementations, also used by ``benchmark.py``.
+
+The ``legacy_*`` functions are the code paths that faster ones replaced; the
+tests check the new paths against them and the benchmarks time both.
+"""
+
+import hashlib
+import random
+from typing import Any, Dict, List, Sequence, Tuple
+
+import app
+import romanization
+
+SAMPLE_INPUTS = [
+    "John", "Emily", "Michael", "Sarah", "Christopher", "Jennifer", "Phillip",
+    "David", "Olivia", "Alexander", "Isabella", "Zoe", "Ethan", "Noah",
+]
+
+CATEGORIES = [
+    "Wisdom", "Courage", "Beauty", "Love", "Hope", "Harmony", "Growth", "Faith",
+    "Honor", "Light", "Peace", "Grace",
+]
+
+
+def make_synthetic_records(size: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Build random two-syllable Hangul name records in the JSON shape."""
+    rng = random.Random(seed)
+    catalog: List[Dict[str, Any]] = []
+    for _ in range(size):
+        name = "".join(
+            chr(
+                romanization.HANGUL_BASE + rng.randrange(19) * 588 + rng.randrange(21) * 28
+                + rng.choice((0, 0, 4, 8, 16, 21))
+            )
+            for _ in range(2)
+        )
+        romanized = romanization.romanize(name)
+        catalog.append({
+            "name": name,
+            "hanja": "",
+            "romanization": [romanized.capitalize(), romanized],
+            "category": rng.choice(CATEGORIES),
+            "meaning": f"A name of {rng.choice(CATEGORIES).lower()}",
+            "initial": romanized[:1].upper() or "A",
+        })
+    return catalog
+
+
+def make_synthetic_catalog(size: int, seed: int = 7) -> Tuple[app.NameEntry, ...]:
+    """Build a synthetic catalog of compact name entries."""
+    return app.build_name_entries({"bench": make_synthetic_records(size, seed)})["bench"]
+
+
+def top_k_ids(scores: Sequence[float], k: int = 5) -> List[int]:
+    """Return the ids of the ``k`` best scores, breaking ties by id."""
+    return sorted(range(len(scores)), key=lambda entry_id: (-scores[entry_id], entry_id))[:k]
+
+
+def legacy_daily_fortune(korean_name: str, day: str, fortunes: Sequence[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """The per-call fortune draw that the daily tables replaced, for parity checks."""
+    rng = random.Random(hashlib.md5(f"{korean_name}{day}".encode(), usedforsecurity=False).hexdigest())
+    result: List[Dict[str, str]] = []
+    for category_data in fortunes:
+        category = category_data.get("category", "")
+        messages = category_data.get("messages", [])
+        if messages:
+            message = rng.choice(messages)
+            message_en, message_ko = (message.get("en", ""), message.get("ko", "")) if isinstance(message, dict) else (
+                str(message), ""
+            )
+            result.append({
+                "category": category,
+                "category_ko": category_data.get("category_ko", category),
+                "message": message_en,
+                "message_ko": message_ko,
+            })
+    return result
+
+
+def legacy_pick_diverse(
+    scored: List[Tuple[float, float, Dict[str, Any]]], entries: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """The original full-sort selector, kept as the timing baseline and the tests' reference."""
+    selections: List[Dict[str, Any]] = []
+    seen_initials: set = set()
+    seen_categories: set = set()
+    seen_korean_names: set = set()
+    for _, _, entry in sorted(scored, key=lambda item: (-item[0], item[1])):
+        if len(selections) >= 5:
+            break
+        korean_name = entry.get("name", "")
+        if korean_name in seen_korean_names:
+            continue
+        initial = entry.get("initial", "")
+        category = entry.get("category", "")
+        if initial in seen_initials and len(selections) < 3:
+            continue
+        if category in seen_categories and len(selections) >= 3:
+            continue
+        selections.append(entry)
+        seen_korean_names.add(korean_name)
+        seen_initials.add(initial)
+        seen_categories.add(category)
+    if len(selections) < 5:
+        leftovers = [entry for entry in entries if entry not in selections and entry.get("name", "") not in seen_korean_names]
+        random.shuffle(leftovers)
+        selections.extend(leftovers[: 5 - len(selections)])
+    return selections
+
+
+def make_selector_pool(size: int, seed: int = 3) -> List[app.IndexedEntry]:
+    """Build score-only pool entries with few initials and categories to stress the rules."""
+    rng = random.Random(seed)
+    pool = []
+    for entry_id in range(size):
+        initial = rng.choice("ABCDEFGH")
+        name = f"n{entry_id % (size // 2 or 1)}"
+        entry = app.NameEntry(entry_id, name, "", (), rng.choice(CATEGORIES[:6]), "", initial)
+        pool.append(app.IndexedEntry(entry, (), initial))
+    return pool
+
+
+def pool_columns(pool: Sequence[app.IndexedEntry]) -> app.NameColumns:
+    """Build a columnar store over a selector pool."""
+    return app.NameColumns({"bench": [item.entry for item in pool]}, {"bench": tuple(pool)})
+
+
+def edit_records(
+    records: List[Dict[str, Any]], edits: int, rng: random.Random, seed: int
+) -> List[Dict[str, Any]]:
+    """Return a copy of ``records`` with ``edits`` removals, updates and additions each."""
+    edited = [dict(record) for record in records]
+    for _ in range(edits):
+        edited.pop(rng.randrange(len(edited)))
+    for index in rng.sample(range(len(edited)), edits):
+        record = edited[index]
+        record["meaning"] = f"{record['meaning']} (revised {seed})"
+        record["category"] = rng.choice(CATEGORIES)
+        record["romanization"] = record["romanization"][:1]
+        record["special_match"] = rng.choice((None, f"Special{seed}x{index}"))
+    edited.extend(make_synthetic_records(edits, seed))
+    return edited
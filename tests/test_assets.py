@@ -0,0 +1,18 @@
+"""The static asset build: content-hashed names, gzip variants and rewritten references."""
+
+import gzip
+
+import app
+
+
+def test_build_assets(tmp_path):
+    assets = app.build_assets(str(tmp_path))
+    assert assets
+    for path, asset in assets.items():
+        data = (tmp_path / asset["path"]).read_bytes()
+        assert asset["path"] == app.asset_name(path, data)
+        if asset["gzip"]:
+            assert gzip.decompress((tmp_path / f"{asset['path']}.gz").read_bytes()) == data
+        if path.endswith(".css"):
+            text = data.decode("utf-8")
+            assert not [other for other in assets if other != path and f"/static/{other}" in text], path
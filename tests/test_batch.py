@@ -0,0 +1,34 @@
+"""Batch recommendations fanned out to the spawned worker pool."""
+
+import pytest
+
+import app
+
+ITEMS = [{"name": name, "gender": "female"} for name in ("Emily", "Olivia", "Sophia", "Grace")] * 10
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(app, "BATCH_WORKERS", 2)
+    monkeypatch.setattr(app, "BATCH_PARALLEL_THRESHOLD", 8)
+    yield
+    app.reset_batch_executor()
+
+
+def check_results(results):
+    assert [result["index"] for result in results] == list(range(len(ITEMS)))
+    assert all(result["success"] and len(result["names"]) == app.RECOMMENDATION_COUNT for result in results)
+
+
+def test_pool_is_spawned(pool):
+    check_results(list(app.iter_batch_results(ITEMS)))
+    executor = app.get_batch_executor()
+    assert executor._mp_context.get_start_method() == "spawn"
+    # Workers load the same files, so they answer for the live dataset themselves
+    assert executor.submit(app.recommend_batch_chunk, 0, ITEMS[:2], app.current_dataset().version).result()
+
+
+def test_chunks_from_another_dataset_version_are_recommended_locally(pool):
+    dataset = app.current_dataset()
+    assert app.recommend_batch_chunk(0, ITEMS[:2], "other") is None
+    check_results(list(app.iter_batch_results(ITEMS, dataset._replace(version="other"))))
@@ -0,0 +1,49 @@
+"""Category filters on recommendations."""
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client():
+    client = app.app.test_client()
+    client.token = client.get("/api/csrf_token").get_json()["token"]
+    return client
+
+
+def recommend(client, gender: str, category: str):
+    return client.post(
+        "/recommend", json={"name": "Michael", "gender": gender, "category": category},
+        headers={app.CSRF_HEADER_NAME: client.token},
+    )
+
+
+def test_category_of_the_requested_gender(client):
+    response = recommend(client, "male", "Achievement")
+    assert response.status_code == 200
+    assert {name["category"] for name in response.get_json()["names"]} == {"Achievement"}
+
+
+@pytest.mark.parametrize("category", ["Achievement", "Nonexistent"])
+def test_category_missing_from_the_requested_gender(client, category):
+    response = recommend(client, "female", category)
+    assert response.status_code == 400
+    assert response.get_json()["error"]["code"] == "INVALID_CATEGORY"
+
+
+def test_batch_reports_missing_category_inline():
+    result = app.recommend_batch_item(0, {"name": "Emily", "gender": "female", "category": "Achievement"})
+    assert result["error"]["code"] == "INVALID_CATEGORY"
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_has_category(vectorized, monkeypatch):
+    columns = app.current_dataset().columns
+    if not vectorized:
+        monkeypatch.setattr(columns, "_arrays", {})
+    elif not columns.vectorized:
+        pytest.skip("NumPy is not installed")
+    assert columns.has_category("male", "Achievement")
+    assert not columns.has_category("female", "Achievement")
+    assert columns.has_category("female", "Beauty")
@@ -0,0 +1,43 @@
+"""The syllable composer and its merge into the recommendations."""
+
+import random
+import time
+from typing import List
+
+import pytest
+
+import app
+from helpers import SAMPLE_INPUTS
+
+
+@pytest.fixture
+def composer():
+    return app.dataset_composer(app.current_dataset(), "female")
+
+
+def composed_names(composer: app.NameComposer, name: str) -> List[str]:
+    """Compose three names for an English name."""
+    return [entry.name for entry in composer.compose(app.normalize_romanization(name), 3)]
+
+
+def test_composed_names_are_new(composer):
+    for name in SAMPLE_INPUTS:
+        names = composed_names(composer, name)
+        assert len(set(names)) == len(names)
+        assert not set(names) & composer.existing
+
+
+def test_compose_ignores_machine_load(composer, monkeypatch):
+    expected = [composed_names(composer, name) for name in SAMPLE_INPUTS]
+    clock = iter(range(0, 10**9, 10**6))
+    monkeypatch.setattr(time, "perf_counter", lambda: next(clock))
+    assert [composed_names(composer, name) for name in SAMPLE_INPUTS] == expected
+    assert composer.compose("minji", 3, beam_width=0) == []
+
+
+@pytest.mark.parametrize("gender", ["male", "female"])
+def test_merged_picks_fill_every_slot_with_distinct_names(gender):
+    for name in SAMPLE_INPUTS:
+        picks = app.select_korean_names(name, gender, random.Random(1))
+        assert len(picks) == app.RECOMMENDATION_COUNT
+        assert len({entry.name for entry in picks}) == len(picks)
@@ -0,0 +1,63 @@
+"""The compression middleware: negotiated codings, decoded bodies and the compressed body cache."""
+
+import gzip
+import json
+from typing import Any, Dict, List
+
+import pytest
+from werkzeug.test import Client
+
+import app
+from wsgi_compression import CompressionMiddleware
+
+RANGE_URL = "/api/fortune/range?name=민준&from=2030-01-01&days=31"
+
+pytestmark = pytest.mark.skipif(app.COMPRESSION is None, reason="compression is disabled by NAEILUM_COMPRESSION")
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize("url", ["/", RANGE_URL])
+def test_gzip_decodes_to_identity_body(client, url):
+    identity = client.get(url)
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.data) == identity.data
+
+
+def test_streamed_batch_is_gzipped(client):
+    token = client.get("/api/csrf_token").get_json()["token"]
+    items = [{"name": name, "gender": "female"} for name in ("Emily", "Olivia", "Sophia", "Grace")] * 25
+    response = client.post(
+        "/api/recommend/batch", json={"items": items},
+        headers={"Accept-Encoding": "gzip", app.CSRF_HEADER_NAME: token},
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.data))["success"]
+
+
+def test_cache_is_keyed_by_data_version():
+    state: Dict[str, Any] = {"version": "1", "body": b"first " * 400}
+
+    def application(environ: Dict[str, Any], start_response: Any) -> List[bytes]:
+        # The ETag deliberately ignores the data, as an application's might
+        start_response("200 OK", [
+            ("Content-Type", "text/plain"), ("Content-Length", str(len(state["body"]))),
+            ("Cache-Control", "public, max-age=60"), ("ETag", '"same"'),
+        ])
+        return [state["body"]]
+
+    client = Client(CompressionMiddleware(application, version=lambda: state["version"]))
+    assert gzip.decompress(client.get("/", headers={"Accept-Encoding": "gzip"}).data) == state["body"]
+    state.update(version="2", body=b"second " * 400)
+    assert gzip.decompress(client.get("/", headers={"Accept-Encoding": "gzip"}).data) == state["body"]
+
+
+def test_reload_clears_cache(client, data_dir):
+    client.get(RANGE_URL, headers={"Accept-Encoding": "gzip"})
+    assert app.COMPRESSION.cache.stats()["entries"]
+    assert app.reload_dataset(force=True)
+    assert not app.COMPRESSION.cache.stats()["entries"]
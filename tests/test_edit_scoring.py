@@ -0,0 +1,48 @@
+"""Early-exit cutoffs of the edit-distance backends against full scoring."""
+
+import random
+
+import pytest
+
+import app
+import similarity
+from helpers import SAMPLE_INPUTS, make_synthetic_catalog
+
+
+@pytest.fixture(scope="module", params=sorted(similarity.METRICS))
+def dataset(request):
+    metric_before = app.SCORING_BACKEND
+    app.SCORING_BACKEND = request.param
+    try:
+        base = app.current_dataset()
+        names = {**base.names, "synthetic": make_synthetic_catalog(3000)}
+        yield app.build_dataset(names, base.fortunes, base.version, base.source_hash)
+    finally:
+        app.SCORING_BACKEND = metric_before
+
+
+@pytest.mark.parametrize("gender", ["male", "female", "synthetic"])
+def test_pruning_keeps_the_picks(dataset, gender, monkeypatch):
+    monkeypatch.setattr(app, "GENERATED_NAME_SLOTS", 0)
+    for name in SAMPLE_INPUTS:
+        pruned = app.select_korean_names(name, gender, random.Random(1), dataset=dataset)
+        with monkeypatch.context() as patch:
+            patch.setattr(app, "SCORE_CUTOFF_RANK", len(dataset.names[gender]) + 1)
+            unpruned = app.select_korean_names(name, gender, random.Random(1), dataset=dataset)
+        assert pruned == unpruned, name
+
+
+def test_pruned_scores_are_bounded(dataset):
+    scorer = dataset.edit_scorers["synthetic"]
+    for name in SAMPLE_INPUTS:
+        english_norm = app.normalize_romanization(name)
+        entry_ids = range(len(scorer.indexed_entries))
+        pruned = {}
+        scores = scorer.score(english_norm, entry_ids, pruned=pruned)
+        assert pruned
+        for entry_id in entry_ids:
+            exact = scorer.score_entry(english_norm, entry_id)
+            if entry_id in pruned:
+                assert scores[entry_id] <= exact <= pruned[entry_id]
+            else:
+                assert scores[entry_id] == exact
@@ -0,0 +1,91 @@
+"""Daily fortune tables: legacy seeding, table lookups and the spread of BLAKE2 draws."""
+
+from typing import List
+
+import pytest
+
+import app
+from helpers import legacy_daily_fortune, make_synthetic_records
+
+EXTRA_NAMES = ["새봄빛", "가온누리"]
+
+
+def chi_square_critical(degrees: int, z: float = 3.09) -> float:
+    """Approximate the chi-square critical value at one-sided normal quantile ``z`` (p = 0.001)."""
+    scale = 2.0 / (9.0 * degrees)
+    return degrees * (1.0 - scale + z * scale ** 0.5) ** 3
+
+
+def catalog_names(dataset: app.Dataset) -> List[str]:
+    """Every catalog name plus a few names outside it."""
+    return [entry.name for entries in dataset.names.values() for entry in entries] + EXTRA_NAMES
+
+
+def test_legacy_seeding_matches_per_call_draw():
+    dataset = app.current_dataset()
+    today = app.fortune_day()
+    table = app.FortuneTable(today, dataset.fortunes, legacy_seeding=True)
+    for name in catalog_names(dataset):
+        assert table.render(table.row(name)) == legacy_daily_fortune(name, today, dataset.fortunes), name
+
+
+def test_daily_fortune_reads_table_row():
+    dataset = app.current_dataset()
+    table = app.FortuneTable(app.fortune_day(), dataset.fortunes)
+    for name in catalog_names(dataset):
+        assert app.get_daily_fortune(name, dataset) == table.render(table.row(name)), name
+
+
+def test_draws_spread_evenly_over_messages():
+    fortunes = app.current_dataset().fortunes
+    names = [record["name"] for record in make_synthetic_records(20_000, seed=23)]
+    tables = [app.FortuneTable(f"2030-01-{day + 1:02d}", fortunes, names, legacy_seeding=False) for day in range(3)]
+    categories = tables[0].categories
+    counts = [[0] * len(messages) for _, _, messages in categories]
+    for table in tables:
+        for row in table.rows.values():
+            for category_counts, position in zip(counts, row):
+                category_counts[position] += 1
+
+    statistic = 0.0
+    degrees = 0
+    for category_counts in counts:
+        expected = sum(category_counts) / len(category_counts)
+        statistic += sum((count - expected) ** 2 / expected for count in category_counts)
+        degrees += len(category_counts) - 1
+    assert statistic <= chi_square_critical(degrees)
+
+
+def test_range_matches_daily_fortunes():
+    dataset = app.current_dataset()
+    names = [entry.name for entry in dataset.names["female"][:app.FORTUNE_RANGE_MAX_NAMES]]
+    start = app.datetime.now().date()
+    days = app.FORTUNE_RANGE_MAX_DAYS
+    dates = [(start + app.timedelta(days=offset)).isoformat() for offset in range(days)]
+    batched = app.get_fortune_range(names, start, days, dataset)
+    for name in names:
+        assert [day["fortune"] for day in batched[name]] == [app.get_daily_fortune(name, dataset, day) for day in dates]
+
+
+def test_tables_are_kept_outside_the_dataset():
+    dataset = app.current_dataset()
+    fortune_tables = app.FortuneTables(4)
+    fortune_tables.prepare(dataset)
+    assert "fortune_tables" not in app.Dataset._fields
+    assert sorted(fortune_tables.days(dataset.version)) == app.active_fortune_days()
+    assert fortune_tables.days("0" * 16) == {}
+
+
+def test_fallback_table_is_kept_per_version_and_day():
+    dataset = app.current_dataset()
+    fortune_tables = app.FortuneTables(4)
+    table = fortune_tables.table(dataset, "2030-01-01")
+    assert fortune_tables.table(dataset, "2030-01-01") is table
+    assert fortune_tables.table(dataset, "2030-01-02") is not table
+    assert fortune_tables.table(dataset._replace(version="0" * 16), "2030-01-01") is not table
+
+
+def test_lookup_does_not_start_the_rollover(monkeypatch):
+    monkeypatch.setattr(app, "start_fortune_rollover", lambda: pytest.fail("a lookup started the rollover"))
+    app.get_daily_fortune(EXTRA_NAMES[0])
+    app.get_fortune_range(EXTRA_NAMES, app.datetime.now().date(), 2)
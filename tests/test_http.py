@@ -0,0 +1,43 @@
+"""Per-route cache policies, ETags and conditional requests."""
+
+import json
+
+import pytest
+
+import app
+
+RANGE_URL = "/api/fortune/range?name=민준&from=2030-01-01&days=31"
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize("url", ["/", RANGE_URL])
+def test_shared_routes_revalidate(client, url):
+    response = client.get(url)
+    etag = response.headers.get("ETag")
+    assert etag is not None
+    assert not response.headers.getlist("Set-Cookie")
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_session_routes_are_not_stored(client):
+    assert client.get("/api/csrf_token").headers.get("Cache-Control") == "no-store"
+
+
+def test_fortunes_reload_changes_range_etag(client, data_dir):
+    etag = client.get(RANGE_URL).headers["ETag"]
+    fortunes_path = data_dir / app.FORTUNES_FILE
+    fortunes = json.loads(fortunes_path.read_text(encoding="utf-8"))
+    for category in fortunes:
+        for message in category["messages"]:
+            message["en"] = f"{message['en']} (revised)"
+    fortunes_path.write_text(json.dumps(fortunes, ensure_ascii=False), encoding="utf-8")
+    assert app.reload_dataset()
+
+    response = client.get(RANGE_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "(revised)" in response.get_data(as_text=True)
@@ -0,0 +1,143 @@
+"""Incremental catalog updates against full rebuilds."""
+
+import json
+import random
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+import app
+from helpers import edit_records, make_synthetic_records
+
+BACKENDS = sorted(app.SCORING_BACKENDS - ({"ngram"} if app.np is None else set()))
+
+
+def canonical_dataset(dataset: app.Dataset) -> Dict[str, Any]:
+    """Describe a dataset's entries and indexes by ``(name, hanja)`` rather than by id."""
+    described: Dict[str, Any] = {}
+    columns = dataset.columns
+    for gender, pool in dataset.name_index.items():
+        identities = [indexed.entry.identity for indexed in pool]
+        assert all(indexed.entry.entry_id == entry_id for entry_id, indexed in enumerate(pool)), gender
+        assert [entry.content() for entry in dataset.names[gender]] == [indexed.entry.content() for indexed in pool]
+
+        def by_identity(postings: Any) -> Dict[str, List[Tuple[str, str]]]:
+            return {key: sorted(identities[entry_id] for entry_id in ids) for key, ids in postings.items()}
+
+        start, stop = columns.pool_ranges[gender]
+        assert stop - start == len(pool), gender
+        rows = {
+            identities[row - start]: (
+                columns.genders[columns.gender_codes[row]],
+                columns.categories[columns.category_codes[row]],
+                columns.initials[columns.initial_codes[row]],
+                columns.names[columns.name_codes[row]],
+                columns.romanization_lengths[row],
+                columns.korean_name(row),
+                columns.romanizations(row),
+            )
+            for row in range(start, stop)
+        }
+        described[gender] = {
+            "entries": {
+                identity: (indexed.entry.content(), indexed.candidates, indexed.initial, indexed.special)
+                for identity, indexed in zip(identities, pool)
+            },
+            "trigrams": by_identity(dataset.trigram_indexes[gender].postings),
+            "phonetic": by_identity(dataset.phonetic_indexes[gender].buckets),
+            "phonetic_prefixes": by_identity(dataset.phonetic_indexes[gender].prefix_buckets),
+            "special_matches": {key: identities[entry_id] for key, entry_id in dataset.special_matches[gender].items()},
+            "special_ids": sorted(identities[entry_id] for entry_id in dataset.special_ids[gender]),
+            "columns": rows,
+        }
+        if gender in dataset.edit_scorers:
+            scorer = dataset.edit_scorers[gender]
+            assert scorer.indexed_entries == pool, gender
+            described[gender]["patterns"] = dict(zip(identities, scorer.patterns))
+        if gender in dataset.ngram_scorers:
+            described[gender]["ngram"] = {
+                query: dict(zip(identities, dataset.ngram_scorers[gender].score(query).tolist()))
+                for query in ("minjun", "seoyeon", "jihoo")
+            }
+    return described
+
+
+def build(names_data: Dict[str, Any]) -> app.Dataset:
+    """Build a dataset from scratch, without fortunes."""
+    return app.build_dataset(names_data, [], app.compute_dataset_version(names_data, []), "")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_chained_updates_match_full_rebuilds(backend, monkeypatch):
+    monkeypatch.setattr(app, "SCORING_BACKEND", backend)
+    rng = random.Random(11)
+    records = {"male": make_synthetic_records(2000, 1), "female": make_synthetic_records(2000, 2)}
+    dataset = build(app.build_name_entries(records))
+    for round_number in range(5):
+        gender = rng.choice(sorted(records))
+        records[gender] = edit_records(records[gender], 10, rng, 100 + round_number)
+        names_data = app.build_name_entries(records)
+        updated = app.update_dataset(dataset, names_data, [], "")
+        assert updated is not None, "incremental update fell back to a full build"
+        rebuilt = build(names_data)
+        assert updated.version == rebuilt.version
+        assert canonical_dataset(updated) == canonical_dataset(rebuilt)
+        dataset = updated
+
+
+def test_update_leaves_the_base_dataset_untouched():
+    records = {"male": make_synthetic_records(500, 1), "female": make_synthetic_records(500, 2)}
+    base = build(app.build_name_entries(records))
+    fortune_tables = app.FortuneTables(4)
+    fortune_tables.prepare(base)
+    base_tables = fortune_tables.days(base.version)
+    before = canonical_dataset(base)
+    vocabularies = (list(base.columns.categories), list(base.columns.names), dict(base.columns.category_lookup))
+    rows = {day: dict(table.rows) for day, table in base_tables.items()}
+
+    records["male"] = edit_records(records["male"], 10, random.Random(3), 900)
+    updated = app.update_dataset(base, app.build_name_entries(records), [], "")
+    assert updated is not None
+    fortune_tables.prepare(updated, base=base)
+    assert canonical_dataset(base) == before
+    assert (base.columns.categories, base.columns.names, base.columns.category_lookup) == vocabularies
+    assert {day: table.rows for day, table in base_tables.items()} == rows
+    assert sorted(fortune_tables.days(updated.version)) == sorted(rows)
+    for table in fortune_tables.days(updated.version).values():
+        assert set(table.rows) >= {entry.name for entry in updated.names["male"]}
+
+
+def test_update_drops_categories_without_entries():
+    records = {"male": make_synthetic_records(500, 1), "female": make_synthetic_records(500, 2)}
+    for gender, pool in records.items():
+        for record in pool:
+            if record["category"] == "Hope":
+                record["category"] = "Faith"
+    records["male"][0]["category"] = "Rare"
+    base = build(app.build_name_entries(records))
+    assert base.columns.has_category("male", "Rare")
+
+    records["male"] = records["male"][1:]
+    updated = app.update_dataset(base, app.build_name_entries(records), [], "")
+    assert updated is not None
+    assert not updated.columns.has_category("male", "Rare")
+    assert "Rare" not in updated.columns.category_lookup
+    faith = {updated.names["male"][entry_id].identity for entry_id in updated.columns.category_ids("male", "Faith")}
+    assert faith == {entry.identity for entry in updated.names["male"] if entry.category == "Faith"}
+
+
+def test_removed_category_is_rejected_after_reload(data_dir):
+    male_path = data_dir / "names_male.json"
+    male = json.loads(male_path.read_text(encoding="utf-8"))
+    male_path.write_text(
+        json.dumps([record for record in male if record["category"] != "Art"], ensure_ascii=False), encoding="utf-8"
+    )
+    assert app.reload_dataset()
+    client = app.app.test_client()
+    token = client.get("/api/csrf_token").get_json()["token"]
+    response = client.post(
+        "/recommend", json={"name": "Michael", "gender": "male", "category": "Art"},
+        headers={app.CSRF_HEADER_NAME: token},
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"]["code"] == "INVALID_CATEGORY"
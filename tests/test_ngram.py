@@ -0,0 +1,43 @@
+"""Parity of the NumPy n-gram backend with the difflib scorer."""
+
+from difflib import SequenceMatcher
+from typing import List
+
+import pytest
+
+import app
+from helpers import SAMPLE_INPUTS, top_k_ids
+
+pytestmark = pytest.mark.skipif(app.np is None, reason="NumPy is not installed")
+
+
+def difflib_scores(english_norm: str, indexed: List[app.IndexedEntry]) -> List[float]:
+    """Score a pool with the difflib reference path."""
+    matcher = SequenceMatcher(None, english_norm, "")
+    return [app.score_indexed_entry(english_norm, matcher, item) for item in indexed]
+
+
+@pytest.mark.parametrize("gender", ["male", "female"])
+def test_own_romanization_ranks_first(gender):
+    indexed = app.current_dataset().name_index[gender]
+    scorer = app.NgramScorer(indexed)
+    best = 0
+    for item in indexed:
+        scores = scorer.score(item.candidates[0].text)
+        best += scores[item.entry.entry_id] >= scores.max()
+    assert best >= 0.95 * len(indexed)
+
+
+@pytest.mark.parametrize("gender", ["male", "female"])
+def test_top_picks_overlap_difflib(gender):
+    indexed = app.current_dataset().name_index[gender]
+    scorer = app.NgramScorer(indexed)
+    inputs = [app.normalize_romanization(name) for name in SAMPLE_INPUTS]
+    found = overlap = 0
+    for name in inputs:
+        expected = top_k_ids(difflib_scores(name, indexed))
+        ngram_scores = scorer.score(name).tolist()
+        found += expected[0] in top_k_ids(ngram_scores, 10)
+        overlap += len(set(expected) & set(top_k_ids(ngram_scores)))
+    assert found >= 0.85 * len(inputs)
+    assert overlap / len(inputs) >= 2.0
@@ -0,0 +1,33 @@
+"""Revised Romanization rules and the bulk path."""
+
+import random
+
+import pytest
+
+import romanization
+
+# Revised Romanization of words that exercise each sound-change rule
+ROMANIZATION_EXAMPLES = {
+    "김민준": "gimminjun", "신라": "silla", "종로": "jongno", "독립": "dongnip", "협력": "hyeomnyeok",
+    "같이": "gachi", "해돋이": "haedoji", "좋고": "joko", "많이": "mani", "싫어": "sireo", "백마": "baengma",
+    "설날": "seollal", "읽어": "ilgeo", "없어": "eopseo", "묵호": "mukho", "왕십리": "wangsimni",
+    "대관령": "daegwallyeong", "한 글a": "han geula",
+}
+
+
+@pytest.mark.parametrize("text, expected", ROMANIZATION_EXAMPLES.items())
+def test_sound_change_rules(text, expected):
+    assert romanization.romanize(text) == expected
+
+
+def test_bulk_matches_one_by_one():
+    rng = random.Random(13)
+    texts = [
+        "".join(
+            chr(romanization.HANGUL_BASE + rng.randrange(romanization.SYLLABLE_COUNT)) if rng.random() < 0.9
+            else rng.choice(" a-")
+            for _ in range(rng.randrange(6))
+        )
+        for _ in range(20_000)
+    ]
+    assert romanization.romanize_many(texts) == [romanization.romanize(text) for text in texts]
@@ -0,0 +1,29 @@
+"""ScoreBounds upper bounds against the scores each backend actually gives."""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+import app
+import similarity
+from helpers import SAMPLE_INPUTS, make_synthetic_catalog
+
+pytestmark = pytest.mark.skipif(app.np is None, reason="NumPy is not installed")
+
+
+@pytest.mark.parametrize("metric", ["difflib", *similarity.METRICS])
+def test_no_entry_exceeds_its_bound(metric):
+    pool = app.build_name_index({"bench": make_synthetic_catalog(3000)})["bench"]
+    score_bounds = app.ScoreBounds(pool)
+    scorer = app.EditDistanceScorer(pool, metric) if metric in similarity.METRICS else None
+    rng = random.Random(5)
+    for _ in range(25):
+        english_norm = app.normalize_romanization(rng.choice(SAMPLE_INPUTS)[: rng.randint(1, 9)])
+        matcher = SequenceMatcher(None, english_norm, "")
+        for entry_id, bound in enumerate(score_bounds.bounds(english_norm, metric).tolist()):
+            if scorer is not None:
+                score = scorer.score_entry(english_norm, entry_id)
+            else:
+                score = app.score_indexed_entry(english_norm, matcher, pool[entry_id])
+            assert score <= bound, (english_norm, entry_id)
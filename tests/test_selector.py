@@ -0,0 +1,30 @@
+"""The heap and columnar diversity selectors against the original full-sort rules."""
+
+import random
+
+import pytest
+
+import app
+from helpers import legacy_pick_diverse, make_selector_pool, pool_columns
+
+
+@pytest.mark.parametrize("trial", range(300))
+def test_selectors_match_legacy_rules(trial):
+    rng = random.Random(trial)
+    pool = make_selector_pool(rng.randint(1, 300), seed=trial)
+    scored = [(round(rng.random(), 2), rng.random(), entry_id) for entry_id in range(len(pool))]
+    picked, _ = app.select_diverse_top_k([(-score, tie, i) for score, tie, i in scored], pool, [])
+    expected = legacy_pick_diverse([(score, tie, pool[i].entry.to_dict()) for score, tie, i in scored], [])
+    assert [pool[i].entry.to_dict() for i in picked] == expected
+    if app.np is not None:
+        columnar, _ = pool_columns(pool).select_diverse("bench", *zip(*[(i, score, tie) for score, tie, i in scored]), [])
+        assert columnar == picked
+
+
+def test_leftovers_skip_picked_entries_and_seen_names():
+    pool = make_selector_pool(40)
+    picked, seen = app.select_diverse_top_k([(-1.0, 0.0, 0)], pool, [])
+    leftovers = app.sample_leftover_ids(pool, picked, seen, 4, random.Random(1))
+    assert len(set(leftovers)) == 4
+    assert not set(leftovers) & set(picked)
+    assert not {pool[i].entry.name for i in leftovers} & seen
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+WSGI middleware compressing text responses as they are sent.
+
+Responses are compressed with the best coding the client accepts among
+zstd (with the optional ``zstandard`` package), gzip and deflate. Bodies
+of known length are compressed in one piece, and those that are public
+and carry an ETag are kept in a bounded cache of compressed bodies.
+Streamed bodies are compressed chunk by chunk and flushed after each one,
+so clients receive every chunk as soon as the application yields it.
+Responses under the size threshold, already encoded, partial or marked
+``no-transform`` pass through untouched.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+COMPRESSIBLE_TYPES = frozenset({
+    "text/html", "text/css", "text/plain", "text/javascript", "application/javascript",
+    "application/json", "application/x-ndjson", "image/svg+xml",
+})
+UNCOMPRESSED_STATUSES = frozenset({204, 206, 304})
+# Preferred first when a client weighs several codings equally
+ENCODINGS = ("zstd", "gzip", "deflate") if zstandard is not None else ("gzip", "deflate")
+ZSTD_LEVEL = 3
+
+Headers = List[Tuple[str, str]]
+StartResponse = Callable[..., Callable[[bytes], Any]]
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """Return the coding to use for an ``Accept-Encoding`` header, or None to send the body as is."""
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            weights[coding.lower()] = quality
+    best, best_quality = None, 0.0
+    for coding in encodings:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class Encoder:
+    """An incremental compressor for one content coding."""
+
+    def __init__(self, coding: str, level: int) -> None:
+        self.coding = coding
+        if coding == "zstd":
+            self._zstd = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            # gzip wraps deflate data in a gzip header; HTTP "deflate" is the zlib format
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31 if coding == "gzip" else 15)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zstd.compress(data) if self.coding == "zstd" else self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        """Return everything compressed so far, keeping the stream open."""
+        if self.coding == "zstd":
+            return self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zstd.flush() if self.coding == "zstd" else self._zlib.flush()
+
+
+class CompressionStats:
+    """Thread-safe counters of compressed bytes and the CPU time spent on them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._codings: Dict[str, Dict[str, float]] = {}
+        self.passed = 0
+        self.cache_hits = 0
+
+    def record(self, coding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        with self._lock:
+            counts = self._codings.setdefault(
+                coding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0}
+            )
+            counts["responses"] += 1
+            counts["bytes_in"] += bytes_in
+            counts["bytes_out"] += bytes_out
+            counts["cpu_seconds"] += cpu_seconds
+
+    def pass_through(self) -> None:
+        with self._lock:
+            self.passed += 1
+
+    def cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters per coding, with the compression ratio and CPU time per response."""
+        with self._lock:
+            codings = {
+                coding: {
+                    "responses": int(counts["responses"]),
+                    "bytes_in": int(counts["bytes_in"]),
+                    "bytes_out": int(counts["bytes_out"]),
+                    "ratio": round(counts["bytes_out"] / counts["bytes_in"], 4) if counts["bytes_in"] else None,
+                    "cpu_ms": round(counts["cpu_seconds"] * 1000, 3),
+                    "cpu_us_per_response": round(counts["cpu_seconds"] * 1e6 / counts["responses"], 1),
+                }
+                for coding, counts in self._codings.items()
+            }
+            return {"passed_through": self.passed, "cache_hits": self.cache_hits, "codings": codings}
+
+
+class CompressedBodyCache:
+    """An LRU map of compressed bodies, bounded by their total size."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bodies: "OrderedDict[Tuple[str, ...], bytes]" = OrderedDict()
+        self._size = 0
+
+    def get(self, key: Tuple[str, ...]) -> Optional[bytes]:
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)
+            return body
+
+    def set(self, key: Tuple[str, ...], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._bodies.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._bodies[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._bodies.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._bodies), "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+def header_value(headers: Headers, name: str) -> Optional[str]:
+    """Return the first value of a header, matched case-insensitively."""
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def replace_header(headers: Headers, name: str, value: Optional[str]) -> Headers:
+    """Return ``headers`` without ``name``, plus ``name: value`` unless ``value`` is None."""
+    kept = [(key, existing) for key, existing in headers if key.lower() != name.lower()]
+    return kept if value is None else [*kept, (name, value)]
+
+
+def add_vary(headers: Headers, field: str) -> Headers:
+    """Return ``headers`` with ``field`` listed in ``Vary``."""
+    vary = header_value(headers, "Vary")
+    if vary is None:
+        return [*headers, ("Vary", field)]
+    if field.lower() in (item.strip().lower() for item in vary.split(",")):
+        return headers
+    return replace_header(headers, "Vary", f"{vary}, {field}")
+
+
+class CompressionMiddleware:
+    """Compress an application's text responses for clients that accept it.
+
+    A compressed response keeps the application's ETag as a weak one, since
+    its bytes differ from the identity body but its content does not, so
+    ``If-None-Match`` still matches the application's own check. ``version``
+    returns the version of the data the application serves; it is read before
+    each request and keys the cached bodies, so a data reload never serves
+    bodies compressed from the previous data.
+    """
+
+    def __init__(self, app: Callable[..., Iterable[bytes]], min_size: int = 1024, level: int = 6,
+                 cache_bytes: int = 16 << 20, version: Optional[Callable[[], str]] = None) -> None:
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.version = version
+        self.cache = CompressedBodyCache(cache_bytes)
+        self.counters = CompressionStats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the compression counters and the compressed body cache's size."""
+        return {**self.counters.snapshot(), "cache": self.cache.stats(), "min_size": self.min_size}
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponse) -> Iterable[bytes]:
+        coding = negotiate_encoding(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        if coding is None or environ.get("REQUEST_METHOD") == "HEAD":
+            return self.app(environ, start_response)
+
+        # Read before the application runs, so the key is never newer than the body
+        version = self.version() if self.version is not None else ""
+        captured: List[Any] = []
+        written: List[bytes] = []
+
+        def capture(status: str, headers: Headers, exc_info: Any = None) -> Callable[[bytes], Any]:
+            # Nothing is sent before the coding is decided, so a later call may replace the response
+            captured[:] = [status, headers, exc_info]
+            return written.append
+
+        body = self.app(environ, capture)
+        if captured and not written and not self.should_compress(*captured[:2]):
+            # Hand back the application's own iterable, keeping wsgi.file_wrapper and sendfile
+            self.counters.pass_through()
+            start_response(*captured)
+            return body
+        return self.respond(environ, start_response, coding, version, captured, written, body)
+
+    def should_compress(self, status: str, headers: Headers) -> bool:
+        """Decide from the status and headers whether a response is worth compressing."""
+        if int(status.split(" ", 1)[0]) in UNCOMPRESSED_STATUSES or header_value(headers, "Content-Encoding"):
+            return False
+        content_type = (header_value(headers, "Content-Type") or "").split(";", 1)[0].strip().lower()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return False
+        if "no-transform" in (header_value(headers, "Cache-Control") or "").lower():
+            return False
+        length = header_value(headers, "Content-Length")
+        return length is None or not length.isdigit() or int(length) >= self.min_size
+
+    def cache_key(self, environ: Dict[str, Any], coding: str, version: str,
+                  headers: Headers) -> Optional[Tuple[str, ...]]:
+        """Key public responses with an ETag by data version, path, query, ETag and coding; others are not cached."""
+        etag = header_value(headers, "ETag")
+        cache_control = (header_value(headers, "Cache-Control") or "").lower()
+        if etag is None or "public" not in cache_control or "no-store" in cache_control:
+            return None
+        return version, environ.get("PATH_INFO", ""), environ.get("QUERY_STRING", ""), etag, coding
+
+    def respond(self, environ: Dict[str, Any], start_response: StartResponse, coding: str, version: str,
+                captured: List[Any], written: List[bytes], body: Iterable[bytes]) -> Iterator[bytes]:
+        """Send a response that may need compressing, deciding once its headers are known."""
+        chunks = iter(body)
+        try:
+            if not captured:
+                # The application starts its response on the first iteration
+                written.extend(chunk for chunk in [next(chunks, b"")] if chunk)
+            status, headers, exc_info = captured
+            if not self.should_compress(status, headers):
+                self.counters.pass_through()
+                start_response(status, headers, exc_info)
+                yield from written
+                yield from chunks
+                return
+
+            if header_value(headers, "Content-Length") is not None:
+                yield from self.respond_whole(
+                    environ, start_response, coding, version, (status, headers, exc_info),
+                    b"".join(chain(written, chunks)),
+                )
+                return
+
+            # Streamed: hold chunks back until the threshold shows compression pays off
+            pending = list(written)
+            size = sum(map(len, pending))
+            while size < self.min_size:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    self.counters.pass_through()
+                    start_response(status, replace_header(headers, "Content-Length", str(size)), exc_info)
+                    yield b"".join(pending)
+                    return
+                pending.append(chunk)
+                size += len(chunk)
+            yield from self.respond_stream(
+                start_response, coding, (status, headers, exc_info), chain([b"".join(pending)], chunks)
+            )
+        finally:
+            close = getattr(body, "close", None)
+            if close is not None:
+                close()
+
+    def encoded_headers(self, headers: Headers, coding: str, length: Optional[int]) -> Headers:
+        """Return the headers of the compressed response; ``length`` is None when streamed."""
+        headers = replace_header(headers, "Content-Encoding", coding)
+        headers = replace_header(headers, "Content-Length", None if length is None else str(length))
+        etag = header_value(headers, "ETag")
+        if etag is not None and not etag.startswith("W/"):
+            headers = replace_header(headers, "ETag", f"W/{etag}")
+        return add_vary(headers, "Accept-Encoding")
+
+    def respond_whole(self, environ: Dict[str, Any], start_response: StartResponse, coding: str, version: str,
+                      response: Tuple[str, Headers, Any], data: bytes) -> Iterator[bytes]:
+        """Compress a body of known length in one piece, through the compressed body cache."""
+        status, headers, exc_info = response
+        key = self.cache_key(environ, coding, version, headers)
+        compressed = self.cache.get(key) if key is not None else None
+        if compressed is not None:
+            self.counters.cache_hit()
+        else:
+            started = time.thread_time()
+            encoder = Encoder(coding, self.level)
+            compressed = encoder.compress(data) + encoder.finish()
+            self.counters.record(coding, len(data), len(compressed), time.thread_time() - started)
+            if key is not None:
+                self.cache.set(key, compressed)
+        start_response(status, self.encoded_headers(headers, coding, len(compressed)), exc_info)
+        yield compressed
+
+    def respond_stream(self, start_response: StartResponse, coding: str, response: Tuple[str, Headers, Any],
+                       chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Compress a streamed body as it arrives, flushing after every chunk."""
+        status, headers, exc_info = response
+        encoder = Encoder(coding, self.level)
+        bytes_in = bytes_out = 0
+        cpu_seconds = 0.0
+        start_response(status, self.encoded_headers(headers, coding, None), exc_info)
+        try:
+            for chunk in chunks:
+                started = time.thread_time()
+                out = encoder.compress(chunk) + encoder.flush()
+                cpu_seconds += time.thread_time() - started
+                bytes_in += len(chunk)
+                bytes_out += len(out)
+                if out:
+                    yield out
+            started = time.thread_time()
+            tail = encoder.finish()
+            cpu_seconds += time.thread_time() - started
+            bytes_out += len(tail)
+            yield tail
+        finally:
+            self.counters.record(coding, bytes_in, bytes_out, cpu_seconds)